@@ -2,9 +2,15 @@
 Erasmus - Development Context Management System
 """
 
-from erasmus.cli import cli
-from erasmus.protocol import ProtocolManager, ProtocolError
-from erasmus.utils import get_path_manager
+import importlib
+import sys
+
+# Must run before any other erasmus import so their cost is recorded
+from erasmus.utils.startup_profiler import install_from_argv
+
+install_from_argv(sys.argv)
+
+from erasmus.cli import cli  # noqa: E402
 
 __version__ = "0.1.0"
 __all__ = [
@@ -15,3 +21,17 @@ __all__ = [
     "ProtocolError",
     "get_path_manager",
 ]
+
+# Resolved on first attribute access so that `import erasmus` (and therefore
+# every CLI invocation) does not build the path manager eagerly.
+_LAZY_EXPORTS = {
+    "ProtocolManager": "erasmus.protocol",
+    "ProtocolError": "erasmus.protocol",
+    "get_path_manager": "erasmus.utils",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module 'erasmus' has no attribute '{name}'")
@@ -5,20 +5,17 @@ Main CLI entry point for Erasmus.
 # Standard library imports
 import os
 import signal
+import importlib
 import importlib.metadata
+from pathlib import Path
 
 # Third-party imports
 import typer
 from click import UsageError
+from typer.core import TyperGroup
+from typer.main import get_command
 
 # Local imports
-from erasmus.context import context_app
-from erasmus.cli.protocol_commands import protocol_app
-from erasmus.cli.setup_commands import setup_app
-from erasmus.cli.mcp_commands import mcp_app
-from erasmus.protocol import ProtocolManager
-from erasmus.file_monitor import ContextFileMonitor
-from erasmus.utils.paths import get_path_manager
 from erasmus.utils.rich_console import print_table, get_console_logger, get_console
 
 
@@ -26,17 +23,56 @@ console = get_console()
 logger = get_console_logger()
 
 
-app = typer.Typer(
-    help="Erasmus - Development Context Management System\n\nA tool for managing development contexts, protocols, and Model Context Protocol (MCP) interactions.\n\nFor more information, visit: https://github.com/hydra-dynamics/erasmus"
-)
+# Sub-apps are imported only when their subcommand is resolved. Each of these
+# modules builds path managers, protocol managers or MCP registries at import
+# time, so `erasmus context list` must not pay for `erasmus.mcp`.
+# name -> (module path, Typer attribute, short help)
+LAZY_SUBCOMMANDS: dict[str, tuple[str, str, str]] = {
+    "context": ("erasmus.context", "context_app", "Manage development contexts"),
+    "protocol": ("erasmus.cli.protocol_commands", "protocol_app", "Manage protocols"),
+    "setup": ("erasmus.cli.setup_commands", "setup_app", "Setup Erasmus"),
+    "mcp": ("erasmus.cli.mcp_commands", "mcp_app", "Manage MCP servers, clients, and integrations"),
+}
+
 
+class LazyTyperGroup(TyperGroup):
+    """Typer group that imports sub-apps on first use.
 
+    Help listings get a lightweight placeholder carrying the short help text;
+    the real sub-app is imported when the subcommand is resolved for
+    invocation (including `erasmus <subcommand> --help`).
+    """
+
+    def list_commands(self, ctx):
+        commands = super().list_commands(ctx)
+        return commands + [name for name in LAZY_SUBCOMMANDS if name not in commands]
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in LAZY_SUBCOMMANDS:
+            help_text = LAZY_SUBCOMMANDS[cmd_name][2]
+            return TyperGroup(name=cmd_name, help=help_text, short_help=help_text)
+        return command
 
-# Add sub-commands
-app.add_typer(context_app, name="context", help="Manage development contexts")
-app.add_typer(protocol_app, name="protocol", help="Manage protocols")
-app.add_typer(setup_app, name="setup", help="Setup Erasmus")
-app.add_typer(mcp_app, name="mcp", help="Manage MCP servers, clients, and integrations")
+    def resolve_command(self, ctx, args):
+        if args and args[0] in LAZY_SUBCOMMANDS and args[0] not in self.commands:
+            self.add_command(self._load_subcommand(args[0]), args[0])
+        return super().resolve_command(ctx, args)
+
+    @staticmethod
+    def _load_subcommand(cmd_name: str):
+        module_path, attribute, help_text = LAZY_SUBCOMMANDS[cmd_name]
+        sub_app = getattr(importlib.import_module(module_path), attribute)
+        command = get_command(sub_app)
+        command.name = cmd_name
+        command.help = command.help or help_text
+        return command
+
+
+app = typer.Typer(
+    cls=LazyTyperGroup,
+    help="Erasmus - Development Context Management System\n\nA tool for managing development contexts, protocols, and Model Context Protocol (MCP) interactions.\n\nFor more information, visit: https://github.com/hydra-dynamics/erasmus"
+)
 
 
 
@@ -80,22 +116,29 @@ def print_main_help_and_exit():
 
 
 @app.callback(invoke_without_command=True)
-def main(ctx: typer.Context):
+def main(
+    ctx: typer.Context,
+    profile_startup: bool = typer.Option(
+        False,
+        "--profile-startup",
+        help="Print per-module import cost and module-level side effects (subprocesses, file writes, load_dotenv, prompts) on exit.",
+    ),
+    profile_output: Path = typer.Option(
+        None,
+        "--profile-output",
+        help="With --profile-startup, also export the startup profile as JSON to this path.",
+    ),
+):
     """
     Erasmus - Development Context Management System
     """
+    # Both options are consumed by erasmus.utils.startup_profiler before the CLI is
+    # imported; they are declared here so Typer accepts and documents them.
     if ctx.invoked_subcommand is None:
         print_main_help_and_exit()
 
 
 # Patch Typer's error handling to show help on unknown command
-from typer.main import get_command
-from typer.core import TyperGroup
-from click import UsageError
-
-original_command = get_command(app)
-
-
 class HelpOnErrorGroup(TyperGroup):
     def main(self, *args, **kwargs):
         try:
@@ -114,6 +157,9 @@ def watch():  # pragma: no cover
 
     Press Ctrl+C to stop watching.
     """
+    from erasmus.file_monitor import ContextFileMonitor
+    from erasmus.utils.paths import get_path_manager
+
     path_manager = get_path_manager()
     root = path_manager.get_root_dir()
 
@@ -140,6 +186,9 @@ def watch():  # pragma: no cover
 @app.command()
 def status():
     """Show the current Erasmus context and protocol status."""
+    from erasmus.context import context_app
+    from erasmus.protocol import ProtocolManager
+
     context_manager = context_app.ContextManager()
     protocol_manager = ProtocolManager()
 
@@ -3,22 +3,29 @@ MCP CLI commands for managing MCP servers and clients.
 """
 import os
 import typer
-import inspect
 import builtins
 
 from pathlib import Path
-from pydantic import BaseModel
+from typing import Any
+from pydantic import BaseModel, ValidationError
+from typer.core import TyperCommand, TyperGroup, TyperOption
 from erasmus.mcp.registry import McpRegistry
-from erasmus.mcp.models import McpError        # Restored McpError import
-from erasmus.mcp.servers import McpServers
+from erasmus.mcp.models import McpError, McpTimeoutError
+from erasmus.mcp.servers import get_mcp_servers
 from erasmus.mcp.client import StdioClient
-from erasmus.utils.rich_console import print_table, get_console_logger, get_console, print_panel, extract_display_content
+from erasmus.mcp.cache import CACHE_META_KEY, ToolResponseCache
+from erasmus.mcp.metrics import PERCENTILES, PHASES, LatencyStore
+from erasmus.mcp.async_client import AsyncStdioClient
+from erasmus.mcp.batch import DEFAULT_BATCH_CONCURRENCY, run_batch
+from erasmus.mcp.daemon import DaemonClient, get_daemon_socket_path, start_daemon, stop_daemon
+from erasmus.utils.rich_console import TABLE_CHUNK_ROWS, print_table, print_table_rows, get_console_logger, get_console, print_panel, extract_display_content
 from erasmus.utils.paths import get_path_manager
 from rich.syntax import Syntax
 from rich.panel import Panel
 # from erasmus.cli.github_mcp_commands import github_app # Commented out
 import json # For JSON processing in tool responses
-import click
+import asyncio
+import sys
 from rich.table import Table
 from datetime import datetime
 import re
@@ -105,14 +112,51 @@ def format_github_commits(commits_data):
     # Return original data if anything fails
     return commits_data
 
-mcp_registry = McpRegistry()
-mcp_servers = McpServers()
-mcp_client = StdioClient()
+mcp_servers = get_mcp_servers()
 mcp_app = typer.Typer(help="Manage MCP servers and clients.")
 path_manager = get_path_manager()
 console = get_console()
 logger = get_console_logger()
 
+# Built on first use: the registry discovers unregistered servers and the stores open SQLite files,
+# which commands like `mcp stats` or `mcp registry status` should not pay for
+_mcp_registry: McpRegistry | None = None
+_response_cache: ToolResponseCache | None = None
+_latency_store: LatencyStore | None = None
+_mcp_client: StdioClient | None = None
+
+
+def get_mcp_registry() -> McpRegistry:
+    """Get the registry shared by the MCP commands, loading it on first use."""
+    global _mcp_registry
+    if _mcp_registry is None:
+        _mcp_registry = McpRegistry()
+    return _mcp_registry
+
+
+def get_response_cache() -> ToolResponseCache:
+    """Get the response cache for read-only tool calls, opening it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ToolResponseCache(mcp_servers.config_path.parent / "cache.sqlite3", mcp_servers.cache_config)
+    return _response_cache
+
+
+def get_latency_store() -> LatencyStore:
+    """Get the per-call latency store, opening it on first use."""
+    global _latency_store
+    if _latency_store is None:
+        _latency_store = LatencyStore(mcp_servers.config_path.parent / "metrics.sqlite3")
+    return _latency_store
+
+
+def get_mcp_client() -> StdioClient:
+    """Get the client used for tool calls, backed by the response cache and latency store."""
+    global _mcp_client
+    if _mcp_client is None:
+        _mcp_client = StdioClient(cache=get_response_cache(), metrics=get_latency_store(), mcp_servers=mcp_servers)
+    return _mcp_client
+
 # New registry configuration management subcommand group
 registry_config_app = typer.Typer(
     name="registry", 
@@ -128,8 +172,10 @@ def registry_app_callback(ctx: typer.Context):
         command_rows = [
             ["show", "Show the path to the mcp_config.json file being used."],
             ["edit", "Open mcp_config.json for editing using nano."],
-            ["start", "(EXPERIMENTAL) Start a persistent MCP server process (placeholder)"],
-            ["stop", "(EXPERIMENTAL) Stop a persistent MCP server process (placeholder)"],
+            ["refresh", "Re-discover server tools and rewrite the cached registry.json."],
+            ["start", "Start the MCP daemon that keeps every configured server warm"],
+            ["stop", "Stop the MCP daemon and its server processes"],
+            ["status", "Show the MCP daemon and the servers it keeps warm"],
         ]
         print_table(["Subcommand", "Description"], command_rows, title="Available Registry Subcommands")
         typer.echo("\nFor more information about a subcommand, run:")
@@ -181,36 +227,368 @@ def registry_config_edit():
     console.print(f"Finished editing {config_path}.")
     console.print("Reloading MCPRegistry to reflect potential changes...")
     try:
-        mcp_registry.load_registry() # Reload the main registry which depends on mcp_config.json via McpServers
+        get_mcp_registry().refresh() # Re-read mcp_config.json and re-discover tools for every server
         console.print("[green]MCPRegistry reloaded successfully.[/green]")
     except Exception as error:
         logger.error(f"Error reloading MCPRegistry after edit: {error}")
         console.print(f"[red]Error reloading MCPRegistry: {error}[/red]")
 
+@registry_config_app.command("refresh")
+def registry_refresh(
+    name: str = typer.Argument(None, help="Name of the server to refresh. Refreshes all servers when omitted."),
+):
+    """Re-discover server tools and rewrite the cached registry.json."""
+    server_names = [name] if name else None
+    if name and name not in mcp_servers.get_server_names():
+        console.print(f"[red]Error:[/red] Server '{name}' not found in {mcp_servers.config_path}")
+        raise typer.Exit(1)
+    mcp_registry = get_mcp_registry()
+    with console.status("Refreshing MCP registry...", spinner="dots"):
+        try:
+            registry = mcp_registry.refresh(server_names)
+        except McpError as error:
+            console.print(f"[red]Error refreshing MCP registry:[/red] {error}")
+            raise typer.Exit(1)
+    rows = [
+        [
+            server_name,
+            str(len(server_data.get("tools", {}))),
+            f"stale: {server_data.get('error')}" if server_data.get("stale") else "ok",
+        ]
+        for server_name, server_data in registry.get("mcp_servers", {}).items()
+        if not name or server_name == name
+    ]
+    print_table(["Server", "Tools", "Status"], rows, title=f"Registry refreshed: {mcp_registry.registry_path}")
+
 @registry_config_app.command("start")
-@click.argument("name", type=str)
-def start_server_lifecycle(name: str):
-    """(EXPERIMENTAL) Start a persistent MCP server process (placeholder)."""
-    # This is a placeholder for future SSE/persistent connection management
-    logger.info(f"Attempting to start server (lifecycle): {name} (Placeholder)")
-    console.print(f"[yellow]EXPERIMENTAL:[/yellow] Starting server '{name}'. This feature is a placeholder.")
-    # Actual implementation would involve using McpServers to get server cmd and run it as a persistent process.
-    # error.g., mcp_servers.start_server_process(name)
-    console.print(f"TODO: Implement persistent start for server '{name}'.")
+def start_server_lifecycle():
+    """Start the MCP daemon that keeps every configured server warm."""
+    try:
+        with console.status("Starting MCP daemon...", spinner="dots"):
+            status = start_daemon(mcp_servers.config_path)
+    except McpError as error:
+        console.print(f"[red]Error starting MCP daemon:[/red] {error}")
+        raise typer.Exit(1)
+    _print_daemon_status(status)
+
 
 @registry_config_app.command("stop")
-@click.argument("name", type=str)
-def stop_server_lifecycle(name: str):
-    """(EXPERIMENTAL) Stop a persistent MCP server process (placeholder)."""
-    # This is a placeholder for future SSE/persistent connection management
-    logger.info(f"Attempting to stop server (lifecycle): {name} (Placeholder)")
-    console.print(f"[yellow]EXPERIMENTAL:[/yellow] Stopping server '{name}'. This feature is a placeholder.")
-    # Actual implementation would involve managing the persistent process.
-    # error.g., mcp_servers.stop_server_process(name)
-    console.print(f"TODO: Implement persistent stop for server '{name}'.")
-
-
-server_app = typer.Typer(help="Manage and interact with MCP servers and their tools via the new MCPRegistry.")
+def stop_server_lifecycle():
+    """Stop the MCP daemon and the server processes it owns."""
+    if stop_daemon(mcp_servers.config_path):
+        console.print("[green]MCP daemon stopped.[/green]")
+    else:
+        console.print("[yellow]MCP daemon is not running.[/yellow]")
+
+
+@registry_config_app.command("status")
+def daemon_status():
+    """Show whether the MCP daemon is running and which servers it keeps warm."""
+    status = DaemonClient(get_daemon_socket_path(mcp_servers.config_path)).status()
+    if status is None:
+        console.print("[yellow]MCP daemon is not running.[/yellow] Start it with `erasmus mcp registry start`.")
+        raise typer.Exit(1)
+    _print_daemon_status(status)
+
+
+def _print_daemon_status(status: dict):
+    rows = [
+        [server_name, "running" if server["running"] else "stopped", str(server["pid"] or "-"), str(server["in_flight"]), str(server.get("spares", 0))]
+        for server_name, server in status["servers"].items()
+    ]
+    print_table(["Server", "State", "PID", "In flight", "Spares"], rows, title=f"MCP daemon (pid {status['pid']}) on {status['socket']}")
+
+
+# Tool option types by the CLI type recorded in the command spec. JSON values are passed as strings.
+CLI_OPTION_TYPES = {"str": str, "int": int, "float": float, "bool": bool, "json": str}
+# Rows per page when --page is given without --limit
+DEFAULT_PAGE_SIZE = 50
+# Output options added to every tool command: (dest, flag, flag used when a tool parameter already has it, type, help)
+DISPLAY_OPTIONS = (
+    ("display_limit", "--limit", "--display-limit", int, "Show at most this many items of a list result (rows per page with --page)."),
+    ("display_page", "--page", "--display-page", int, f"Show this page (from 1) of a list result. Pages hold --limit items, {DEFAULT_PAGE_SIZE} by default."),
+    ("display_raw", "--raw", "--display-raw", bool, "Write the decoded result to stdout unformatted. List items are written as JSON lines."),
+)
+
+
+def _page_items(items: list, limit: int | None, page: int | None) -> tuple[list, str | None]:
+    """Select the items of a list result to show.
+
+    Returns:
+        The selected items and a note describing the selection, or None when everything is shown.
+    """
+    if limit is None and page is None:
+        return items, None
+    size = limit or DEFAULT_PAGE_SIZE
+    page = page or 1
+    start = (page - 1) * size
+    selected = items[start:start + size]
+    pages = max(-(-len(items) // size), 1)
+    if not selected:
+        return selected, f"Page {page} is past the end: {len(items)} items, {pages} page(s) of {size}."
+    return selected, f"Showing items {start + 1}-{start + len(selected)} of {len(items)} (page {page} of {pages})."
+
+
+def _write_raw(content: Any, limit: int | None, page: int | None):
+    """Write decoded tool output straight to stdout."""
+    if isinstance(content, builtins.list):
+        items, _ = _page_items(content, limit, page)
+        sys.stdout.writelines(json.dumps(item) + "\n" for item in items)
+    elif isinstance(content, str):
+        sys.stdout.write(content if content.endswith("\n") else content + "\n")
+    else:
+        sys.stdout.write(json.dumps(content) + "\n")
+    sys.stdout.flush()
+
+
+def _render_content(content: Any, title: str, limit: int | None = None, page: int | None = None):
+    """Render one decoded response as a table or panel."""
+    if isinstance(content, builtins.list) and content and isinstance(content[0], builtins.dict):
+        items, note = _page_items(content, limit, page)
+        headers = list(content[0].keys())
+        rows = ([item.get(header, "") if isinstance(item, builtins.dict) else "" for header in headers] for item in items)
+        if len(items) > TABLE_CHUNK_ROWS:
+            # Stream big listings instead of laying out one huge table
+            print_table_rows(headers, rows, title=title)
+        else:
+            print_table(headers, list(rows), title=title)
+        if note:
+            console.print(f"[dim]{note}[/dim]")
+    elif isinstance(content, builtins.dict):
+        if all(isinstance(v, (str, int, float, bool, type(None))) for v in content.values()):
+            headers = list(content.keys())
+            rows = [[str(content[h]) for h in headers]]
+            print_table(headers, rows, title=title)
+        else:
+            print_panel(json.dumps(content, indent=2), title=title)
+    else:
+        print_panel(str(content), title=title)
+
+
+def _call_tool(
+    server_name: str,
+    tool_spec: dict,
+    arguments: dict,
+    limit: int | None = None,
+    page: int | None = None,
+    raw: bool = False,
+):
+    """Call a tool on an MCP server with the arguments given on the command line and render the responses.
+
+    Args:
+        server_name: Name of the MCP server.
+        tool_spec: The tool's command spec.
+        arguments: Tool arguments by MCP parameter name.
+        limit: Show at most this many items of a list result.
+        page: Show this page (from 1) of a list result.
+        raw: Write the decoded result to stdout instead of rendering it.
+    """
+    tool_name = tool_spec["name"]
+    for flag, value in (("limit", limit), ("page", page)):
+        if value is not None and value < 1:
+            console.print(f"[red]Error: --{flag} must be at least 1.[/red]")
+            raise typer.Exit(code=1)
+    params = {param["name"]: param for param in tool_spec["params"]}
+    payload_for_client = {}
+    for name, value_from_cli in arguments.items():
+        param = params.get(name, {})
+        if value_from_cli is None and not (param.get("required") or param.get("has_default")):
+            continue
+
+        if param.get("cli_type") == "json" and isinstance(value_from_cli, str):
+            try: payload_for_client[name] = json.loads(value_from_cli)
+            except json.JSONDecodeError as e_json:
+                console.print(f"[red]Error: Invalid JSON for '{name}':[/red] {value_from_cli}")
+                console.print(f"[red]{e_json}[/red]")
+                raise typer.Exit(code=1)
+        else:
+            payload_for_client[name] = value_from_cli
+
+    # Validate against the input model generated from the tool's schema before starting the server
+    tool_model = get_mcp_registry().get_tool_model(server_name, tool_name)
+    if tool_model is not None:
+        try:
+            tool_model.model_validate(payload_for_client)
+        except ValidationError as error:
+            console.print(f"[red]Error: Invalid arguments for {tool_name}:[/red]")
+            for issue in error.errors():
+                console.print(f"[red]  {'.'.join(str(part) for part in issue['loc'])}: {issue['msg']}[/red]")
+            raise typer.Exit(code=1)
+
+    # The RPC method is always "tools/call"
+    # The parameters for "tools/call" include the tool's actual name and its specific arguments
+    actual_method_for_rpc = "tools/call"
+    structured_payload = {
+        **payload_for_client,  # Pass parameters directly at the top level
+        "name": tool_name  # tool_name is the actual tool name like "create_issue"
+    }
+
+    try:
+        # The spinner only covers the call; rendering under a live display is much slower
+        with console.status(f"Executing {tool_name} on {server_name}...", spinner="dots"):
+            if server_name == "github" and not os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN"):
+                console.print("[bold red]Error: GITHUB_PERSONAL_ACCESS_TOKEN environment variable is not set.[/bold red]")
+                console.print("Please set it to use GitHub MCP tools.")
+                raise typer.Exit(code=1)
+
+            logger.debug(f"Sending to MCP client: Server='{server_name}', Method='{actual_method_for_rpc}', Payload='{structured_payload}'")
+            responses, stderr = get_mcp_client().call(
+                server_name, actual_method_for_rpc, structured_payload, read_only=tool_spec.get("read_only", False)
+            )
+
+        if stderr:
+            logger.warning(f"MCP Server '{server_name}' stderr: {stderr.strip()}")
+        if not responses:
+            console.print(f"[yellow]No response received from {tool_name}.[/yellow]")
+        elif raw:
+            _write_raw(extract_display_content(responses[-1], logger=logger), limit, page)
+        else:
+            cache_status = (responses[-1].get("result") or {}).get("_meta", {}).get(CACHE_META_KEY, {})
+            if cache_status.get("status") == "hit":
+                console.print(f"[dim]Cached response (age {cache_status['age']:.0f}s)[/dim]")
+            # Show all responses, but highlight the last (tool) response
+            for i, resp in enumerate(responses):
+                is_tool_response = i == len(responses) - 1
+                section_title = f"Server Response ({'Tool Call' if is_tool_response else 'Init'})"
+                content_to_display = extract_display_content(resp, logger=logger)
+                if is_tool_response:
+                    _render_content(content_to_display, section_title, limit, page)
+                else:
+                    _render_content(content_to_display, section_title)
+    except McpTimeoutError as e_timeout:
+        console.print(f"[red]Timed out ({tool_name} on {server_name}): {e_timeout}[/red]")
+        console.print(f"Raise the deadline with a \"timeout\" (seconds) entry for '{server_name}' in {mcp_servers.config_path}.")
+        raise typer.Exit(code=1)
+    except McpError as e_mcp:
+        console.print(f"[red]McpError ({tool_name} on {server_name}): {e_mcp}[/red]")
+        raise typer.Exit(code=1)
+    except typer.Exit:
+        raise
+    except Exception as e_exc:
+        console.print(f"[red]Error ({tool_name} on {server_name}): {e_exc}[/red]")
+        logger.exception(f"Error in {tool_name} on {server_name}")
+        raise typer.Exit(code=1)
+
+
+def _build_tool_command(server_name: str, tool_spec: dict) -> TyperCommand:
+    """Materialize one tool command from its precomputed command spec."""
+    options = []
+    param_names = {}
+    for index, param in enumerate(tool_spec["params"]):
+        # Click needs an identifier to pass the value back; map it to the MCP parameter name
+        dest = param["name"] if param["name"].isidentifier() else f"param_{index}"
+        param_names[dest] = param["name"]
+        flag = param["name"].lower().replace("_", "-")
+        is_flag = param["cli_type"] == "bool"
+        options.append(TyperOption(
+            param_decls=[dest, f"--{flag}/--no-{flag}" if is_flag else f"--{flag}"],
+            type=CLI_OPTION_TYPES.get(param["cli_type"], str),
+            required=param["required"],
+            default=param["default"],
+            is_flag=is_flag or None,
+            help=param["help"],
+        ))
+    taken_flags = {decl for option in options for decl in option.opts + option.secondary_opts}
+    for dest, flag, fallback_flag, option_type, option_help in DISPLAY_OPTIONS:
+        is_flag = option_type is bool
+        options.append(TyperOption(
+            param_decls=[dest, flag if flag not in taken_flags else fallback_flag],
+            type=option_type,
+            default=False if is_flag else None,
+            is_flag=is_flag or None,
+            help=option_help,
+        ))
+
+    def tool_command(display_limit=None, display_page=None, display_raw=False, **kwargs):
+        arguments = {param_names[dest]: value for dest, value in kwargs.items()}
+        _call_tool(server_name, tool_spec, arguments, limit=display_limit, page=display_page, raw=display_raw)
+
+    return TyperCommand(
+        tool_spec["name"],
+        callback=tool_command,
+        params=options,
+        help=tool_spec["help"],
+        short_help=tool_spec["short_help"],
+    )
+
+
+class LazyToolsGroup(TyperGroup):
+    """Tool commands of one MCP server, built from its command spec only when requested."""
+
+    server_name: str = ""
+    _command_spec: dict | None = None
+
+    def command_spec(self) -> dict:
+        if self._command_spec is None:
+            self._command_spec = get_mcp_registry().get_command_spec(self.server_name) or {"tools": {}}
+        return self._command_spec
+
+    def list_commands(self, ctx):
+        commands = list(super().list_commands(ctx))
+        return commands + [name for name in self.command_spec()["tools"] if name not in commands]
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is None:
+            tool_spec = self.command_spec()["tools"].get(cmd_name)
+            if tool_spec is not None:
+                command = _build_tool_command(self.server_name, tool_spec)
+                self.add_command(command, cmd_name)
+        return command
+
+
+def _create_server_group(server_name: str) -> LazyToolsGroup:
+    """Create the command group for `erasmus mcp servers <server_name>`."""
+    server_data = get_mcp_registry().registry.get("mcp_servers", {}).get(server_name, {})
+    server_description = server_data.get("server", {}).get("description", f"Tools for MCP Server: {server_name}")
+    server_typer = typer.Typer(cls=LazyToolsGroup, help=f"MCP Server: {server_name} - {server_description}", no_args_is_help=False)
+
+    @server_typer.callback(invoke_without_command=True)
+    def dynamic_server_callback(ctx: typer.Context):
+        if ctx.invoked_subcommand is None:
+            tool_rows = []
+            for tool_name, tool_spec in ctx.command.command_spec()["tools"].items():
+                full_description = f"{tool_spec['short_help']} - {tool_spec['description']}"
+                if tool_spec["params"]:
+                    full_description += "\n  Params:"
+                    for param in tool_spec["params"]:
+                        required_str = " (required)" if param["required"] else ""
+                        full_description += f"\n    - {param['name']}{required_str} ({param['schema_type']}): {param['help']}"
+                tool_rows.append([tool_name, full_description])
+
+            if tool_rows:
+                print_table(["Tool Subcommand", "Description"], tool_rows, title=f"Available Tools for Server: {server_name}")
+            else:
+                typer.echo(f"No tools found or listed for server: {server_name}")
+            typer.echo("\nFor more information about a specific tool, run:")
+            typer.echo(f"  erasmus mcp servers {server_name} <tool_subcommand> --help")
+            raise typer.Exit(0)
+
+    server_group = typer.main.get_command(server_typer)
+    server_group.name = server_name
+    server_group.server_name = server_name
+    return server_group
+
+
+class LazyServersGroup(TyperGroup):
+    """`erasmus mcp servers`: one subgroup per registered server, created when it is invoked."""
+
+    def list_commands(self, ctx):
+        commands = list(super().list_commands(ctx))
+        return commands + [name for name in get_mcp_registry().registry.get("mcp_servers", {}) if name not in commands]
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in get_mcp_registry().registry.get("mcp_servers", {}):
+            command = _create_server_group(cmd_name)
+            self.add_command(command, cmd_name)
+        return command
+
+
+server_app = typer.Typer(
+    cls=LazyServersGroup,
+    help="Manage and interact with MCP servers and their tools via the new MCPRegistry.",
+)
 mcp_app.add_typer(server_app, name="servers")
 
 @server_app.callback(invoke_without_command=True)
@@ -222,8 +600,9 @@ def servers_app_callback(ctx: typer.Context):
         ]
         
         # Dynamically add registered servers
-        if mcp_registry and hasattr(mcp_registry, 'registry') and "mcp_servers" in mcp_registry.registry:
-            for s_name, s_data in mcp_registry.registry["mcp_servers"].items():
+        registry = get_mcp_registry().registry
+        if "mcp_servers" in registry:
+            for s_name, s_data in registry["mcp_servers"].items():
                 server_info = s_data.get("server", {})
                 description = server_info.get("description", f"Access tools for the {s_name} server.") 
                 command_rows.append([s_name, description]) # Changed to just s_name
@@ -233,23 +612,22 @@ def servers_app_callback(ctx: typer.Context):
         typer.echo("  erasmus mcp servers <subcommand> --help") # Updated help text
         raise typer.Exit(0)
 
-
-
 # --- Commands for `erasmus mcp servers ...` --- 
 
 @server_app.command("list")
 def list_mcp_servers():
     """List all available MCP servers based on the loaded MCPRegistry."""
-    if not mcp_registry or not mcp_registry.registry or "mcp_servers" not in mcp_registry.registry:
+    registry = get_mcp_registry().registry
+    if "mcp_servers" not in registry:
         logger.warning("MCPRegistry not available or not populated. Cannot list servers.")
         console.print("[yellow]MCPRegistry is not populated. No servers to list.[/yellow]")
         console.print(f"Ensure '{mcp_servers.config_path}' is configured and `erasmus mcp registry load` (or similar) has run.")
         return
 
-    server_list = list(mcp_registry.registry["mcp_servers"].keys())
+    server_list = list(registry["mcp_servers"].keys())
     if not server_list:
         console.print("[yellow]No MCP servers found in the registry.[/yellow]")
-        logger.info("No MCP servers found in mcp_registry.")
+        logger.info("No MCP servers found in the registry.")
     else:
         logger.info(f"Available MCP servers: {server_list}")
         headers = ["Server Name"]
@@ -257,6 +635,119 @@ def list_mcp_servers():
         print_table(headers, rows, title="Available MCP Servers")
 
 
+@mcp_app.command("batch")
+def batch_tool_calls(
+    server: str = typer.Argument(..., help="Name of the MCP server to call."),
+    calls_file: str = typer.Argument(..., help='JSONL file of {"tool": ..., "arguments": {...}} records, or - for stdin.'),
+    concurrency: int = typer.Option(DEFAULT_BATCH_CONCURRENCY, "--concurrency", "-c", help="Maximum number of calls in flight."),
+    timeout: float = typer.Option(None, "--timeout", "-t", help="Seconds each call may take. Defaults to the server's timeout (0 disables)."),
+):
+    """Run many tool calls over one server session, streaming JSONL results in completion order."""
+    if server not in mcp_servers.get_server_names():
+        console.print(f"[red]Error:[/red] Server '{server}' not found in {mcp_servers.config_path}")
+        raise typer.Exit(1)
+    try:
+        calls = sys.stdin if calls_file == "-" else open(calls_file)
+    except OSError as error:
+        console.print(f"[red]Error:[/red] Could not read {calls_file}: {error}")
+        raise typer.Exit(1)
+
+    async def _run() -> int:
+        failures = 0
+        async with AsyncStdioClient(mcp_servers, metrics=get_latency_store()) as client:
+            async for record in run_batch(client, server, calls, concurrency, timeout):
+                failures += "error" in record
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+        return failures
+
+    try:
+        failures = asyncio.run(_run())
+    except McpError as error:
+        console.print(f"[red]Error:[/red] {error}")
+        raise typer.Exit(1)
+    finally:
+        if calls is not sys.stdin:
+            calls.close()
+    if failures:
+        # Keep stdout pure JSONL
+        typer.echo(f"{failures} batch call(s) failed on {server}", err=True)
+        raise typer.Exit(1)
+
+
+cache_app = typer.Typer(help="Inspect and clear the response cache for read-only tool calls.")
+mcp_app.add_typer(cache_app, name="cache")
+
+
+@cache_app.callback(invoke_without_command=True)
+def cache_app_callback(ctx: typer.Context):
+    """Display available cache subcommands if 'erasmus mcp cache' is called without a subcommand."""
+    if ctx.invoked_subcommand is None:
+        command_rows = [
+            ["stats", "Show cache hits, misses and entries per tool"],
+            ["clear", "Drop cached responses for one server or all servers"],
+        ]
+        print_table(["Subcommand", "Description"], command_rows, title="Available Cache Subcommands")
+        raise typer.Exit(0)
+
+
+@cache_app.command("stats")
+def cache_stats():
+    """Show cache hits, misses and cached entries per server and tool."""
+    response_cache = get_response_cache()
+    stats = response_cache.stats()
+    if not stats:
+        console.print(f"[yellow]No cached tool calls yet.[/yellow] Cache: {response_cache.db_path}")
+        return
+    rows = []
+    for row in stats:
+        lookups = row["hits"] + row["misses"]
+        hit_rate = f"{row['hits'] / lookups:.0%}" if lookups else "-"
+        rows.append([row["server"], row["tool"], str(row["hits"]), str(row["misses"]), hit_rate, str(row["entries"])])
+    print_table(["Server", "Tool", "Hits", "Misses", "Hit rate", "Entries"], rows, title=f"MCP response cache: {response_cache.db_path}")
+
+
+@cache_app.command("clear")
+def cache_clear(
+    server: str = typer.Argument(None, help="Name of the server to clear. Clears every server when omitted."),
+):
+    """Drop cached responses and counters."""
+    get_response_cache().clear(server)
+    console.print(f"[green]Cleared cached responses for {server or 'all servers'}.[/green]")
+
+
+@mcp_app.command("stats")
+def latency_stats(
+    server: str = typer.Argument(None, help="Name of the server to report. Reports every server when omitted."),
+    clear: bool = typer.Option(False, "--clear", help="Drop the recorded timings instead of printing them."),
+):
+    """Show call counts and p50/p95/p99 latency per server, tool and phase."""
+    latency_store = get_latency_store()
+    if clear:
+        latency_store.clear(server)
+        console.print(f"[green]Cleared latency metrics for {server or 'all servers'}.[/green]")
+        return
+    summary = latency_store.summary(server)
+    if not summary:
+        console.print(f"[yellow]No MCP calls recorded yet.[/yellow] Metrics: {latency_store.db_path}")
+        return
+    rows = []
+    for entry in summary:
+        calls = f"{entry['calls']} ({entry['errors']} failed)" if entry["errors"] else str(entry["calls"])
+        for phase in PHASES:
+            phase_stats = entry["phases"].get(phase)
+            if phase_stats is None:
+                continue
+            rows.append(
+                [entry["server"], entry["tool"], calls, phase, str(phase_stats["count"])]
+                + [f"{phase_stats[f'p{percent}']:.2f}" for percent in PERCENTILES]
+            )
+            # Only label the first phase row of each tool
+            calls = ""
+    headers = ["Server", "Tool", "Calls", "Phase", "Count"] + [f"p{percent} (ms)" for percent in PERCENTILES]
+    print_table(headers, rows, title=f"MCP call latency: {latency_store.db_path}")
+
+
 @mcp_app.callback(invoke_without_command=True)
 def mcp_callback(ctx: typer.Context):
     """
@@ -266,6 +757,9 @@ def mcp_callback(ctx: typer.Context):
         command_rows = [
             ["servers", "Manage and interact with MCP servers and their tools"],
             ["registry", "Manage MCP server configurations (mcp_config.json) and lifecycle"],
+            ["batch", "Run tool calls from a JSONL file over one server session"],
+            ["cache", "Inspect and clear the response cache for read-only tools"],
+            ["stats", "Show p50/p95/p99 latency per server, tool and call phase"],
         ]
         print_table(["Commands", "Description"], command_rows, title="Available MCP Subcommands")
         typer.echo("\nFor more information about a command, run:")
@@ -273,239 +767,6 @@ def mcp_callback(ctx: typer.Context):
         raise typer.Exit(0)
 
 
-# Dynamically add server subcommands using MCPRegistry
-if mcp_registry and hasattr(mcp_registry, 'registry') and isinstance(mcp_registry.registry, dict) and "mcp_servers" in mcp_registry.registry:
-    for server_name, server_data in mcp_registry.registry["mcp_servers"].items():
-        help_text = f"Access {server_name} MCP server tools."
-        # Attempt to get a more descriptive help message from the registry data
-        # The structure in registry.json is registry['mcp_servers'][server_name]['server'] for server details
-        # and registry['mcp_servers'][server_name]['tools'] for tool details.
-        server_info = server_data.get("server", {})
-        if isinstance(server_info, dict):
-            annotations = server_info.get("annotations", {})
-            if isinstance(annotations, dict) and "title" in annotations:
-                help_text = annotations["title"]
-            elif "description" in server_info: # Fallback to server description
-                help_text = server_info["description"]
-        
-        server_description = server_data.get("server", {}).get("description", f"Tools for MCP Server: {server_name}")
-        dynamic_server_typer = typer.Typer(help=f"MCP Server: {server_name} - {server_description}", no_args_is_help=False) # no_args_is_help=False to allow our callback
-
-        # Dynamically add callback for individual server app (error.g., `erasmus mcp servers github`)
-        def create_dynamic_server_app_callback(current_server_name: str, current_server_tools_data: dict):
-            def dynamic_server_callback(ctx: typer.Context):
-                if ctx.invoked_subcommand is None:
-                    tool_rows = []
-                    if not current_server_tools_data:
-                        typer.echo(f"No tools explicitly registered for server '{current_server_name}' in the registry.")
-                    else:
-                        for tool_name, tool_data in current_server_tools_data.items():
-                            tool_title = tool_data.get("annotations", {}).get("title", tool_name.replace("_", " ").title())
-                            base_desc = tool_data.get("description", f"Execute {tool_name}")
-                            full_description = f"{tool_title} - {base_desc}"
-
-                            input_schema = tool_data.get('inputSchema', {})
-                            properties = input_schema.get('properties', {})
-                            
-                            if properties:
-                                param_details_str = "\n  Params:"
-                                for param_name, param_info in properties.items():
-                                    param_type = param_info.get('type', 'any')
-                                    param_desc = param_info.get('description', 'No specific description.')
-                                    # Check if the parameter is required
-                                    is_required = param_name in input_schema.get('required', [])
-                                    required_str = " (required)" if is_required else ""
-                                    param_details_str += f"\n    - {param_name}{required_str} ({param_type}): {param_desc}"
-                                full_description += param_details_str
-                                
-                            tool_rows.append([tool_name, full_description])
-                    
-                    if tool_rows:
-                        print_table(["Tool Subcommand", "Description"], tool_rows, title=f"Available Tools for Server: {current_server_name}")
-                    else:
-                        typer.echo(f"No tools found or listed for server: {current_server_name}")
-                    typer.echo("\nFor more information about a specific tool, run:")
-                    typer.echo(f"  erasmus mcp servers {current_server_name} <tool_subcommand> --help")
-                    raise typer.Exit(0)
-            return dynamic_server_callback
-
-        # Get the tools data for the current server to pass to the callback factory
-        tools_for_current_server = server_data.get("tools", {})
-        dynamic_server_typer.callback(invoke_without_command=True)(
-            create_dynamic_server_app_callback(server_name, tools_for_current_server)
-        )
-
-        # Dynamically add tool commands for this server
-        if isinstance(server_data, dict) and "tools" in server_data:
-            for tool_name, tool_schema in server_data.get("tools", {}).items():
-                try:
-                    # 1. Create Pydantic model for tool's input schema
-                    # Ensure mcp_registry has the _create_tool_model method accessible or replicate logic
-                    # For now, assuming mcp_registry instance can be used if it's correctly initialized
-                    # and its methods are suitable.
-                    # We need an instance of MCPRegistry to call _create_tool_model.
-                    # The mcp_registry global instance should work.
-                    
-                    # Guard against tool_schema not being a dict or missing inputSchema
-                    if not isinstance(tool_schema, dict) or "inputSchema" not in tool_schema:
-                        logger.warning(f"Skipping tool {tool_name} for server {server_name} due to missing or invalid schema.")
-                        continue
-
-                    # 2. Define the actual command function
-                    def _create_dynamic_command_func_for_tool(s_name: str, tool_name: str, t_schema: dict):
-                        """Helper to create the actual callable command function with correct signature."""
-                        
-                        input_schema = t_schema.get("inputSchema", {})
-                        original_param_schema_types = {}
-                        params_for_signature = []
-
-                        # Add context parameter for Typer if needed by advanced features (rarely for simple commands)
-                        # params_for_signature.append(inspect.Parameter("ctx", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=typer.Context))
-
-                        for param_name, param_info in input_schema.get("properties", {}).items():
-                            param_schema_type = param_info.get("type", "string")
-                            original_param_schema_types[param_name] = param_schema_type
-                            is_required = param_name in input_schema.get("required", [])
-                            param_cli_help = param_info.get("description", f"Parameter '{param_name}' for {tool_name}")
-
-                            if param_schema_type in ["object", "array"]:
-                                typer_annotation = str | None if not is_required else str
-                                param_cli_help += " (Input as JSON string)"
-                            elif param_schema_type == "integer":
-                                typer_annotation = int | None if not is_required else int
-                            elif param_schema_type == "number":
-                                typer_annotation = float | None if not is_required else float
-                            elif param_schema_type == "boolean":
-                                typer_annotation = bool # Typer makes bool | None a flag --name/--no-name
-                            else:
-                                typer_annotation = str | None if not is_required else str
-
-                            cli_default_value = inspect.Parameter.empty
-                            if not is_required:
-                                schema_default = param_info.get("default")
-                                if schema_default is not None:
-                                    if param_schema_type in ["object", "array"]:
-                                        try: cli_default_value = json.dumps(schema_default)
-                                        except TypeError: 
-                                            logger.warning(f"Could not JSON serialize default for {param_name} in {tool_name}. No default for CLI.")
-                                            cli_default_value = None
-                                    else:
-                                        cli_default_value = schema_default
-                                else:
-                                    cli_default_value = None
-                            
-                            parameter_kind = inspect.Parameter.KEYWORD_ONLY
-                            if is_required:
-                                typer_option_itself = typer.Option(..., help=param_cli_help) 
-                            else:
-                                typer_option_itself = typer.Option(cli_default_value, help=param_cli_help)
-
-                            params_for_signature.append(
-                                inspect.Parameter(param_name, parameter_kind, default=typer_option_itself, annotation=typer_annotation)
-                            )
-
-                        def generated_command_function(**kwargs):
-                            payload_for_client = {}
-                            for name, value_from_cli in kwargs.items():
-                                if value_from_cli is None and not (name in input_schema.get("required", []) or (input_schema.get("properties", {}).get(name, {}).get("default") is not None)):
-                                    continue
-
-                                original_type = original_param_schema_types.get(name)
-                                if original_type in ["object", "array"] and isinstance(value_from_cli, str):
-                                    try: payload_for_client[name] = json.loads(value_from_cli)
-                                    except json.JSONDecodeError as e_json:
-                                        console.print(f"[red]Error: Invalid JSON for '{name}':[/red] {value_from_cli}")
-                                        console.print(f"[red]{e_json}[/red]")
-                                        raise typer.Exit(code=1)
-                                else:
-                                    payload_for_client[name] = value_from_cli
-                            
-                            # The RPC method is always "tools/call"
-                            # The parameters for "tools/call" include the tool's actual name and its specific arguments
-                            actual_method_for_rpc = "tools/call"
-                            structured_payload = {
-                                **payload_for_client,  # Pass parameters directly at the top level
-                                "name": tool_name  # tool_name is the actual tool name like "create_issue"
-                            }
-                            
-                            console = get_console() # Ensure we use get_console() for Rich features
-                            with console.status(f"Executing {tool_name} on {s_name}...", spinner="dots"):
-                                try:
-                                    if s_name == "github" and not os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN"):
-                                        console.print("[bold red]Error: GITHUB_PERSONAL_ACCESS_TOKEN environment variable is not set.[/bold red]")
-                                        console.print("Please set it to use GitHub MCP tools.")
-                                        raise typer.Exit(code=1)
-                                    
-                                    logger.debug(f"Sending to MCP client: Server='{s_name}', Method='{actual_method_for_rpc}', Payload='{structured_payload}'")
-                                    stdout, stderr = mcp_client.communicate(s_name, actual_method_for_rpc, structured_payload)
-                                    
-                                    if stderr:
-                                        logger.warning(f"MCP Server '{s_name}' stderr: {stderr.strip()}")
-                                        # Potentially print non-critical stderr to console as well, if desired
-                                        # console.print(f"[dim]Server messages: {stderr.strip()}[/dim]")
-                                    if stdout:
-                                        # Split stdout into lines and parse each as JSON if possible
-                                        lines = [line for line in stdout.strip().splitlines() if line.strip()]
-                                        responses = []
-                                        for idx, line in enumerate(lines):
-                                            try:
-                                                parsed = json.loads(line)
-                                                responses.append(parsed)
-                                            except json.JSONDecodeError:
-                                                responses.append(line)
-                                        # Show all responses, but highlight the last (tool) response
-                                        for i, resp in enumerate(responses):
-                                            section_title = f"Server Response ({'Tool Call' if i == len(responses)-1 else 'Init'})"
-                                            # Display the response using the new utility
-                                            content_to_display = extract_display_content(resp, logger=logger)
-                                            if isinstance(content_to_display, builtins.list) and content_to_display and isinstance(content_to_display[0], builtins.dict):
-                                                headers = list(content_to_display[0].keys())
-                                                rows = [[row.get(h, "") for h in headers] for row in content_to_display]
-                                                print_table(headers, rows, title=section_title)
-                                            elif isinstance(content_to_display, builtins.dict):
-                                                if all(isinstance(v, (str, int, float, bool, type(None))) for v in content_to_display.values()):
-                                                    headers = list(content_to_display.keys())
-                                                    rows = [[str(content_to_display[h]) for h in headers]]
-                                                    print_table(headers, rows, title=section_title)
-                                                else:
-                                                    print_panel(json.dumps(content_to_display, indent=2), title=section_title)
-                                            else:
-                                                print_panel(str(content_to_display), title=section_title)
-                                    else:
-                                        console.print(f"[yellow]No stdout content received from {tool_name}.[/yellow]")
-                                except McpError as e_mcp:
-                                    console.print(f"[red]McpError ({tool_name} on {s_name}): {e_mcp}[/red]")
-                                    raise typer.Exit(code=1)
-                                except Exception as e_exc:
-                                    console.print(f"[red]Error ({tool_name} on {s_name}): {e_exc}[/red]")
-                                    logger.exception(f"Error in {tool_name} on {s_name}")
-                                    raise typer.Exit(code=1)
-                        
-                        # Correctly indented block, belongs to _create_dynamic_command_func_for_tool
-                        generated_command_function.__signature__ = inspect.Signature(params_for_signature)
-                        tool_description = t_schema.get("description", f"Execute {tool_name}.")
-                        annotations_title = t_schema.get("annotations", {}).get("title")
-                        generated_command_function.__doc__ = f"{annotations_title}\n{tool_description}" if annotations_title else tool_description
-                        generated_command_function.__name__ = f"{s_name}_{tool_name}_cmd"
-                        return generated_command_function
-
-                    # 3. Create and register the command
-                    tool_title = tool_schema.get("annotations", {}).get("title", tool_name.replace("_", " ").title())
-                    cmd_fn = _create_dynamic_command_func_for_tool(server_name, tool_name, tool_schema)
-                    
-                    dynamic_server_typer.command(name=tool_name, help=tool_title)(cmd_fn)
-                    # logger.debug(f"  Dynamically added tool command: {tool_name} to {server_name}")
-
-                except Exception as error:
-                    logger.error(f"Failed to create command for tool {tool_name} on server {server_name}: {error}")
-                    # Optionally, re-raise or continue to next tool
-                    
-        server_app.add_typer(dynamic_server_typer, name=server_name)
-        # logger.debug(f"Dynamically added MCP server command group: {server_name} using MCPRegistry")
-
-else:
-    logger.warning("MCPRegistry not available or not populated correctly. No dynamic server commands will be added.")
-
 if __name__ == "__main__":
     try:
         mcp_app()
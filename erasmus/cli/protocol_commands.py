@@ -366,8 +366,10 @@ def load_protocol(
         from erasmus.protocol import ProtocolManager
         protocol_manager = ProtocolManager()
         
-        # Load the protocol
-        protocol = protocol_manager.load_protocol(name)
+        # Load the protocol, make it the active one and publish the rules file
+        protocol_manager._load_protocol(name)
+        protocol_manager._update_current_protocol_file(name)
+        protocol_manager._update_context()
         
         print_table(
             ["Info"],
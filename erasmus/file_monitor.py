@@ -5,8 +5,11 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 from pathlib import Path
 from erasmus.protocol import get_protocol_manager
+from erasmus.utils.debounce import TrailingDebouncer
+from erasmus.utils.merge_worker import get_merge_worker
 from erasmus.utils.paths import get_path_manager
 from erasmus.utils.rich_console import get_console_logger
+from erasmus.utils.rules_merge import get_rules_merger
 import re
 import fnmatch
 
@@ -18,33 +21,36 @@ _last_rules_write_time = None
 path_manager = get_path_manager()
 protocol_manager = get_protocol_manager()
 
+# Merge worker key of the rules merge, shared by every watcher so their merges are deduplicated
+RULES_MERGE = "rules"
+
 def _merge_rules_file() -> None:
     # Split this function into smaller functions in a future refactor
     # Current complexity is necessary for handling various file states and formats
     """
     Merge current .ctx files into the IDE rules file using the meta_rules.md template.
     Refreshes IDE detection to ensure correct rules file is used.
-    Overwrites the rules file every time with a fresh merge of the template and current context/protocol content.
+    The rules file is only rewritten when the merged content differs from it, so
+    events that change nothing (an editor touch, an mtime-only save) cause no write.
     Prompts the user to select a protocol if none is set or the file is missing.
     """
     try:
-        architecture = path_manager.architecture_file.read_text()
-        progress = path_manager.progress_file.read_text()
-        tasks = path_manager.tasks_file.read_text()
         if not protocol_manager.protocol:
             protocol_manager.select_protocol_interactively(
                 prompt_title="Select a protocol for the rules file",
                 error_title="Protocol not selected"
             )
-        protocol = protocol_manager.protocol.content
         template_path = path_manager.template_dir / "meta_rules.md"
-        template = template_path.read_text()
-        template = template.replace("<!-- Architecture content -->", architecture)
-        template = template.replace("<!-- Progress content -->", progress)
-        template = template.replace("<!-- Tasks content -->", tasks)
-        template = template.replace("<!-- Protocol content -->", protocol)
-        path_manager.rules_file.write_text(template)
-        logger.info("Rules file merged successfully")
+        written = get_rules_merger().merge(template_path, {
+            "Architecture": path_manager.architecture_file,
+            "Progress": path_manager.progress_file,
+            "Tasks": path_manager.tasks_file,
+            "Protocol": protocol_manager.protocol.content,
+        }, path_manager.rules_file)
+        if written:
+            logger.info("Rules file merged successfully")
+        else:
+            logger.info("Rules file already up to date")
     except Exception as error:
         logger.error(f"Error merging rules file: {error}")
 
@@ -183,20 +189,21 @@ class FileMonitor:
         self.on_modified = None
         self.on_deleted = None
         self._is_running = False
-        self._last_merge_time = 0
-        self._merge_debounce = 0.5  # Debounce time for merging rules
+        # Bursts of context changes are merged once, after they go quiet, on the merge worker
+        self.merge_debouncer = TrailingDebouncer(self._submit_merge, name="rules-debounce")
 
-    def _should_merge_rules(self) -> bool:
-        """Check if enough time has passed since last merge."""
-        current_time = time.time()
-        should_merge = current_time - self._last_merge_time > self._merge_debounce
-        if should_merge:
-            if self.debug:
-                logger.debug("Debounce period passed, will merge rules")
-            self._last_merge_time = current_time
-        elif self.debug:
-            logger.debug("Within debounce period, skipping merge")
-        return should_merge
+    def _submit_merge(self) -> None:
+        """Hand the merge to the merge worker, so the debouncer's timing never waits on it."""
+        get_merge_worker().submit(RULES_MERGE, self._merge_rules)
+
+    def _merge_rules(self) -> None:
+        """Merge the rules file once a burst of context changes is over."""
+        logger.info("Merging rules due to context file changes")
+        try:
+            _merge_rules_file()
+            logger.info("Rules merge completed successfully")
+        except Exception as error:
+            logger.error(f"Error merging rules: {error}")
 
     def _handle_context_change(self, event: FileSystemEvent) -> None:
         """Handle changes to context files."""
@@ -207,13 +214,9 @@ class FileMonitor:
                 logger.debug(f"Ignoring rules file change: {event.src_path}")
             return
 
-        if self._should_merge_rules():
-            logger.info(f"Merging rules due to context file change: {event.src_path}")
-            try:
-                _merge_rules_file()
-                logger.info("Rules merge completed successfully")
-            except Exception as error:
-                logger.error(f"Error merging rules: {error}")
+        if self.debug:
+            logger.debug(f"Scheduling rules merge for context file change: {event.src_path}")
+        self.merge_debouncer.trigger()
 
     def add_watch_path(self, watch_path: str | Path, recursive: bool = False) -> None:
         """Add a path to monitor."""
@@ -360,6 +363,9 @@ class FileMonitor:
                 logger.info("File monitor stopped successfully")
             except Exception as error:
                 logger.error(f"Error stopping observer: {error}")
+        # Merge changes still waiting for their burst to end
+        self.merge_debouncer.close()
+        get_merge_worker().wait()
         self._is_running = False
 
     def __enter__(self) -> "FileMonitor":
@@ -409,6 +415,9 @@ class ContextFileMonitor:
         try:
             self.observer.stop()
             self.observer.join()
+            # Merge changes still waiting for their burst to end
+            self.handler.merge_debouncer.close()
+            get_merge_worker().wait()
             logger.info("Stopped context file monitor")
         except Exception as error:
             logger.error(f"Error stopping context file monitor: {error}")
@@ -426,16 +435,29 @@ class ContextFileMonitor:
 class ContextFileHandler(FileSystemEventHandler):
     """Handles file system events for context files."""
 
-    def __init__(self, debounce_time: float = 0.5) -> None:
+    def __init__(self, debounce_time: float = 0.5, max_latency: float = 2.0) -> None:
         """Initialize the context file handler.
 
+        Events are coalesced: the rules file is merged once no context file
+        event arrived for debounce_time seconds, and at the latest max_latency
+        seconds after the first event of a burst. Merges run on the merge
+        worker, so the observer thread only records events.
+
         Args:
-            debounce_time: Time in seconds to wait before processing duplicate events
+            debounce_time: Seconds without events that end a burst
+            max_latency: Most seconds an event waits for its merge
         """
         super().__init__()
         self.debounce_time = debounce_time
-        self.last_processed = {}
+        self.merge_debouncer = TrailingDebouncer(
+            self._submit_merge, debounce_time, max_latency, name="rules-debounce"
+        )
 
+    @staticmethod
+    def _is_context_file(path: str | bytes) -> bool:
+        """Check if a path is a .ctx.*.md file."""
+        path = os.fsdecode(path)
+        return path.endswith(".md") and ".ctx." in os.path.basename(path)
 
     def _should_process_event(self, event: FileSystemEvent) -> bool:
         """Check if an event should be processed.
@@ -450,16 +472,19 @@ class ContextFileHandler(FileSystemEventHandler):
             return False
 
         # Only process .ctx.*.md files
-        if not str(event.src_path).endswith(".md") or ".ctx." not in str(event.src_path):
-            return False
+        return self._is_context_file(event.src_path)
 
-        current_time = time.time()
-        if event.src_path in self.last_processed:
-            if current_time - self.last_processed[event.src_path] < self.debounce_time:
-                return False
+    def _submit_merge(self) -> None:
+        """Hand the merge to the merge worker, so the debouncer's timing never waits on it."""
+        get_merge_worker().submit(RULES_MERGE, self._merge_rules)
 
-        self.last_processed[event.src_path] = current_time
-        return True
+    def _merge_rules(self) -> None:
+        """Merge the rules file once a burst of events is over."""
+        try:
+            _merge_rules_file()
+            logger.info("Rules file updated")
+        except Exception as error:
+            logger.error(f"Error handling context file change: {error}")
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events.
@@ -468,12 +493,8 @@ class ContextFileHandler(FileSystemEventHandler):
             event: The file system event
         """
         if self._should_process_event(event):
-            try:
-                logger.info(f"Context file modified: {event.src_path}")
-                _merge_rules_file()
-                logger.info("Rules file updated")
-            except Exception as error:
-                logger.error(f"Error handling context file modification: {error}")
+            logger.debug(f"Context file modified: {event.src_path}")
+            self.merge_debouncer.trigger()
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events.
@@ -482,12 +503,8 @@ class ContextFileHandler(FileSystemEventHandler):
             event: The file system event
         """
         if self._should_process_event(event):
-            try:
-                logger.info(f"Context file created: {event.src_path}")
-                _merge_rules_file()
-                logger.info("Rules file updated")
-            except Exception as error:
-                logger.error(f"Error handling context file creation: {error}")
+            logger.debug(f"Context file created: {event.src_path}")
+            self.merge_debouncer.trigger()
 
     def on_deleted(self, event: FileSystemEvent) -> None:
         """Handle file deletion events.
@@ -496,9 +513,17 @@ class ContextFileHandler(FileSystemEventHandler):
             event: The file system event
         """
         if self._should_process_event(event):
-            try:
-                logger.info(f"Context file deleted: {event.src_path}")
-                _merge_rules_file()
-                logger.info("Rules file updated")
-            except Exception as error:
-                logger.error(f"Error handling context file deletion: {error}")
+            logger.debug(f"Context file deleted: {event.src_path}")
+            self.merge_debouncer.trigger()
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle file move events, which editors use to save atomically.
+
+        Args:
+            event: The file system event
+        """
+        if event.is_directory:
+            return
+        if self._is_context_file(event.src_path) or self._is_context_file(event.dest_path):
+            logger.debug(f"Context file moved: {event.src_path} -> {event.dest_path}")
+            self.merge_debouncer.trigger()
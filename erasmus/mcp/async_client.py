@@ -0,0 +1,578 @@
+"""
+Asyncio client for MCP servers over standard input/output.
+
+Unlike StdioClient, which writes a request and then blocks reading until its
+response arrives, AsyncStdioClient runs one reader task per server. The task
+resolves pending futures by JSON-RPC id, so many requests (for example slow
+``tools/call`` invocations) can be in flight on the same process at once.
+Server notifications are routed to registered handlers instead of being
+mistaken for responses. Requests to servers configured with a ``url`` go over
+the pooled HTTP transport in worker threads, so they run concurrently too.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from erasmus.mcp.client import CANCEL_GRACE, INITIALIZE_PARAMS, McpClientBase
+from erasmus.mcp.metrics import LatencyStore
+from erasmus.mcp.models import STDERR_LINE_LIMIT, STDERR_TAIL_LINES, McpError, McpTimeoutError
+from erasmus.mcp.servers import McpServers, get_mcp_servers
+from erasmus.utils.rich_console import get_console_logger
+
+if TYPE_CHECKING:
+    from erasmus.mcp.http_transport import HttpServerSession
+
+logger = get_console_logger()
+
+# Largest single JSON-RPC line accepted from a server (tool results can be big)
+STREAM_LIMIT = 16 * 1024 * 1024
+# Bytes read from a server's stdout at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+NotificationHandler = Callable[[str, dict[str, Any]], Awaitable[None] | None]
+
+
+class AsyncServerSession:
+    """One initialized server process with its in-flight requests."""
+
+    def __init__(self, name: str, process: asyncio.subprocess.Process, client: "AsyncStdioClient"):
+        self.name = name
+        self.process = process
+        self.initialize_response: dict[str, Any] | None = None
+        self.stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self._client = client
+        self._pending: dict[int, asyncio.Future] = {}
+        self._request_id = 0
+        self._write_lock = asyncio.Lock()
+        self._closed = False
+        self._probe_task: asyncio.Task | None = None
+        self._reader_task = asyncio.create_task(self._read_stdout(), name=f"mcp-{name}-stdout")
+        self._stderr_task = asyncio.create_task(self._read_stderr(), name=f"mcp-{name}-stderr")
+
+    def is_alive(self) -> bool:
+        return not self._closed and self.process.returncode is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def _write_message(self, message: dict[str, Any]):
+        data = (json.dumps(message) + "\n").encode()
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+
+    async def request(
+        self,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        cancel: bool = True,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """Send a request and wait for the response with the same id.
+
+        Args:
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds to wait for the response. None waits forever.
+            cancel: Send ``notifications/cancelled`` when the timeout expires.
+            timings: Receives the write, first_byte, response and decode durations.
+
+        Returns:
+            The raw JSON-RPC response payload.
+
+        Raises:
+            McpError: If the process exits before answering.
+            McpTimeoutError: If the timeout expires.
+        """
+        if not self.is_alive():
+            raise McpError(f"MCP server '{self.name}' is not running.")
+        self._request_id += 1
+        request_id = self._request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            write_started = time.perf_counter()
+            await self._write_message({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+            written_at = time.perf_counter()
+            try:
+                response, frame_timing = await (future if timeout is None else asyncio.wait_for(future, timeout))
+            except asyncio.TimeoutError:
+                # The initialize request must not be cancelled; the caller stops the process instead
+                if cancel and method != "initialize":
+                    await self._cancel(request_id, f"No response within {timeout:g}s")
+                raise McpTimeoutError(self.name, method, timeout, request_id) from None
+            if timings is not None:
+                timings["write"] = written_at - write_started
+                timings["first_byte"] = max(frame_timing["first_byte_at"] - written_at, 0)
+                timings["response"] = max(frame_timing["received_at"] - written_at, 0)
+                timings["decode"] = frame_timing["decode"]
+            return response
+        except (BrokenPipeError, ConnectionResetError) as error:
+            raise McpError(f"Broken pipe while communicating with '{self.name}'. Exit code: {self.process.returncode}.") from error
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _cancel(self, request_id: int, reason: str):
+        """Cancel a request, then close the session in the background if the server no longer answers pings."""
+        try:
+            await self.notify("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe(), name=f"mcp-{self.name}-probe")
+
+    async def _probe(self):
+        try:
+            await self.request("ping", {}, timeout=CANCEL_GRACE, cancel=False)
+        except McpTimeoutError:
+            logger.warning(f"MCP server '{self.name}' is unresponsive after a cancelled request, stopping it.")
+            await self.close()
+        except McpError:
+            pass
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None):
+        """Send a notification (a message without an id)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._write_message(message)
+
+    async def _read_stdout(self):
+        """Dispatch newline-delimited messages from stdout until the server exits.
+
+        Each message is dispatched with the perf_counter times its first and
+        last byte arrived and the seconds spent decoding it.
+        """
+        buffer = bytearray()
+        frame_started_at = 0.0
+        try:
+            while chunk := await self.process.stdout.read(READ_CHUNK_SIZE):
+                chunk_at = time.perf_counter()
+                if not buffer:
+                    frame_started_at = chunk_at
+                search_from = len(buffer)
+                buffer += chunk
+                while (end := buffer.find(b"\n", search_from)) >= 0:
+                    frame = bytes(buffer[:end]).strip()
+                    del buffer[:end + 1]
+                    search_from = 0
+                    timing = {"first_byte_at": frame_started_at, "received_at": chunk_at}
+                    # The rest of the buffer belongs to a frame that started arriving with this chunk
+                    frame_started_at = chunk_at
+                    if not frame:
+                        continue
+                    decode_started = time.perf_counter()
+                    try:
+                        message = json.loads(frame)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Ignoring non-JSON output from '{self.name}': {frame[:200]!r}")
+                        continue
+                    timing["decode"] = time.perf_counter() - decode_started
+                    await self._dispatch(message, timing)
+                if len(buffer) > STREAM_LIMIT:
+                    logger.error(f"Oversized message from MCP server '{self.name}': over {STREAM_LIMIT} bytes without a newline")
+                    break
+        finally:
+            self._closed = True
+            await self.process.wait()
+            stderr_output = "".join(self.stderr_tail).strip()
+            error = McpError(f"MCP server '{self.name}' terminated unexpectedly while waiting for response. Exit code: {self.process.returncode}. Stderr: {stderr_output}")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _dispatch(self, message: dict[str, Any], timing: dict[str, float]):
+        if "method" not in message:
+            future = self._pending.get(message.get("id"))
+            if future is not None and not future.done():
+                future.set_result((message, timing))
+            else:
+                logger.warning(f"Ignoring response with unknown ID from '{self.name}': {message.get('id')}")
+            return
+
+        if "id" in message:
+            # Server-to-client request: answer pings, reject everything else
+            if message["method"] == "ping":
+                reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+            else:
+                reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": f"Method not found: {message['method']}"}}
+            await self._write_message(reply)
+            return
+
+        await self._client._route_notification(self.name, message)
+
+    async def _read_stderr(self):
+        while True:
+            try:
+                line = await self.process.stderr.readline()
+            except ValueError:
+                # Line over STREAM_LIMIT: the reader already dropped it
+                self.stderr_tail.append("<stderr line over stream limit dropped>\n")
+                continue
+            if not line:
+                return
+            for start in range(0, len(line), STDERR_LINE_LIMIT):
+                self.stderr_tail.append(line[start:start + STDERR_LINE_LIMIT].decode(errors="replace"))
+
+    async def close(self):
+        """Close stdin and wait for the process, terminating it if it lingers."""
+        self._closed = True
+        if self.process.returncode is None:
+            try:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=0.5)
+            except (asyncio.TimeoutError, OSError):
+                self.process.terminate()
+                try:
+                    await asyncio.wait_for(self.process.wait(), timeout=2)
+                except asyncio.TimeoutError:
+                    logger.warning(f"MCP server '{self.name}' did not terminate gracefully, killing.")
+                    self.process.kill()
+                    await self.process.wait()
+        tasks = [self._reader_task, self._stderr_task]
+        if self._probe_task is not None and self._probe_task is not asyncio.current_task():
+            tasks.append(self._probe_task)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class AsyncStdioClient(McpClientBase):
+    """Asyncio client multiplexing concurrent requests over persistent server processes.
+
+    Usage:
+        async with AsyncStdioClient() as client:
+            results = await asyncio.gather(
+                client.call_tool("github", "get_me"),
+                client.call_tool("github", "list_commits", {"owner": "o", "repo": "r"}),
+            )
+    """
+
+    def __init__(
+        self,
+        mcp_servers: McpServers | None = None,
+        metrics: LatencyStore | None = None,
+        use_spares: bool = False,
+    ):
+        """Initialize the AsyncStdioClient.
+
+        Args:
+            mcp_servers: Server definitions to use. Loaded from mcp_config.json when omitted.
+            metrics: Store receiving the per-phase latencies of every request.
+            use_spares: Keep each server's configured number of ``spares`` started
+                and initialized in the background, and take one whenever a
+                session has to be (re)started. Meant for long-lived clients.
+        """
+        self.mcp_servers = mcp_servers or get_mcp_servers()
+        self.metrics = metrics
+        self.use_spares = use_spares
+        self.sessions: dict[str, AsyncServerSession] = {}
+        self.spares: dict[str, list[AsyncServerSession]] = {}
+        self._refill_tasks: dict[str, asyncio.Task] = {}
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+        self._notification_handlers: list[NotificationHandler] = []
+        logger.debug("AsyncStdioClient initialized.")
+
+    async def __aenter__(self) -> "AsyncStdioClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.disconnect_all()
+
+    def add_notification_handler(self, handler: NotificationHandler):
+        """Register a callback for server notifications.
+
+        Args:
+            handler: Called with the server name and the notification message.
+                May be a coroutine function.
+        """
+        self._notification_handlers.append(handler)
+
+    async def _route_notification(self, server_name: str, message: dict[str, Any]):
+        if not self._notification_handlers:
+            logger.debug(f"Notification from '{server_name}': {message.get('method')}")
+        for handler in self._notification_handlers:
+            try:
+                outcome = handler(server_name, message)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception as error:
+                logger.error(f"Notification handler failed for '{server_name}': {error}")
+
+    def _forward_notifications(self) -> Callable[[str, dict[str, Any]], None]:
+        """Return a callback routing notifications from an HTTP worker thread to the handlers."""
+        loop = asyncio.get_running_loop()
+
+        def _forward(server_name: str, message: dict[str, Any]):
+            asyncio.run_coroutine_threadsafe(self._route_notification(server_name, message), loop)
+
+        return _forward
+
+    async def connect(
+        self,
+        server_name: str,
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> "AsyncServerSession | HttpServerSession":
+        """Return the live session for a server, starting and initializing it if needed.
+
+        Args:
+            server_name: The name of the server to connect to.
+            timeout: Seconds the initialize handshake may take. None waits forever.
+            timings: Receives the spawn and initialize durations when this call starts the server.
+
+        Returns:
+            The initialized session.
+
+        Raises:
+            McpError: If the server is not configured or fails to start.
+            McpTimeoutError: If the handshake does not finish in time.
+        """
+        if self._is_http_server(server_name):
+            return await asyncio.to_thread(self._http_client().connect, self.mcp_servers.servers[server_name], timeout)
+        session = self.sessions.get(server_name)
+        if session is not None and session.is_alive():
+            self._schedule_refill(server_name)
+            return session
+
+        lock = self._connect_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            session = self.sessions.get(server_name)
+            if session is not None and session.is_alive():
+                return session
+            if session is not None:
+                logger.info(f"MCP server '{server_name}' exited (code {session.process.returncode}), respawning.")
+                await self.disconnect(server_name)
+
+            session = await self._take_spare(server_name) or await self._start_session(server_name, timeout, timings)
+            self.sessions[server_name] = session
+            self._schedule_refill(server_name)
+            return session
+
+    async def _start_session(
+        self,
+        server_name: str,
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> AsyncServerSession:
+        """Start a server process and run the initialize handshake on it.
+
+        Args:
+            server_name: The name of the server to start.
+            timeout: Seconds the initialize handshake may take. None waits forever.
+            timings: Receives the spawn and initialize durations.
+
+        Returns:
+            The initialized session. It is not registered in ``self.sessions``.
+
+        Raises:
+            McpError: If the server is not configured or fails to start.
+            McpTimeoutError: If the handshake does not finish in time.
+        """
+        server = self.mcp_servers.servers.get(server_name)
+        if server is None:
+            raise McpError(f"Server '{server_name}' not found in configuration.")
+        self._load_env_vars(server.env)
+        command = self._get_server_command(server_name)
+        logger.info(f"Attempting to connect to MCP server '{server_name}'...")
+        spawn_started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=os.environ.copy(),
+                limit=STREAM_LIMIT,
+            )
+        except FileNotFoundError as error:
+            raise McpError(f"Failed to start MCP server '{server_name}': Command not found ('{command[0]}'). Ensure it's in the system PATH.") from error
+
+        session = AsyncServerSession(server_name, process, self)
+        initialize_started = time.perf_counter()
+        try:
+            response = await session.request("initialize", INITIALIZE_PARAMS, timeout=timeout)
+            if "error" in response:
+                raise McpError(f"MCP server '{server_name}' rejected initialize: {response['error']}")
+            session.initialize_response = response
+            await session.notify("notifications/initialized")
+        except BaseException:
+            await session.close()
+            raise
+        if timings is not None:
+            timings["spawn"] = initialize_started - spawn_started
+            timings["initialize"] = time.perf_counter() - initialize_started
+        logger.info(f"Successfully connected to MCP server '{server_name}'.")
+        return session
+
+    async def _take_spare(self, server_name: str) -> AsyncServerSession | None:
+        """Hand out a live spare session for a server, discarding spares that exited."""
+        spares = self.spares.get(server_name, [])
+        while spares:
+            session = spares.pop(0)
+            if session.is_alive():
+                logger.info(f"Using a pre-warmed spare for MCP server '{server_name}'.")
+                return session
+            logger.info(f"Discarding spare for MCP server '{server_name}' that exited (code {session.process.returncode}).")
+            await session.close()
+        return None
+
+    def _schedule_refill(self, server_name: str):
+        """Start topping up a server's spares in the background if some are missing or exited."""
+        server = self.mcp_servers.servers.get(server_name)
+        if not self.use_spares or server is None or server.spares <= 0:
+            return
+        if sum(session.is_alive() for session in self.spares.get(server_name, [])) >= server.spares:
+            return
+        task = self._refill_tasks.get(server_name)
+        if task is None or task.done():
+            self._refill_tasks[server_name] = asyncio.create_task(self._refill_spares(server_name), name=f"mcp-{server_name}-spares")
+
+    async def _refill_spares(self, server_name: str):
+        """Start spare sessions until the server has as many live spares as configured."""
+        while True:
+            server = self.mcp_servers.servers.get(server_name)
+            spares = self.spares.setdefault(server_name, [])
+            for session in [session for session in spares if not session.is_alive()]:
+                spares.remove(session)
+                await session.close()
+            if server is None or len(spares) >= server.spares:
+                return
+            try:
+                session = await self._start_session(server_name, self.mcp_servers.get_call_timeout(server_name))
+            except Exception as error:
+                # Retried on the next connect
+                logger.error(f"Failed to start a spare for MCP server '{server_name}': {error}")
+                return
+            spares.append(session)
+
+    async def close_spares(self, server_name: str):
+        """Stop a server's spare sessions, e.g. after its definition changed."""
+        task = self._refill_tasks.pop(server_name, None)
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        spares = self.spares.pop(server_name, [])
+        await asyncio.gather(*(session.close() for session in spares))
+
+    async def request(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """Send a request over the server's session and return the raw response payload.
+
+        Args:
+            server_name: Name of the target server.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds the call may take, including startup. Defaults to
+                the server's configured timeout (see McpServers.get_call_timeout).
+            timings: Receives the duration of each phase of the call (see erasmus.mcp.metrics).
+
+        Raises:
+            McpError: If the server can't be started or exits.
+            McpTimeoutError: If the deadline expires. The request is cancelled.
+        """
+        timeout = self.mcp_servers.get_call_timeout(server_name, timeout)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = None if timeout is None else started + timeout
+        timings = {} if timings is None else timings
+        ok = False
+        try:
+            if self._is_http_server(server_name):
+                _, response = await asyncio.to_thread(
+                    self._http_client().request,
+                    self.mcp_servers.servers[server_name],
+                    method,
+                    params,
+                    timeout,
+                    on_notification=self._forward_notifications(),
+                    timings=timings,
+                )
+            else:
+                session = await self.connect(server_name, timeout, timings)
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                response = await session.request(method, params, timeout=remaining, timings=timings)
+            ok = "error" not in response
+            return response
+        except McpTimeoutError as error:
+            # Report the call's whole deadline rather than what was left of it
+            raise McpTimeoutError(server_name, method, timeout, error.request_id) from None
+        finally:
+            timings["total"] = loop.time() - started
+            if self.metrics is not None:
+                tool_name = params.get("name") if method == "tools/call" and isinstance(params, dict) else None
+                self.metrics.record(server_name, tool_name or method, timings, ok)
+
+    async def send_request(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+    ) -> Any:
+        """Send a JSON-RPC request and return its result.
+
+        Args:
+            server_name: Name of the target server.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds the call may take. Defaults to the server's configured timeout.
+
+        Returns:
+            The 'result' field from the JSON-RPC response.
+
+        Raises:
+            McpError: If the server can't be started, exits, or returns a JSON-RPC error.
+            McpTimeoutError: If the deadline expires.
+        """
+        return self._result_from_response(server_name, await self.request(server_name, method, params, timeout))
+
+    async def call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Call a tool on a server and return its result."""
+        return await self.send_request(server_name, "tools/call", {"name": tool_name, "arguments": arguments or {}}, timeout)
+
+    async def list_tools(self, server_name: str) -> list[dict[str, Any]]:
+        """Return the tool definitions advertised by a server."""
+        result = await self.send_request(server_name, "tools/list", {})
+        return result.get("tools", [])
+
+    async def disconnect(self, server_name: str):
+        """Close a server's session, failing any requests still in flight."""
+        if self.http is not None and server_name in self.http.sessions:
+            await asyncio.to_thread(self.http.disconnect, server_name)
+            return
+        session = self.sessions.pop(server_name, None)
+        if session is None:
+            logger.warning(f"Not connected to MCP server '{server_name}', cannot disconnect.")
+            return
+        logger.info(f"Disconnecting from MCP server '{server_name}'...")
+        await session.close()
+
+    async def disconnect_all(self):
+        """Close every open session and every spare."""
+        await asyncio.gather(*(self.close_spares(server_name) for server_name in {*self.spares, *self._refill_tasks}))
+        await asyncio.gather(*(self.disconnect(server_name) for server_name in list(self.sessions)))
+        if self.http is not None:
+            await asyncio.to_thread(self.http.close)
+            self.http = None
@@ -0,0 +1,135 @@
+"""
+Batch execution of MCP tool calls over a single server session.
+
+Reads ``{"tool": ..., "arguments": {...}}`` records (one JSON object per line),
+pipelines them over one AsyncStdioClient session with a bounded number of calls
+in flight, and yields results in completion order tagged with the index of the
+record they belong to.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any
+
+from erasmus.mcp.async_client import AsyncStdioClient
+from erasmus.mcp.models import McpTimeoutError
+
+# Calls kept in flight at once when no concurrency is given
+DEFAULT_BATCH_CONCURRENCY = 8
+
+_DONE = object()
+
+
+def parse_batch_record(line: str) -> tuple[str, dict[str, Any]]:
+    """Parse one batch line into a tool name and its arguments.
+
+    Args:
+        line: A JSON object with a "tool" (or "name") and optional "arguments".
+
+    Returns:
+        The tool name and arguments.
+
+    Raises:
+        ValueError: If the line is not a valid call record.
+    """
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Invalid JSON: {error}") from error
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object")
+    tool_name = record.get("tool", record.get("name"))
+    if not isinstance(tool_name, str) or not tool_name:
+        raise ValueError("Record is missing the 'tool' field")
+    arguments = record.get("arguments") or {}
+    if not isinstance(arguments, dict):
+        raise ValueError("'arguments' must be a JSON object")
+    return tool_name, arguments
+
+
+async def run_batch(
+    client: AsyncStdioClient,
+    server_name: str,
+    lines: Iterable[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    timeout: float | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Run tool calls from JSONL lines and yield results as they complete.
+
+    Lines are read lazily, so only ``concurrency`` calls are pending at a time
+    regardless of the input size. Lines from a file or stdin are read in a
+    worker thread so a slow pipe does not stall calls already in flight. Blank
+    lines are skipped and do not count towards the index.
+
+    Args:
+        client: Client holding the server session.
+        server_name: Name of the server to call.
+        lines: JSONL call records.
+        concurrency: Maximum number of calls in flight.
+        timeout: Seconds each call may take. Defaults to the server's configured timeout.
+
+    Yields:
+        ``{"index", "tool", "result"}`` for successful calls and
+        ``{"index", "tool", "error"}`` for failed or invalid records. Calls
+        that ran out of time also carry ``"code": "timeout"``.
+
+    Raises:
+        McpError: If the server cannot be started.
+    """
+    await client.connect(server_name)
+    results: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _call(index: int, tool_name: str, arguments: dict[str, Any]):
+        try:
+            result = await client.call_tool(server_name, tool_name, arguments, timeout)
+            await results.put({"index": index, "tool": tool_name, "result": result})
+        except McpTimeoutError as error:
+            await results.put({"index": index, "tool": tool_name, "error": str(error), "code": "timeout"})
+        except Exception as error:
+            # Report per record; only cancellation ends the batch
+            await results.put({"index": index, "tool": tool_name, "error": str(error) or type(error).__name__})
+        finally:
+            slots.release()
+
+    async def _read_lines() -> AsyncIterator[str]:
+        if isinstance(lines, Sequence):
+            for line in lines:
+                yield line
+            return
+        # Reading a file or pipe may block, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        iterator = iter(lines)
+        while (line := await loop.run_in_executor(None, next, iterator, None)) is not None:
+            yield line
+
+    async def _produce():
+        tasks = set()
+        try:
+            index = 0
+            async for line in _read_lines():
+                if not line.strip():
+                    continue
+                try:
+                    tool_name, arguments = parse_batch_record(line)
+                except ValueError as error:
+                    await results.put({"index": index, "tool": None, "error": str(error)})
+                else:
+                    await slots.acquire()
+                    task = asyncio.create_task(_call(index, tool_name, arguments))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                index += 1
+            await asyncio.gather(*tasks)
+        finally:
+            await results.put(_DONE)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while (item := await results.get()) is not _DONE:
+            yield item
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
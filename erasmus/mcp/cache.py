@@ -0,0 +1,251 @@
+"""
+On-disk response cache for read-only MCP tool calls.
+
+Responses are stored in a SQLite database keyed by server, tool, the
+canonical JSON of the call arguments and the server's identity: a digest of its
+command, resolved env and headers, so a response cached under one token is
+never served to another. Entries expire after a per-tool TTL, and
+the least recently used entries are evicted once the cache exceeds its entry or
+size limits. Only tools whose registry annotations carry ``readOnlyHint`` are
+cached; the caller decides that and passes ``read_only=True``.
+
+Settings come from an optional ``cache`` section in mcp_config.json:
+
+    "cache": {
+        "default_ttl": 300,
+        "max_entries": 1000,
+        "max_bytes": 52428800,
+        "ttls": {"github": {"get_me": 3600, "list_commits": 60}}
+    }
+
+A TTL of 0 disables caching for that tool.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from erasmus.mcp.models import McpServer
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Key added to a result's _meta to report whether it came from the cache
+CACHE_META_KEY = "erasmus/cache"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    server TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS stats (
+    server TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (server, tool)
+);
+"""
+
+
+def server_identity(server: McpServer) -> str:
+    """Digest the settings that decide who a server acts as: its command, resolved env and headers."""
+    canonical = json.dumps(
+        {"command": server.command, "args": server.args, "url": server.url, "env": server.env, "headers": server.resolved_headers()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def cache_key(server_name: str, tool_name: str, arguments: dict[str, Any] | None, identity: str = "") -> str:
+    """Return the cache key for a call, independent of argument order."""
+    canonical = json.dumps(
+        {"server": server_name, "identity": identity, "tool": tool_name, "arguments": arguments or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ToolResponseCache:
+    """TTL and LRU bounded cache of tool call responses."""
+
+    def __init__(self, db_path: Path, settings: dict[str, Any] | None = None):
+        """Open (or create) the cache database.
+
+        Args:
+            db_path: Location of the SQLite database.
+            settings: The ``cache`` section of mcp_config.json.
+        """
+        settings = settings or {}
+        self.db_path = db_path
+        self.default_ttl = float(settings.get("default_ttl", DEFAULT_TTL))
+        self.max_entries = int(settings.get("max_entries", DEFAULT_MAX_ENTRIES))
+        self.max_bytes = int(settings.get("max_bytes", DEFAULT_MAX_BYTES))
+        self.ttls: dict[str, dict[str, float]] = settings.get("ttls", {})
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def ttl_for(self, server_name: str, tool_name: str) -> float:
+        """Return the TTL in seconds for a tool (0 means do not cache)."""
+        return float(self.ttls.get(server_name, {}).get(tool_name, self.default_ttl))
+
+    def _record(self, connection: sqlite3.Connection, server_name: str, tool_name: str, column: str):
+        connection.execute(
+            f"INSERT INTO stats (server, tool, {column}) VALUES (?, ?, 1) "
+            f"ON CONFLICT (server, tool) DO UPDATE SET {column} = {column} + 1",
+            (server_name, tool_name),
+        )
+
+    def get(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        identity: str = "",
+    ) -> tuple[dict[str, Any], float] | None:
+        """Look up a cached response and record the hit or miss.
+
+        Args:
+            server_name: Name of the server.
+            tool_name: Name of the tool.
+            arguments: Call arguments.
+            identity: The server's identity (see server_identity).
+
+        Returns:
+            The cached JSON-RPC response and its age in seconds, or None on a miss.
+        """
+        if self.ttl_for(server_name, tool_name) <= 0:
+            return None
+        now = time.time()
+        key = cache_key(server_name, tool_name, arguments, identity)
+        try:
+            with self._lock, self._connect() as connection:
+                row = connection.execute(
+                    "SELECT response, stored_at FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    self._record(connection, server_name, tool_name, "misses")
+                    return None
+                connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self._record(connection, server_name, tool_name, "hits")
+        except sqlite3.Error as error:
+            logger.warning(f"MCP response cache unavailable ({self.db_path}): {error}")
+            return None
+        return json.loads(row[0]), now - row[1]
+
+    def put(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        response: dict[str, Any],
+        identity: str = "",
+    ):
+        """Store a response and evict expired and least recently used entries.
+
+        Args:
+            server_name: Name of the server.
+            tool_name: Name of the tool.
+            arguments: Call arguments.
+            response: The JSON-RPC response to cache.
+            identity: The server's identity (see server_identity).
+        """
+        ttl = self.ttl_for(server_name, tool_name)
+        if ttl <= 0:
+            return
+        payload = json.dumps(response, separators=(",", ":"))
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, server, tool, response, size, stored_at, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key(server_name, tool_name, arguments, identity), server_name, tool_name, payload, len(payload), now, now + ttl, now),
+                )
+                self._evict(connection, now)
+        except sqlite3.Error as error:
+            logger.warning(f"Failed to write MCP response cache ({self.db_path}): {error}")
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} least recently used MCP cache entries")
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Return hit/miss counters and cached entry counts per server and tool."""
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT s.server, s.tool, s.hits, s.misses, "
+                "(SELECT COUNT(*) FROM responses r WHERE r.server = s.server AND r.tool = s.tool) "
+                "FROM stats s ORDER BY s.server, s.tool"
+            ).fetchall()
+        return [
+            {"server": server, "tool": tool, "hits": hits, "misses": misses, "entries": entries}
+            for server, tool, hits, misses, entries in rows
+        ]
+
+    def clear(self, server_name: str | None = None):
+        """Drop cached responses and counters (for one server, or all)."""
+        with self._lock, self._connect() as connection:
+            if server_name is None:
+                connection.execute("DELETE FROM responses")
+                connection.execute("DELETE FROM stats")
+            else:
+                connection.execute("DELETE FROM responses WHERE server = ?", (server_name,))
+                connection.execute("DELETE FROM stats WHERE server = ?", (server_name,))
+
+
+def mark_cache_status(response: dict[str, Any], status: str, age: float | None = None) -> dict[str, Any]:
+    """Report a cache hit or miss in the result's ``_meta``.
+
+    Args:
+        response: The JSON-RPC response.
+        status: "hit" or "miss".
+        age: Age of a cached response in seconds.
+
+    Returns:
+        The same response, annotated.
+    """
+    result = response.get("result")
+    if isinstance(result, dict):
+        meta = result.setdefault("_meta", {})
+        meta[CACHE_META_KEY] = {"status": status} if age is None else {"status": status, "age": round(age, 3)}
+    return response
@@ -1,6 +1,9 @@
 from erasmus.utils.rich_console import get_console_logger
-from erasmus.mcp.models import McpError
-from erasmus.mcp.servers import McpServers
+from erasmus.mcp.models import STDERR_LINE_LIMIT, McpError, McpTimeoutError
+from erasmus.mcp.servers import McpServers, get_mcp_servers, prompt_for_env_value
+from erasmus.mcp.daemon import DaemonClient, get_daemon_socket_path
+from erasmus.mcp.cache import ToolResponseCache, mark_cache_status, server_identity
+from erasmus.mcp.metrics import LatencyStore
 from erasmus.mcp.models import (
     ServerTransport,
     RPCRequest,
@@ -8,38 +11,42 @@ from erasmus.mcp.models import (
     CallToolRequest,
     InitializeRequest
 )
-from typing import Any, Optional
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Optional
+import atexit
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import subprocess
 import os
 import json
+import threading
 import time
 import io
 
 from subprocess import PIPE
 from pydantic import ConfigDict
 
-logger = get_console_logger()
+if TYPE_CHECKING:
+    from erasmus.mcp.http_transport import HttpClient
 
+logger = get_console_logger()
 
-class StdioClient:
-    """Client for interacting with MCP servers over standard input/output.
+# Sent with every initialize request
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {"name": "erasmus", "version": "0"},
+}
+# Bytes of a frame included in debug logs
+LOG_PREVIEW_BYTES = 200
+# Seconds a server gets to answer a ping after one of its requests was cancelled
+CANCEL_GRACE = 2.0
 
-    Manages subprocesses for MCP servers defined in a configuration file,
-    starts them on demand, and handles JSON-RPC 2.0 communication
-    over their stdin/stdout.
-    """
-    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def __init__(self):
-        """Initialize the StdioClient.
+class McpClientBase:
+    """Configuration and response helpers shared by the sync and async MCP clients."""
 
-        Loads server definitions and prepares to manage server processes.
-        """
-        self.mcp_servers = McpServers()
-        self.transports: dict[str, ServerTransport] = {} # Store active transports
-        self._request_id_counter = 0 # Counter for JSON-RPC request IDs
-        self.request_json_str = ""
-        logger.debug("StdioClient initialized.")
+    mcp_servers: McpServers
+    http: "HttpClient | None" = None
 
     def get_servers(self) -> dict[str, McpServers]:
         """Get the MCP servers defined in the configuration.
@@ -68,6 +75,20 @@ class StdioClient:
         logger.debug(f"Constructed command for '{server_name}': {command}")
         return command
 
+    def _is_http_server(self, server_name: str) -> bool:
+        """Return whether a server is reached over HTTP at its url rather than spawned."""
+        server = self.mcp_servers.servers.get(server_name)
+        return server is not None and server.url is not None
+
+    def _http_client(self) -> "HttpClient":
+        """Return the client's pooled HTTP transport, created on first use."""
+        if self.http is None:
+            # Imported here so stdio-only runs never load requests
+            from erasmus.mcp.http_transport import HttpClient
+
+            self.http = HttpClient()
+        return self.http
+
     def _load_env_vars(self, env: dict[str, str]):
         """Load environment variables required by the server into the current environment.
 
@@ -76,27 +97,83 @@ class StdioClient:
         """
         logger.debug(f"Loading environment variables: {env.keys()}")
         for key, value in env.items():
-            try:
-                if value.startswith("$"):
-                    value = os.environ.get(key, "")
-                if not value or value.startswith("$"):
-                    self._create_dynamic_prompt_for_value(key)
-                os.environ[key] = value
-                if not os.environ[key]:
-                    logger.debug(f"Environment variable '{key}' was empty, prompting user")
-                    self._create_dynamic_prompt_for_value(key)
-            except KeyError:
-                logger.debug(f"Environment variable '{key}' not found, prompting user")
-                self._create_dynamic_prompt_for_value(key)
-
-    def _create_dynamic_prompt_for_value(self, key: str):
-        """Prompt the user for a value for the given environment variable key.
-        
+            if not value or value.startswith("$"):
+                value = os.environ.get(key, "")
+            if not value:
+                logger.debug(f"Environment variable '{key}' is empty, prompting user")
+                value = prompt_for_env_value(key)
+            os.environ[key] = value
+
+    def _result_from_response(self, server_name: str, response_payload: dict[str, Any]) -> Any:
+        """Return the result of a JSON-RPC response, raising on errors.
+
+        Args:
+            server_name: Name of the server that answered.
+            response_payload: The raw JSON-RPC response.
+
+        Returns:
+            The 'result' field from the JSON-RPC response.
+
+        Raises:
+            McpError: If the server returned a JSON-RPC error or an invalid response.
+        """
+        # Check for JSON-RPC error
+        if "error" in response_payload:
+            error_data = response_payload["error"]
+            code = error_data.get('code', 'N/A')
+            message = error_data.get('message', 'No message')
+            raise McpError(f"MCP server '{server_name}' returned error: Code {code}, Message: {message}")
+
+        if "result" not in response_payload:
+            raise McpError(f"Invalid JSON-RPC response from '{server_name}': Missing 'result' or 'error' field. Response: {response_payload}")
+
+        result = response_payload["result"]
+        # Ensure content is always a list if present
+        if isinstance(result, dict) and "content" in result:
+            if not isinstance(result["content"], list):
+                result["content"] = [result["content"]] if result["content"] is not None else []
+        return result
+
+
+class StdioClient(McpClientBase):
+    """Client for interacting with MCP servers over standard input/output.
+
+    Manages subprocesses for MCP servers defined in a configuration file,
+    starts them on demand, and handles JSON-RPC 2.0 communication
+    over their stdin/stdout. Each server keeps one initialized process
+    that is reused across requests and respawned if it dies. When the MCP
+    daemon is running, requests are forwarded to its warm processes instead.
+    Servers configured with a ``url`` are reached over streamable HTTP
+    (see erasmus.mcp.http_transport) and are never spawned.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def __init__(
+        self,
+        use_daemon: bool = True,
+        cache: ToolResponseCache | None = None,
+        metrics: LatencyStore | None = None,
+        mcp_servers: McpServers | None = None,
+    ):
+        """Initialize the StdioClient.
+
+        Loads server definitions and prepares to manage server processes.
+
         Args:
-            key: The environment variable key to prompt for.
+            use_daemon: Forward requests to the MCP daemon when it is running.
+            cache: Response cache consulted for read-only tool calls.
+            metrics: Store receiving per-phase latencies of every call.
+            mcp_servers: Server definitions to use. Loaded from mcp_config.json when omitted.
         """
-        value = input(f"Enter value for {key}: ")
-        os.environ[key] = value
+        self.mcp_servers = mcp_servers or get_mcp_servers()
+        self.cache = cache
+        self.metrics = metrics
+        self.daemon = DaemonClient(get_daemon_socket_path(self.mcp_servers.config_path)) if use_daemon else None
+        self.transports: dict[str, ServerTransport] = {} # Store active transports
+        self._lock = threading.RLock() # Guards self.transports and self._connect_locks
+        self._connect_locks: dict[str, threading.Lock] = {} # One per server, held while spawning
+        atexit.register(self.disconnect_all)
+        logger.debug("StdioClient initialized.")
 
     def _get_request(
         self,
@@ -109,258 +186,583 @@ class StdioClient:
     def connect(self, server_name: str) -> bool:
         """Connect to a specific MCP server by starting its process.
 
-        If the server process is already running, this method does nothing.
-        Otherwise, it attempts to launch the server subprocess using the
-        configured command and environment variables.
+        If a live session for the server already exists, this method does nothing.
+        Otherwise, it launches the server subprocess using the configured command
+        and environment variables, performs the initialize handshake and keeps
+        the session in ``self.transports`` for reuse by later requests.
 
         Args:
             server_name: The name of the server to connect to.
 
         Returns:
             True if the connection is established or already exists, False otherwise.
+        """
+        try:
+            if self._is_http_server(server_name):
+                self._http_client().connect(self.mcp_servers.servers[server_name])
+            else:
+                self._connect(server_name)
+            return True
+        except McpError as error:
+            logger.error(f"Failed to start MCP server '{server_name}': {error}")
+        except Exception as error:
+            logger.error(f"Failed to start MCP server '{server_name}': {error}", exc_info=True)
+        return False
+
+    def _connect(
+        self,
+        server_name: str,
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> ServerTransport:
+        """Return the live session for a server, starting and initializing it if needed.
+
+        Args:
+            server_name: The name of the server to connect to.
+            timeout: Seconds the initialize handshake may take. None waits forever.
+            timings: Receives the spawn and initialize durations when the server is started.
+
+        Returns:
+            The initialized session.
 
         Raises:
-            McpError: If there's an issue starting the server process or configuration is missing.
+            McpError: If the server is not configured or fails to start.
+            McpTimeoutError: If the handshake does not finish in time.
         """
-        logger.info(f"Attempting to connect to MCP server '{server_name}'...")
-        try:
-            server = self.mcp_servers.servers.get(server_name)
+        with self._lock:
+            connect_lock = self._connect_locks.setdefault(server_name, threading.Lock())
+        # Only this server's lock is held during the handshake, so a slow or hung
+        # server does not block connections to the others (or a disconnect).
+        with connect_lock:
+            transport = self.transports.get(server_name)
+            if transport is not None and transport.is_alive():
+                return transport
+            if transport is not None:
+                logger.info(f"MCP server '{server_name}' exited (code {transport.process.poll()}), respawning.")
+                self.disconnect(server_name)
 
+            server = self.mcp_servers.servers.get(server_name)
+            if server is None:
+                raise McpError(f"Server '{server_name}' not found in configuration.")
+            logger.info(f"Attempting to connect to MCP server '{server_name}'...")
             self._load_env_vars(server.env)
             command = self._get_server_command(server_name)
-            self.request_json_str = self._get_request("initialize", {}, 1).model_dump_json() + "\n"
-            process = subprocess.Popen(
-                command,
-                stdin=PIPE,
-                stdout=PIPE,
-                stderr=PIPE,
-                env=os.environ.copy(),
-                text=True,
+            spawn_started = time.perf_counter()
+            try:
+                process = subprocess.Popen(
+                    command,
+                    stdin=PIPE,
+                    stdout=PIPE,
+                    stderr=PIPE,
+                    env=os.environ.copy(),
+                )
+            except FileNotFoundError as error:
+                raise McpError(f"Command '{command[0]}' for MCP server '{server_name}' was not found. Ensure it's in the system PATH.") from error
+            transport = ServerTransport(
+                name=server_name,
+                process=process,
+                connected=True,
+                stdin=process.stdin,
+                stdout=process.stdout,
+                stderr=process.stderr,
             )
+            for target, stream in ((self._drain_stderr, "stderr"), (self._read_stdout, "stdout")):
+                threading.Thread(
+                    target=target,
+                    args=(transport,),
+                    name=f"mcp-{server_name}-{stream}",
+                    daemon=True,
+                ).start()
+            with self._lock:
+                self.transports[server_name] = transport
+            initialize_started = time.perf_counter()
+            try:
+                self._initialize(transport, timeout)
+            except BaseException:
+                if self.transports.get(server_name) is transport:
+                    self.disconnect(server_name)
+                raise
+            if timings is not None:
+                timings["spawn"] = initialize_started - spawn_started
+                timings["initialize"] = time.perf_counter() - initialize_started
             logger.info(f"Successfully connected to MCP server '{server_name}'.")
-            return process
+            return transport
 
-        except FileNotFoundError:
-             logger.error(f"Failed to start MCP server '{server_name}': Command not found ('{command[0]}'). Ensure it's in the system PATH.")
-             return False
-        except Exception as error:
-            logger.error(f"Failed to start MCP server '{server_name}': {error}", exc_info=True)
-            return False
+    def _initialize(self, transport: ServerTransport, timeout: float | None = None):
+        """Run the MCP initialize handshake on a freshly started session.
+
+        Args:
+            transport: The session to initialize.
+            timeout: Seconds to wait for the initialize response. None waits forever.
+
+        Raises:
+            McpError: If the server rejects the handshake or exits during it.
+            McpTimeoutError: If the server does not answer in time.
+        """
+        response = self._exchange(transport, "initialize", INITIALIZE_PARAMS, timeout=timeout)
+        if "error" in response:
+            raise McpError(f"MCP server '{transport.name}' rejected initialize: {response['error']}")
+        transport.initialize_response = response
+        self._write_message(transport, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    @staticmethod
+    def _drain_stderr(transport: ServerTransport):
+        """Keep a bounded tail of a server's stderr so the pipe never fills up.
+
+        Lines longer than STDERR_LINE_LIMIT bytes are kept as several entries.
+        """
+        try:
+            while line := transport.stderr.readline(STDERR_LINE_LIMIT):
+                transport.stderr_tail.append(line.decode(errors="replace"))
+        except (OSError, ValueError):
+            pass
+
+    def _write_message(self, transport: ServerTransport, message: dict[str, Any]):
+        """Write one newline-delimited JSON-RPC message to a session's stdin."""
+        data = json.dumps(message).encode() + b"\n"
+        logger.debug(f"Sending to {transport.name} stdin: {data[:LOG_PREVIEW_BYTES]!r}")
+        with transport.lock:
+            transport.stdin.write(data)
+            transport.stdin.flush()
+
+    def _read_messages(self, transport: ServerTransport) -> Iterator[tuple[dict[str, Any], dict[str, float]]]:
+        """Yield JSON-RPC messages from a session's stdout as each frame completes.
+
+        Frames are decoded straight from the bytes read off the pipe, one
+        newline-delimited document at a time, so no more than the current
+        frame is buffered. Frames that are not JSON are logged and skipped.
+
+        Yields:
+            Each message with the perf_counter times its first byte and its
+            last byte arrived, and the seconds spent decoding it.
+
+        Raises:
+            McpError: When the server closes stdout.
+        """
+        while True:
+            # Blocks until the next frame starts arriving
+            transport.stdout.peek(1)
+            first_byte_at = time.perf_counter()
+            frame = transport.stdout.readline()
+            received_at = time.perf_counter()
+            if not frame:
+                exit_code = transport.process.poll()
+                stderr_output = "".join(transport.stderr_tail).strip()
+                raise McpError(f"MCP server '{transport.name}' terminated unexpectedly while waiting for response. Exit code: {exit_code}. Stderr: {stderr_output}")
+            if frame.isspace():
+                continue
+            logger.debug(f"Received from {transport.name} stdout: {frame[:LOG_PREVIEW_BYTES]!r}")
+            try:
+                message = json.loads(frame)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring non-JSON output from '{transport.name}': {frame[:LOG_PREVIEW_BYTES]!r}")
+                continue
+            yield message, {"first_byte_at": first_byte_at, "received_at": received_at, "decode": time.perf_counter() - received_at}
+
+    def _read_stdout(self, transport: ServerTransport):
+        """Resolve a session's pending requests from its stdout until the server exits."""
+        error = McpError(f"MCP server '{transport.name}' was disconnected.")
+        try:
+            for message, timing in self._read_messages(transport):
+                self._dispatch(transport, message, timing)
+        except McpError as exc:
+            error = exc
+        except (OSError, ValueError):
+            # stdout was closed by disconnect()
+            pass
+        transport.connected = False
+        with transport.lock:
+            pending = list(transport.pending.values())
+            transport.pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _dispatch(self, transport: ServerTransport, message: dict[str, Any], timing: dict[str, float]):
+        if "method" not in message:
+            with transport.lock:
+                future = transport.pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result((message, timing))
+            else:
+                # Typically a late answer to a request that was cancelled
+                logger.debug(f"Ignoring response with unknown ID from '{transport.name}': {message.get('id')}")
+            return
+
+        if "id" in message:
+            # Server-to-client request: answer pings, reject everything else
+            if message["method"] == "ping":
+                reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+            else:
+                reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": f"Method not found: {message['method']}"}}
+            try:
+                self._write_message(transport, reply)
+            except (OSError, ValueError):
+                pass
+            return
+
+        logger.debug(f"Notification from '{transport.name}': {message['method']}")
+
+    def _exchange(
+        self,
+        transport: ServerTransport,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        cancel: bool = True,
+        timings: dict[str, float] | None = None,
+    ) -> dict[str, Any]:
+        """Send a request on a session and wait for the response with the same id.
+
+        Responses are matched by the session's stdout reader thread, so several
+        threads can have requests in flight on one session.
+
+        Args:
+            transport: The session to use.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds to wait for the response. None waits forever.
+            cancel: Send ``notifications/cancelled`` when the timeout expires.
+            timings: Receives the write, first_byte, response and decode durations.
+
+        Returns:
+            The raw JSON-RPC response payload.
+
+        Raises:
+            BrokenPipeError: If the request could not be written.
+            McpError: If the server exits before answering.
+            McpTimeoutError: If the timeout expires.
+        """
+        future = Future()
+        write_started = time.perf_counter()
+        with transport.lock:
+            if not transport.connected:
+                raise BrokenPipeError(f"MCP server '{transport.name}' is not connected.")
+            request_id = transport.next_request_id()
+            transport.pending[request_id] = future
+            try:
+                self._write_message(transport, RPCRequest(method=method, params=params, id=request_id).model_dump())
+            except BaseException:
+                transport.pending.pop(request_id, None)
+                raise
+        written_at = time.perf_counter()
+
+        try:
+            response, frame_timing = future.result(timeout)
+        except FutureTimeoutError:
+            with transport.lock:
+                transport.pending.pop(request_id, None)
+            # The initialize request must not be cancelled; the caller stops the process instead
+            if cancel and method != "initialize":
+                self._cancel(transport, request_id, f"No response within {timeout:g}s")
+            raise McpTimeoutError(transport.name, method, timeout, request_id) from None
+        if timings is not None:
+            timings["write"] = written_at - write_started
+            timings["first_byte"] = max(frame_timing["first_byte_at"] - written_at, 0)
+            timings["response"] = frame_timing["received_at"] - written_at
+            timings["decode"] = frame_timing["decode"]
+        return response
+
+    def _cancel(self, transport: ServerTransport, request_id: int, reason: str):
+        """Cancel a request, then stop the server in the background if it no longer answers pings.
+
+        A server that honors the cancellation keeps its process, so the next
+        call does not pay for a respawn.
+        """
+        try:
+            self._write_message(transport, {
+                "jsonrpc": "2.0",
+                "method": "notifications/cancelled",
+                "params": {"requestId": request_id, "reason": reason},
+            })
+        except (OSError, ValueError):
+            return
+
+        def _probe():
+            try:
+                self._exchange(transport, "ping", {}, timeout=CANCEL_GRACE, cancel=False)
+            except McpTimeoutError:
+                logger.warning(f"MCP server '{transport.name}' is unresponsive after a cancelled request, stopping it.")
+                if self.transports.get(transport.name) is transport:
+                    self.disconnect(transport.name)
+            except (McpError, OSError, ValueError):
+                pass
+
+        threading.Thread(target=_probe, name=f"mcp-{transport.name}-probe", daemon=True).start()
+
+    def _request(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> tuple[ServerTransport, dict[str, Any]]:
+        """Send a request over the server's persistent session, respawning it if needed.
+
+        A request that could not be written because the process died is retried
+        once on a fresh process. A process that dies after the request was sent
+        is not retried, since the call may already have had side effects.
+
+        Args:
+            server_name: Name of the target server.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds the call may take, including startup. Defaults to
+                the server's configured timeout (see McpServers.get_call_timeout).
+            timings: Receives the duration of each phase of the call (see erasmus.mcp.metrics).
+
+        Returns:
+            The session used and the raw JSON-RPC response payload.
+
+        Raises:
+            McpError: If the server cannot be started or the exchange fails.
+            McpTimeoutError: If the deadline expires. The request is cancelled.
+        """
+        if server_name not in self.mcp_servers.servers:
+            raise McpError(f"Server '{server_name}' not found in configuration.")
+        timeout = self.mcp_servers.get_call_timeout(server_name, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def _remaining() -> float | None:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        try:
+            for attempt in range(2):
+                transport = self._connect(server_name, timeout=_remaining(), timings=timings)
+                try:
+                    return transport, self._exchange(transport, method, params, timeout=_remaining(), timings=timings)
+                except (BrokenPipeError, ValueError) as error:
+                    # ValueError: write to a closed pipe
+                    transport.connected = False
+                    if attempt:
+                        stderr_output = "".join(transport.stderr_tail).strip()
+                        raise McpError(f"Broken pipe while communicating with '{server_name}'. Process likely terminated. Exit code: {transport.process.poll()}. Stderr: {stderr_output}") from error
+                    logger.warning(f"MCP server '{server_name}' is gone, respawning and retrying {method}.")
+                except McpTimeoutError:
+                    raise
+                except McpError:
+                    if not transport.is_alive() and self.transports.get(server_name) is transport:
+                        self.disconnect(server_name)
+                    raise
+        except McpTimeoutError as error:
+            # Report the call's whole deadline rather than what was left of it
+            raise McpTimeoutError(server_name, method, timeout, error.request_id) from None
 
     def disconnect(self, server_name: str):
-         """Disconnect from a specific MCP server by terminating its process.
-
-         Args:
-            server_name: The name of the server to disconnect from.
-         """
-         if server_name in self.transports:
-             transport = self.transports[server_name]
-             process = transport.process
-             logger.info(f"Disconnecting from MCP server '{server_name}'...")
-             if process.poll() is None: # Check if still running
-                 try:
-                     process.terminate()
-                     process.wait(timeout=2) # Wait briefly
-                     logger.info(f"MCP server '{server_name}' terminated.")
-                 except subprocess.TimeoutExpired:
-                     logger.warning(f"MCP server '{server_name}' did not terminate gracefully, killing.")
-                     process.kill()
-                 except Exception as error:
-                     logger.error(f"Error terminating server '{server_name}': {error}")
-             else:
-                 logger.info(f"MCP server '{server_name}' was already stopped.")
-             del self.transports[server_name]
-         else:
-             logger.warning(f"Not connected to MCP server '{server_name}', cannot disconnect.")
+        """Disconnect from a specific MCP server by terminating its process.
+
+        Stdin is closed first so well-behaved servers can exit on EOF.
+
+        Args:
+           server_name: The name of the server to disconnect from.
+        """
+        if self.http is not None and server_name in self.http.sessions:
+            self.http.disconnect(server_name)
+            return
+        with self._lock:
+            transport = self.transports.pop(server_name, None)
+        if transport is None:
+            logger.warning(f"Not connected to MCP server '{server_name}', cannot disconnect.")
+            return
+        transport.connected = False
+        process = transport.process
+        logger.info(f"Disconnecting from MCP server '{server_name}'...")
+        if process.poll() is None: # Check if still running
+            try:
+                try:
+                    process.stdin.close()
+                    process.wait(timeout=0.5)
+                except (OSError, ValueError, subprocess.TimeoutExpired):
+                    process.terminate()
+                    process.wait(timeout=2) # Wait briefly
+                logger.info(f"MCP server '{server_name}' terminated.")
+            except subprocess.TimeoutExpired:
+                logger.warning(f"MCP server '{server_name}' did not terminate gracefully, killing.")
+                process.kill()
+            except Exception as error:
+                logger.error(f"Error terminating server '{server_name}': {error}")
+        else:
+            logger.info(f"MCP server '{server_name}' was already stopped.")
+        for stream in (process.stdout, process.stderr):
+            try:
+                stream.close()
+            except Exception:
+                pass
 
     def disconnect_all(self):
-         """Disconnect from all currently connected MCP servers."""
-         server_names = list(self.transports.keys())
-         logger.info(f"Disconnecting from all servers: {server_names}")
-         for server_name in server_names:
-             self.disconnect(server_name)
+        """Disconnect from all currently connected MCP servers."""
+        server_names = list(self.transports.keys())
+        if server_names:
+            logger.info(f"Disconnecting from all servers: {server_names}")
+        for server_name in server_names:
+            self.disconnect(server_name)
+        if self.http is not None:
+            self.http.close()
+            self.http = None
+
+    def _send(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any], str]:
+        """Run one request through the daemon, a local session or HTTP, and record its latency.
 
-    def communicate(self, server_name: str, method: str, params: dict[str, Any] | list[Any]) -> tuple[str, str]:
-        """Send a single JSON-RPC request to an MCP server using subprocess.communicate.
+        Returns:
+            The session's initialize response, the response to this request and
+            the stderr the server produced since the previous call.
+        """
+        timeout = self.mcp_servers.get_call_timeout(server_name, timeout)
+        timings: dict[str, float] = {}
+        ok = False
+        started = time.perf_counter()
+        try:
+            http_server = self.mcp_servers.servers.get(server_name) if self._is_http_server(server_name) else None
+            # HTTP servers are already shared and warm, so they skip the daemon
+            reply = self.daemon.request(server_name, method, params, timeout=timeout) if self.daemon and http_server is None else None
+            if http_server is not None:
+                session, response = self._http_client().request(http_server, method, params, timeout=timeout, timings=timings)
+                initialize_response, stderr = session.initialize_response, ""
+            elif reply is not None:
+                initialize_response, response, stderr = reply["initialize"], reply["response"], reply.get("stderr", "")
+                timings.update(reply.get("timings") or {})
+            else:
+                transport, response = self._request(server_name, method, params, timeout=timeout, timings=timings)
+                initialize_response = transport.initialize_response
+                with transport.lock:
+                    stderr = "".join(transport.stderr_tail)
+                    transport.stderr_tail.clear()
+            result = response.get("result")
+            ok = "error" not in response and not (isinstance(result, dict) and result.get("isError"))
+            return initialize_response, response, stderr
+        finally:
+            timings["total"] = time.perf_counter() - started
+            if self.metrics is not None:
+                tool_name = params.get("name") if method == "tools/call" and isinstance(params, dict) else None
+                self.metrics.record(server_name, tool_name or method, timings, ok)
+
+    def call(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        read_only: bool = False,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Send a single JSON-RPC request to an MCP server and return the decoded responses.
 
-        This method starts a new server process for the request, sends the request
-        data to its stdin, and reads the entire stdout and stderr streams until
-        the process terminates. It then returns the captured stdout and stderr.
+        Goes through the MCP daemon when it is running. Otherwise the first call
+        for a server starts its process and performs the initialize handshake,
+        and later calls reuse the same process.
 
-        Note: This is suitable for single-shot interactions but inefficient for
-        multiple requests to the same server, as it incurs process startup/shutdown
-        overhead for each call. For persistent connections, use send_request (if
-        the server correctly handles newline-terminated responses on stdout).
+        Read-only tool calls are answered from the response cache when possible.
+        A cache hit returns only the cached response. The result's
+        ``_meta["erasmus/cache"]`` reports the hit or miss.
 
         Args:
             server_name: The name of the configured MCP server to communicate with.
             method: The JSON-RPC method name to call.
             params: The parameters for the JSON-RPC method.
+            timeout: Seconds to wait for the response. Defaults to the server's
+                ``timeout`` from mcp_config.json, else DEFAULT_CALL_TIMEOUT; 0 waits forever.
+            read_only: The tool is annotated read-only, so its result may be cached.
 
         Returns:
-            A tuple containing the captured stdout and stderr strings from the
-            server process.
+            The initialize response followed by the response to this request,
+            and the stderr the server produced since the previous call.
 
         Raises:
-            McpError: If the server name is not found in the configuration.
-            Exception: Can raise exceptions from subprocess.Popen or communicate.
+            McpError: If the server name is not found in the configuration or
+                the exchange fails.
+            McpTimeoutError: If the server does not answer in time.
         """
-        if server_name not in self.mcp_servers.servers:
-            raise McpError(f"Server '{server_name}' not found in configuration.")
-        
-        server = self.mcp_servers.servers.get(server_name)
-        self._load_env_vars(server.env)
-        command = self._get_server_command(server_name)
+        call_params = {"name": params.get("name"), "arguments": params.get("arguments", params)}
+        server = self.mcp_servers.get_server(server_name)
+        use_cache = read_only and self.cache is not None and method == "tools/call" and server is not None
+        if use_cache:
+            identity = server_identity(server)
+            cached = self.cache.get(server_name, call_params["name"], call_params["arguments"], identity)
+            if cached is not None:
+                response, age = cached
+                logger.debug(f"Cache hit for {server_name}/{call_params['name']} ({age:.1f}s old)")
+                return [mark_cache_status(response, "hit", age)], ""
+
+        initialize_response, response, stderr = self._send(server_name, method, call_params, timeout)
+        if use_cache:
+            result = response.get("result")
+            if isinstance(result, dict) and not result.get("isError"):
+                self.cache.put(server_name, call_params["name"], call_params["arguments"], response, identity)
+            mark_cache_status(response, "miss")
+        return [payload for payload in (initialize_response, response) if payload is not None], stderr
+
+    def communicate(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        read_only: bool = False,
+    ) -> tuple[str, str]:
+        """Send a single JSON-RPC request and return the responses as JSON lines.
 
-        # Prepare initialize and call requests as in testing.py
-        init_request = InitializeRequest(id=1)
-        call_request = CallToolRequest(method=method, params={"name": params.get("name"), "arguments": params.get("arguments", params)}, id=2)
-        input_data = json.dumps(init_request.model_dump()) + "\n" + json.dumps(call_request.model_dump()) + "\n"
+        Same as ``call``, but the output mirrors a one-shot exchange: stdout
+        holds the initialize response followed by the response to this
+        request, one JSON document per line. Prefer ``call``, which does not
+        re-serialize the responses.
 
-        try:
-            process = subprocess.Popen(
-                command,
-                stdin=PIPE,
-                stdout=PIPE,
-                stderr=PIPE,
-                env=os.environ.copy(),
-                text=True,
-            )
-            logger.debug(f"Sending input to server: {input_data.strip()}")
-            stdout, stderr = process.communicate(input=input_data)
-            logger.debug(f"Received stdout: {stdout[:100]}")
-            logger.debug(f"Received stderr: {stderr[:100]}")
-            # print(f"stdout: {stdout}")
-            # print(f"stderr: {stderr}")
-            return stdout, stderr
-        except Exception as error:
-            logger.error(f"Error during communicate with server '{server_name}': {error}", exc_info=True)
-            raise McpError(f"Subprocess communication failed for '{server_name}': {error}")
+        Args:
+            server_name: The name of the configured MCP server to communicate with.
+            method: The JSON-RPC method name to call.
+            params: The parameters for the JSON-RPC method.
+            timeout: Seconds to wait for the response. Defaults to the server's
+                ``timeout`` from mcp_config.json, else DEFAULT_CALL_TIMEOUT; 0 waits forever.
+            read_only: The tool is annotated read-only, so its result may be cached.
 
+        Returns:
+            A tuple containing the stdout lines and the stderr the server
+            produced since the previous call.
 
-    def send_request(self, server_name: str, method: str, params: dict[str, Any] | list[Any]) -> Any:
+        Raises:
+            McpError: If the server name is not found in the configuration or
+                the exchange fails.
+            McpTimeoutError: If the server does not answer in time.
+        """
+        responses, stderr = self.call(server_name, method, params, timeout=timeout, read_only=read_only)
+        stdout = "".join(json.dumps(payload) + "\n" for payload in responses)
+        return stdout, stderr
+
+    def send_request(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+    ) -> Any:
         """Send a JSON-RPC request to the specified MCP server and wait for the response.
 
-        Ensures connection is active, sends the request, reads the response line,
-        parses it, checks for errors, and returns the result.
+        Uses the MCP daemon when it is running. Otherwise reuses the server's
+        persistent session (starting or respawning it as needed), sends the request, reads the matching response, checks for
+        errors, and returns the result.
 
         Args:
             server_name: Name of the target server.
             method: The RPC method name.
             params: Parameters for the RPC method (dict or list).
+            timeout: Seconds to wait for the response. Defaults to the server's
+                ``timeout`` from mcp_config.json, else DEFAULT_CALL_TIMEOUT; 0 waits forever.
 
         Returns:
             The 'result' field from the JSON-RPC response.
 
         Raises:
-            McpError: If the server isn't connected, communication fails,
+            McpError: If the server can't be started, communication fails,
                       response is invalid, or the server returns a JSON-RPC error.
+            McpTimeoutError: If the server does not answer in time.
         """
-        if server_name not in self.transports or self.transports[server_name].process.poll() is not None:
-             logger.warning(f"Server '{server_name}' not connected or process dead. Attempting to reconnect.")
-             if not self.connect(server_name):
-                  raise McpError(f"Failed to connect/reconnect to MCP server '{server_name}'.")
-
-        transport = self.transports[server_name]
-        process = transport.process
-
-        # Generate request ID
-        self._request_id_counter += 1
-        request_id = self._request_id_counter
-
-        # Format JSON-RPC request
-        request_payload = RPCRequest(
-            method=method,
-            params=params,
-            id=request_id
-        )
-
-        try:
-            # Serialize and send request to server's stdin
-            request_str = request_payload.model_dump_json() + '\\n' # Must end with newline
-            logger.debug(f"Sending to {server_name} stdin: {request_str.strip()}")
-            transport.stdin.write(request_str)
-            transport.stdin.flush() # Ensure data is sent
-
-            # Read response from server's stdout
-            # This assumes the server sends one complete JSON response per line
-            logger.debug(f"Waiting for response from {server_name} stdout...")
-            response_line = transport.stdout.readline()
-            if not response_line:
-                 # Check if process died unexpectedly
-                 if process.poll() is not None:
-                     stderr_output = ""
-                     try: stderr_output = transport.stderr.read() # Read remaining stderr
-                     except Exception: pass
-                     raise McpError(f"MCP server '{server_name}' terminated unexpectedly while waiting for response. Exit code: {process.returncode}. Stderr: {stderr_output.strip()}")
-                 else:
-                      # This case might happen if the server just doesn't respond
-                      # or if readline timed out (though it usually blocks)
-                     raise McpError(f"No response received from MCP server '{server_name}'.")
-
-            response_str = response_line.strip()
-            logger.debug(f"Received from {server_name} stdout: {response_str}")
-
-            # Parse JSON response
-            try:
-                response_payload = json.loads(response_str)
-            except json.JSONDecodeError as error:
-                raise McpError(f"Failed to decode JSON response from '{server_name}': {error}. Response: '{response_str}'")
-
-
-            # Validate response ID
-            if response_payload.get("id") != request_id:
-                # Allow null ID for notifications, though we shouldn't expect them here
-                if response_payload.get("id") is not None:
-                    raise McpError(f"Received response with mismatched ID. Expected {request_id}, got {response_payload.get('id')}")
-
-            # Check for JSON-RPC error
-            if "error" in response_payload:
-                error_data = response_payload["error"]
-                code = error_data.get('code', 'N/A')
-                message = error_data.get('message', 'No message')
-                raise McpError(f"MCP server '{server_name}' returned error: Code {code}, Message: {message}")
-
-            # Return the result
-            if "result" in response_payload:
-                result = response_payload["result"]
-                # Ensure we're returning a valid result that can be properly processed
-                # This helps prevent issues with isinstance() checks in the bundled erasmus.py
-                if isinstance(result, dict) and "content" in result:
-                    # Ensure content is always a list if present
-                    if not isinstance(result["content"], list):
-                        result["content"] = [result["content"]] if result["content"] is not None else []
-                return result
-            elif "error" in response_payload:
-                # Error already raised above, but covering the case where 'result' is missing in an error response
-                # This shouldn't happen with valid JSON-RPC error objects
-                pass # Error handled
-            else:
-                # Neither result nor error is present, or it's potentially a notification
-                if response_payload.get("id") is None and "method" in response_payload:
-                    logger.warning(f"Received unexpected notification from '{server_name}': {response_payload}")
-                    # Decide how to handle notifications if needed, maybe return None or loop to read again?
-                    # For now, treat as invalid response in a request-response flow.
-                    raise McpError(f"Received unexpected notification instead of response from '{server_name}'.")                
-                else:
-                    raise McpError(f"Invalid JSON-RPC response from '{server_name}': Missing 'result' or 'error' field. Response: {response_payload}")
-
-
-
-        except BrokenPipeError:
-             stderr_output = ""
-             try: stderr_output = transport.stderr.read()
-             except Exception: pass
-             raise McpError(f"Broken pipe while communicating with '{server_name}'. Process likely terminated. Exit code: {process.poll()}. Stderr: {stderr_output.strip()}")
-        except Exception as error:
-            # Catch-all for other potential IOErrors or unexpected issues
-            exit_code = process.poll()
-            stderr_output = ""
-            if exit_code is not None: # Check if it died
-                 try: stderr_output = transport.stderr.read()
-                 except Exception: pass
-            logger.error(f"Unhandled exception during communication with '{server_name}': {error}", exc_info=True)
-            raise McpError(f"Failed communication with MCP server '{server_name}': {error}. Process exit code: {exit_code}. Stderr: {stderr_output.strip()}")
+        _, response_payload, _ = self._send(server_name, method, params, timeout)
+        return self._result_from_response(server_name, response_payload)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Precomputed CLI command specs for MCP server tools.
+
+Registry refresh turns every tool's JSON input schema into a compact spec
+describing the CLI options it needs (name, CLI type, default, help). The specs
+are written per server to ``.erasmus/mcp/commands/<server>.json`` so the CLI
+only has to read the spec of the server being invoked and materialize the one
+tool command that was called, instead of synthesizing signatures for every
+tool of every server on import.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+# Bump when the spec layout changes so stale files are regenerated
+COMMAND_SPEC_VERSION = 2
+
+# JSON schema type -> CLI option type. Objects and arrays are passed as JSON strings.
+SCHEMA_TYPE_TO_CLI_TYPE = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+    "object": "json",
+    "array": "json",
+}
+
+
+def build_tool_spec(tool_name: str, tool_schema: dict[str, Any]) -> dict[str, Any] | None:
+    """Build the CLI spec for one tool.
+
+    Args:
+        tool_name: Name of the tool.
+        tool_schema: The tool definition returned by tools/list.
+
+    Returns:
+        The tool spec, or None if the tool has no usable input schema.
+    """
+    if not isinstance(tool_schema, dict) or "inputSchema" not in tool_schema:
+        logger.warning(f"Skipping tool {tool_name} due to missing or invalid schema.")
+        return None
+
+    input_schema = tool_schema.get("inputSchema") or {}
+    required = set(input_schema.get("required", []))
+    params = []
+    for param_name, param_info in input_schema.get("properties", {}).items():
+        schema_type = param_info.get("type", "string")
+        cli_type = SCHEMA_TYPE_TO_CLI_TYPE.get(schema_type, "str") if isinstance(schema_type, str) else "str"
+        is_required = param_name in required
+        param_help = param_info.get("description", f"Parameter '{param_name}' for {tool_name}")
+        if cli_type == "json":
+            param_help += " (Input as JSON string)"
+
+        default = None
+        schema_default = param_info.get("default")
+        if not is_required and schema_default is not None:
+            if cli_type == "json":
+                try:
+                    default = json.dumps(schema_default)
+                except TypeError:
+                    logger.warning(f"Could not JSON serialize default for {param_name} in {tool_name}. No default for CLI.")
+            else:
+                default = schema_default
+
+        params.append({
+            "name": param_name,
+            "schema_type": schema_type,
+            "cli_type": cli_type,
+            "required": is_required,
+            "has_default": schema_default is not None,
+            "default": default,
+            "help": param_help,
+        })
+
+    annotations = tool_schema.get("annotations") or {}
+    title = annotations.get("title")
+    description = tool_schema.get("description", f"Execute {tool_name}.")
+    return {
+        "name": tool_name,
+        "short_help": title or tool_name.replace("_", " ").title(),
+        "help": f"{title}\n{description}" if title else description,
+        "description": description,
+        "params": params,
+        "read_only": bool(annotations.get("readOnlyHint")),
+    }
+
+
+def build_command_spec(server_name: str, tools: dict[str, Any], fingerprint: str | None = None) -> dict[str, Any]:
+    """Build the CLI spec for every tool of a server.
+
+    Args:
+        server_name: Name of the MCP server.
+        tools: Tool definitions keyed by tool name, as stored in registry.json.
+        fingerprint: Fingerprint of the server definition the tools came from.
+
+    Returns:
+        The server command spec.
+    """
+    tool_specs = {}
+    for tool_name, tool_schema in tools.items():
+        tool_spec = build_tool_spec(tool_name, tool_schema)
+        if tool_spec is not None:
+            tool_specs[tool_name] = tool_spec
+    return {
+        "version": COMMAND_SPEC_VERSION,
+        "server": server_name,
+        "fingerprint": fingerprint,
+        "tools": tool_specs,
+    }
+
+
+def get_command_spec_path(spec_dir: Path, server_name: str) -> Path:
+    """Return the path of a server's command spec file."""
+    return spec_dir / f"{server_name}.json"
+
+
+def write_command_spec(spec_dir: Path, spec: dict[str, Any]) -> Path:
+    """Persist a server command spec.
+
+    Args:
+        spec_dir: Directory holding the command specs.
+        spec: Spec returned by build_command_spec.
+
+    Returns:
+        The path written.
+    """
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    spec_path = get_command_spec_path(spec_dir, spec["server"])
+    spec_path.write_text(json.dumps(spec, separators=(",", ":")))
+    return spec_path
+
+
+def load_command_spec(spec_dir: Path, server_name: str, fingerprint: str | None = None) -> dict[str, Any] | None:
+    """Load a server command spec if it exists and is current.
+
+    Args:
+        spec_dir: Directory holding the command specs.
+        server_name: Name of the MCP server.
+        fingerprint: Expected server fingerprint. Ignored when None.
+
+    Returns:
+        The spec, or None if it is missing, unreadable or stale.
+    """
+    spec_path = get_command_spec_path(spec_dir, server_name)
+    try:
+        spec = json.loads(spec_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if spec.get("version") != COMMAND_SPEC_VERSION:
+        return None
+    if fingerprint is not None and spec.get("fingerprint") != fingerprint:
+        return None
+    return spec
@@ -0,0 +1,432 @@
+"""
+Local MCP daemon.
+
+The daemon keeps a warm, initialized process for every server in
+``mcp_config.json`` and serves CLI invocations over a Unix domain socket, so a
+tool call is one socket round trip instead of a process spawn plus the
+initialize handshake. The config file is polled and servers whose definition
+changed are restarted. Servers configured with a ``url`` are already running
+and shared, so the daemon leaves them to the clients.
+
+Wire format: newline-delimited JSON over the socket, one reply per request.
+
+    {"server": "github", "method": "tools/call", "params": {...}, "timeout": 30}
+        -> {"initialize": {...}, "response": {...}, "stderr": "..."}
+        -> {"error": "...", "code": "unknown_server" | "failed" | "bad_request"}
+        -> {"error": "...", "code": "timeout", "timeout": 30, "request_id": 7, ...}
+    {"op": "status"}   -> {"pid": ..., "config": ..., "servers": {...}}
+    {"op": "shutdown"} -> {"ok": true}
+
+Started and stopped with ``erasmus mcp registry start`` / ``stop``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from erasmus.mcp.models import McpError, McpTimeoutError
+from erasmus.mcp.servers import DEFAULT_CONFIG_PATH, get_mcp_servers
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+# Seconds between mcp_config.json mtime checks
+CONFIG_POLL_INTERVAL = 1.0
+# Seconds to wait for a socket connection before treating the daemon as down
+CONNECT_TIMEOUT = 0.5
+# Seconds `start` waits for the daemon to accept connections
+START_TIMEOUT = 15.0
+# Extra seconds the client waits beyond a call's deadline, so the daemon's timeout reply arrives first
+REPLY_MARGIN = 5.0
+# Unix socket paths longer than this do not fit in sockaddr_un on every platform
+MAX_SOCKET_PATH = 100
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def get_daemon_dir(config_path: Path = DEFAULT_CONFIG_PATH) -> Path:
+    """Return the directory holding the daemon's socket, pid and log files (next to mcp_config.json)."""
+    return config_path.parent
+
+
+def get_private_runtime_dir() -> Path:
+    """Return a directory only the current user can write to, for sockets that do not fit in the project.
+
+    Uses ``$XDG_RUNTIME_DIR`` when it is set, otherwise creates ``erasmus-<uid>``
+    with mode 0700 in the temp directory.
+
+    Raises:
+        McpError: If the directory exists but is owned by another user or is
+            accessible to other users.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and Path(runtime_dir).is_dir():
+        directory = Path(runtime_dir)
+    else:
+        directory = Path(tempfile.gettempdir()) / f"erasmus-{os.getuid()}"
+        try:
+            directory.mkdir(mode=0o700)
+        except FileExistsError:
+            pass
+    info = directory.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise McpError(f"Refusing to use {directory} for the MCP daemon socket: it must be a directory owned by you with mode 0700.")
+    return directory
+
+
+def get_daemon_socket_path(config_path: Path = DEFAULT_CONFIG_PATH) -> Path:
+    """Return the daemon socket path for a config file.
+
+    Falls back to a hashed name in the per-user runtime directory when the
+    project path is too long for a Unix socket address.
+    """
+    socket_path = get_daemon_dir(config_path) / "daemon.sock"
+    if len(str(socket_path)) > MAX_SOCKET_PATH:
+        digest = hashlib.sha256(str(socket_path).encode()).hexdigest()[:16]
+        socket_path = get_private_runtime_dir() / f"erasmus-mcp-{digest}.sock"
+    return socket_path
+
+
+def get_daemon_pid_path(config_path: Path = DEFAULT_CONFIG_PATH) -> Path:
+    return get_daemon_dir(config_path) / "daemon.pid"
+
+
+def get_daemon_log_path(config_path: Path = DEFAULT_CONFIG_PATH) -> Path:
+    return get_daemon_dir(config_path) / "daemon.log"
+
+
+class DaemonClient:
+    """Synchronous client for the MCP daemon socket."""
+
+    def __init__(self, socket_path: Path | None = None):
+        self.socket_path = socket_path or get_daemon_socket_path()
+
+    def _send(self, message: dict[str, Any], timeout: float | None = None) -> dict[str, Any] | None:
+        """Send one message and return the reply, or None if the daemon is unreachable.
+
+        Args:
+            message: The request to send.
+            timeout: Seconds to wait for the reply. None waits forever.
+        """
+        if not hasattr(socket, "AF_UNIX") or not self.socket_path.exists():
+            return None
+        owner = self.socket_path.stat().st_uid
+        if owner != os.getuid():
+            # Someone else's process would receive every call, arguments and credentials included
+            logger.warning(f"Ignoring MCP daemon socket {self.socket_path} owned by uid {owner}.")
+            return None
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.settimeout(CONNECT_TIMEOUT)
+            try:
+                connection.connect(str(self.socket_path))
+            except OSError:
+                return None
+            # Tool calls may legitimately take long; wait for the reply unless bounded
+            connection.settimeout(timeout)
+            connection.sendall((json.dumps(message) + "\n").encode())
+            with connection.makefile("rb") as stream:
+                reply_line = stream.readline()
+        except TimeoutError as error:
+            raise McpError(f"The MCP daemon did not answer within {timeout}s.") from error
+        except OSError as error:
+            raise McpError(f"Lost connection to the MCP daemon at {self.socket_path}: {error}") from error
+        finally:
+            connection.close()
+        if not reply_line:
+            raise McpError(f"The MCP daemon at {self.socket_path} closed the connection without replying.")
+        return json.loads(reply_line)
+
+    def status(self) -> dict[str, Any] | None:
+        """Return the daemon status, or None if it is not running."""
+        return self._send({"op": "status"})
+
+    def is_running(self) -> bool:
+        return self.status() is not None
+
+    def shutdown(self) -> bool:
+        """Ask the daemon to exit. Returns False if it was not running."""
+        return self._send({"op": "shutdown"}) is not None
+
+    def request(
+        self,
+        server_name: str,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+    ) -> dict[str, Any] | None:
+        """Forward a JSON-RPC request to a server owned by the daemon.
+
+        Args:
+            server_name: Name of the target server.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds the call may take. The daemon cancels it when the
+                deadline expires. None waits forever.
+
+        Returns:
+            The reply with "initialize", "response", "stderr" and the daemon's
+            per-phase "timings", or None if the daemon is not running or does
+            not manage this server.
+
+        Raises:
+            McpError: If the daemon could not complete the request.
+            McpTimeoutError: If the call did not finish within ``timeout``.
+        """
+        # 0 tells the daemon not to apply the server's default deadline
+        message = {"server": server_name, "method": method, "params": params, "timeout": timeout or 0}
+        reply = self._send(message, timeout=None if timeout is None else timeout + REPLY_MARGIN)
+        if reply is None or reply.get("code") == "unknown_server":
+            return None
+        if reply.get("code") == "timeout":
+            raise McpTimeoutError(server_name, method, reply.get("timeout", timeout), reply.get("request_id"))
+        if "error" in reply:
+            raise McpError(reply["error"])
+        return reply
+
+
+class McpDaemon:
+    """Owns warm server sessions and serves them over a Unix socket."""
+
+    def __init__(self, socket_path: Path, config_path: Path, pid_path: Path | None = None):
+        # Imported here because async_client imports client, which uses DaemonClient
+        from erasmus.mcp.async_client import AsyncStdioClient
+
+        self.socket_path = socket_path
+        self.config_path = config_path
+        self.pid_path = pid_path
+        self.client = AsyncStdioClient(get_mcp_servers(config_path), use_spares=True)
+        self.started_at = time.time()
+        self._shutdown = asyncio.Event()
+
+    def _config_mtime(self) -> int | None:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _managed_server_names(self) -> list[str]:
+        """Return the stdio servers the daemon keeps processes for."""
+        return [name for name, server in self.client.mcp_servers.servers.items() if server.url is None]
+
+    async def _warm(self, server_names: list[str]):
+        """Start and initialize the given servers concurrently, logging failures."""
+        outcomes = await asyncio.gather(
+            *(self.client.connect(server_name) for server_name in server_names),
+            return_exceptions=True,
+        )
+        for server_name, outcome in zip(server_names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to warm MCP server '{server_name}': {outcome}")
+
+    async def reload_config(self):
+        """Re-read mcp_config.json, restarting servers whose definition changed."""
+        try:
+            servers = get_mcp_servers(self.config_path)
+        except Exception as error:
+            logger.error(f"Failed to reload {self.config_path}, keeping the current servers: {error}")
+            return
+        previous = self.client.mcp_servers.servers
+        changed = [
+            server_name for server_name, server in previous.items()
+            if servers.servers.get(server_name) != server
+        ]
+        self.client.mcp_servers = servers
+        for server_name in changed:
+            await self.client.close_spares(server_name)
+            if server_name in self.client.sessions:
+                await self.client.disconnect(server_name)
+        logger.info(f"Reloaded {self.config_path}; restarted {changed or 'no servers'}")
+        await self._warm(self._managed_server_names())
+
+    async def _watch_config(self):
+        last_mtime = self._config_mtime()
+        while True:
+            await asyncio.sleep(CONFIG_POLL_INTERVAL)
+            mtime = self._config_mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                await self.reload_config()
+
+    def status(self) -> dict[str, Any]:
+        servers = {}
+        for server_name in self._managed_server_names():
+            session = self.client.sessions.get(server_name)
+            servers[server_name] = {
+                "running": bool(session and session.is_alive()),
+                "pid": session.process.pid if session else None,
+                "in_flight": session.in_flight if session else 0,
+                "spares": sum(spare.is_alive() for spare in self.client.spares.get(server_name, [])),
+            }
+        return {
+            "pid": os.getpid(),
+            "config": str(self.config_path),
+            "socket": str(self.socket_path),
+            "started_at": self.started_at,
+            "servers": servers,
+        }
+
+    async def _handle_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        op = message.get("op", "call")
+        if op == "status":
+            return self.status()
+        if op == "shutdown":
+            self._shutdown.set()
+            return {"ok": True}
+        if op != "call" or not message.get("method"):
+            return {"error": f"Unsupported daemon request: {message}", "code": "bad_request"}
+
+        server_name = message.get("server")
+        if server_name not in self._managed_server_names():
+            return {"error": f"Server '{server_name}' is not managed by the MCP daemon.", "code": "unknown_server"}
+        timings: dict[str, float] = {}
+        try:
+            response = await self.client.request(server_name, message["method"], message.get("params") or {}, message.get("timeout"), timings)
+        except McpTimeoutError as error:
+            return {"error": str(error), **error.to_dict()}
+        except Exception as error:
+            return {"error": str(error), "code": "failed"}
+        session = self.client.sessions.get(server_name)
+        # The caller records the phases along with its own total
+        timings.pop("total", None)
+        if session is None:
+            return {"initialize": None, "response": response, "stderr": "", "timings": timings}
+        stderr = "".join(session.stderr_tail)
+        session.stderr_tail.clear()
+        return {"initialize": session.initialize_response, "response": response, "stderr": stderr, "timings": timings}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as error:
+                    reply = {"error": f"Invalid JSON: {error}", "code": "bad_request"}
+                else:
+                    reply = await self._handle_message(message)
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Serve until a shutdown request or SIGTERM/SIGINT."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).is_running():
+                raise McpError(f"An MCP daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self._shutdown.set)
+
+        server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path), limit=STREAM_LIMIT)
+        if self.pid_path:
+            self.pid_path.write_text(str(os.getpid()))
+        logger.info(f"MCP daemon listening on {self.socket_path}")
+        watcher = asyncio.create_task(self._watch_config())
+        try:
+            await self._warm(self._managed_server_names())
+            await self._shutdown.wait()
+        finally:
+            watcher.cancel()
+            server.close()
+            await self.client.disconnect_all()
+            self.socket_path.unlink(missing_ok=True)
+            if self.pid_path:
+                self.pid_path.unlink(missing_ok=True)
+            logger.info("MCP daemon stopped")
+
+
+def start_daemon(config_path: Path, timeout: float = START_TIMEOUT) -> dict[str, Any]:
+    """Start the daemon in the background and wait until it accepts connections.
+
+    Args:
+        config_path: The mcp_config.json the daemon should serve.
+        timeout: Seconds to wait for the socket.
+
+    Returns:
+        The daemon status.
+
+    Raises:
+        McpError: If the platform lacks Unix sockets or the daemon fails to start.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise McpError("The MCP daemon requires Unix domain sockets, which this platform does not support.")
+    client = DaemonClient(get_daemon_socket_path(config_path))
+    status = client.status()
+    if status is not None:
+        return status
+
+    log_path = get_daemon_log_path(config_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        sys.executable, "-m", "erasmus.mcp.daemon",
+        "--socket", str(client.socket_path),
+        "--config", str(config_path),
+        "--pid-file", str(get_daemon_pid_path(config_path)),
+    ]
+    with open(log_path, "ab") as log_file:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.status()
+        if status is not None:
+            return status
+        if process.poll() is not None:
+            raise McpError(f"MCP daemon exited with code {process.returncode}. See {log_path}")
+        time.sleep(0.05)
+    raise McpError(f"MCP daemon did not start within {timeout:.0f}s. See {log_path}")
+
+
+def stop_daemon(config_path: Path = DEFAULT_CONFIG_PATH, timeout: float = 5.0) -> bool:
+    """Stop the daemon serving a config file.
+
+    Returns:
+        True if a daemon was stopped, False if none was running.
+    """
+    client = DaemonClient(get_daemon_socket_path(config_path))
+    if client.shutdown():
+        deadline = time.monotonic() + timeout
+        while client.socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return True
+
+    # Not answering: clean up after a daemon that died without removing its files
+    get_daemon_pid_path(config_path).unlink(missing_ok=True)
+    client.socket_path.unlink(missing_ok=True)
+    return False
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Erasmus MCP daemon")
+    parser.add_argument("--socket", type=Path, default=None)
+    parser.add_argument("--config", type=Path, required=True)
+    parser.add_argument("--pid-file", type=Path, default=None)
+    args = parser.parse_args(argv)
+    daemon = McpDaemon(args.socket or get_daemon_socket_path(args.config), args.config, args.pid_file)
+    asyncio.run(daemon.serve())
+
+
+if __name__ == "__main__":
+    main()
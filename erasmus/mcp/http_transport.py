@@ -0,0 +1,432 @@
+"""
+Streamable HTTP transport for MCP servers.
+
+A server configured with a ``url`` instead of a ``command`` is already running,
+often shared by many erasmus processes, so nothing is spawned for it. Every
+JSON-RPC message is POSTed to the server's endpoint, and the server answers
+with either one ``application/json`` response or a ``text/event-stream``. An
+event stream carries notifications and finally the response. Events are handled
+as they arrive, so notifications are not held back behind a slow response.
+
+Connections come from a keep-alive pool shared by all of a client's HTTP
+servers. The pool is thread-safe, so concurrent calls run over parallel
+connections. The server may assign an ``Mcp-Session-Id`` at initialize; it is
+sent with every later request. When the server no longer knows the session
+(HTTP 404), a new one is initialized and the request is retried once.
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from erasmus.mcp.client import INITIALIZE_PARAMS, LOG_PREVIEW_BYTES
+from erasmus.mcp.models import McpError, McpServer, McpTimeoutError
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+# Keep-alive connections per server host; matches the default thread pool size
+POOL_SIZE = 32
+# Seconds to wait for a TCP connection to a server
+CONNECT_TIMEOUT = 10.0
+# Seconds a server gets to acknowledge the end of a session
+CLOSE_TIMEOUT = 2.0
+ACCEPT = "application/json, text/event-stream"
+SESSION_HEADER = "Mcp-Session-Id"
+PROTOCOL_VERSION_HEADER = "MCP-Protocol-Version"
+
+NotificationCallback = Callable[[str, dict[str, Any]], None]
+
+
+class HttpSessionExpired(McpError):
+    """Raised when the server answers 404 for a session it has dropped."""
+
+
+def iter_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Split a byte stream into lines as the chunks arrive, without line terminators.
+
+    Unlike ``Response.iter_lines`` this never yields a spurious empty line
+    when a chunk ends on a newline, which would end an SSE event early.
+    """
+    pending: list[bytes] = []
+    for chunk in chunks:
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:
+            pending.append(chunk)
+            continue
+        pending.append(lines[0])
+        yield b"".join(pending)
+        yield from lines[1:-1]
+        pending = [lines[-1]]
+    if any(pending):
+        yield b"".join(pending)
+
+
+def iter_sse_data(chunks: Iterator[bytes]) -> Iterator[str]:
+    """Yield the data of each event of a server-sent event stream as soon as the event completes.
+
+    Args:
+        chunks: The raw stream, in chunks of any size.
+    """
+    data: list[str] = []
+    for raw_line in iter_lines(chunks):
+        line = raw_line.decode("utf-8").rstrip("\r")
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            # Comment, typically a keep-alive
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+def _drain(response: requests.Response):
+    """Read and discard the rest of a response body so its connection goes back to the pool."""
+    for _ in response.iter_content(chunk_size=None):
+        pass
+
+
+class HttpServerSession:
+    """An MCP session with one streamable HTTP server."""
+
+    def __init__(self, server: McpServer, http: requests.Session):
+        """Prepare the session; nothing is sent until initialize.
+
+        Args:
+            server: The server definition. Its header values may reference the
+                server's env variables or the process environment as ``${NAME}``.
+            http: The pooled HTTP session to send requests over.
+        """
+        self.server = server
+        self.name = server.name
+        self.url = server.url
+        self.http = http
+        self.headers = server.resolved_headers()
+        self.session_id: str | None = None
+        self.protocol_version: str | None = None
+        self.initialize_response: dict[str, Any] | None = None
+        self._request_ids = itertools.count(1)
+
+    def _request_headers(self) -> dict[str, str]:
+        headers = {"Accept": ACCEPT, "Content-Type": "application/json", **self.headers}
+        if self.session_id:
+            headers[SESSION_HEADER] = self.session_id
+        if self.protocol_version:
+            headers[PROTOCOL_VERSION_HEADER] = self.protocol_version
+        return headers
+
+    def initialize(self, timeout: float | None = None):
+        """Run the initialize handshake, keeping the session id the server assigns.
+
+        Raises:
+            McpError: If the server rejects the handshake or cannot be reached.
+            McpTimeoutError: If the server does not answer in time.
+        """
+        response = self.request("initialize", INITIALIZE_PARAMS, timeout=timeout)
+        if "error" in response:
+            raise McpError(f"MCP server '{self.name}' rejected initialize: {response['error']}")
+        self.initialize_response = response
+        self.protocol_version = (response.get("result") or {}).get("protocolVersion")
+        self.notify("notifications/initialized", timeout=timeout)
+
+    def request(
+        self,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+        on_notification: NotificationCallback | None = None,
+    ) -> dict[str, Any]:
+        """Send a request and return the response with the same id.
+
+        Args:
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds to wait for the response. None waits forever.
+            timings: Receives the first_byte, response and decode durations.
+            on_notification: Called with the server name and each notification
+                streamed before the response.
+
+        Returns:
+            The raw JSON-RPC response payload.
+
+        Raises:
+            HttpSessionExpired: If the server no longer knows the session.
+            McpError: If the server cannot be reached or answers with an HTTP error.
+            McpTimeoutError: If the timeout expires. The request is cancelled.
+        """
+        request_id = next(self._request_ids)
+        message = {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+        try:
+            return self._post(message, timeout, timings, on_notification)
+        except McpTimeoutError:
+            # The initialize request must not be cancelled; the session is dropped instead
+            if method != "initialize":
+                self._cancel(request_id, f"No response within {timeout:g}s")
+            raise
+
+    def notify(self, method: str, params: dict[str, Any] | None = None, timeout: float | None = None):
+        """Send a notification (a message without an id)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._post(message, timeout)
+
+    def _cancel(self, request_id: int, reason: str):
+        try:
+            self.notify("notifications/cancelled", {"requestId": request_id, "reason": reason}, timeout=CLOSE_TIMEOUT)
+        except McpError as error:
+            logger.debug(f"Failed to cancel request {request_id} on '{self.name}': {error}")
+
+    def _post(
+        self,
+        message: dict[str, Any],
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+        on_notification: NotificationCallback | None = None,
+    ) -> dict[str, Any] | None:
+        """POST one message and read the answer to it.
+
+        Returns:
+            The JSON-RPC response for requests, None for notifications and replies.
+        """
+        method = message.get("method", "reply")
+        started = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        data = json.dumps(message).encode()
+        logger.debug(f"Sending to {self.name} ({self.url}): {data[:LOG_PREVIEW_BYTES]!r}")
+        try:
+            response = self.http.post(
+                self.url,
+                data=data,
+                headers=self._request_headers(),
+                stream=True,
+                timeout=(CONNECT_TIMEOUT, timeout),
+            )
+        except requests.ReadTimeout:
+            raise McpTimeoutError(self.name, method, timeout, message.get("id")) from None
+        except requests.RequestException as error:
+            raise McpError(f"Failed to reach MCP server '{self.name}' at {self.url}: {error}") from error
+
+        # Closing a response whose body was not read drops its connection, so
+        # every body except an event stream's is read in full (see _drain) to keep it pooled
+        with response:
+            headers_at = time.perf_counter()
+            if response.status_code == 404 and self.session_id:
+                _drain(response)
+                raise HttpSessionExpired(f"MCP server '{self.name}' no longer knows session {self.session_id}.")
+            if response.status_code >= 400:
+                raise McpError(f"MCP server '{self.name}' answered HTTP {response.status_code}: {response.text[:LOG_PREVIEW_BYTES]}")
+            if method == "initialize" and response.headers.get(SESSION_HEADER):
+                self.session_id = response.headers[SESSION_HEADER]
+            if "id" not in message or "method" not in message:
+                _drain(response)
+                return None
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            try:
+                if content_type == "text/event-stream":
+                    for event in iter_sse_data(response.iter_content(chunk_size=None)):
+                        received_at = time.perf_counter()
+                        try:
+                            payload = json.loads(event)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Ignoring non-JSON event from '{self.name}': {event[:LOG_PREVIEW_BYTES]!r}")
+                            continue
+                        if "method" not in payload and payload.get("id") == message["id"]:
+                            self._record(timings, started, headers_at, received_at)
+                            return payload
+                        self._handle_server_message(payload, on_notification)
+                        if deadline is not None and time.monotonic() > deadline:
+                            raise McpTimeoutError(self.name, method, timeout, message["id"])
+                    raise McpError(f"MCP server '{self.name}' closed the event stream without answering {method}.")
+
+                body = response.content
+                received_at = time.perf_counter()
+                logger.debug(f"Received from {self.name}: {body[:LOG_PREVIEW_BYTES]!r}")
+                try:
+                    payload = json.loads(body)
+                except json.JSONDecodeError as error:
+                    raise McpError(f"Invalid JSON from MCP server '{self.name}': {body[:LOG_PREVIEW_BYTES]!r}") from error
+                self._record(timings, started, headers_at, received_at)
+                return payload
+            except requests.RequestException as error:
+                # A read timeout while streaming surfaces as a ConnectionError
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise McpTimeoutError(self.name, method, timeout, message["id"]) from None
+                raise McpError(f"Lost connection to MCP server '{self.name}' while waiting for {method}: {error}") from error
+
+    @staticmethod
+    def _record(timings: dict[str, float] | None, started: float, headers_at: float, received_at: float):
+        if timings is not None:
+            timings["first_byte"] = headers_at - started
+            timings["response"] = received_at - started
+            timings["decode"] = time.perf_counter() - received_at
+
+    def _handle_server_message(self, message: dict[str, Any], on_notification: NotificationCallback | None):
+        """Answer a server-to-client request, or pass a notification on."""
+        if "method" not in message:
+            logger.debug(f"Ignoring response with unknown ID from '{self.name}': {message.get('id')}")
+            return
+        if "id" in message:
+            # Answer pings, reject everything else
+            if message["method"] == "ping":
+                reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+            else:
+                reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": f"Method not found: {message['method']}"}}
+            try:
+                self._post(reply, CLOSE_TIMEOUT)
+            except McpError as error:
+                logger.debug(f"Failed to answer {message['method']} from '{self.name}': {error}")
+            return
+        if on_notification is not None:
+            on_notification(self.name, message)
+        else:
+            logger.debug(f"Notification from '{self.name}': {message['method']}")
+
+    def close(self):
+        """End the session on the server (best effort)."""
+        if not self.session_id:
+            return
+        try:
+            self.http.delete(self.url, headers=self._request_headers(), timeout=(CONNECT_TIMEOUT, CLOSE_TIMEOUT)).close()
+        except requests.RequestException as error:
+            logger.debug(f"Failed to end the session with '{self.name}': {error}")
+        self.session_id = None
+
+
+class HttpClient:
+    """Pooled keep-alive connections and initialized sessions for streamable HTTP servers.
+
+    Safe to use from several threads at once: each server is initialized once,
+    and concurrent requests are sent over separate pooled connections.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.sessions: dict[str, HttpServerSession] = {}
+        self._lock = threading.Lock() # Guards self.sessions and self._connect_locks
+        self._connect_locks: dict[str, threading.Lock] = {}
+
+    def connect(
+        self,
+        server: McpServer,
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> HttpServerSession:
+        """Return the initialized session for a server, initializing one if needed.
+
+        A session created for a different definition of the server is replaced.
+
+        Args:
+            server: The server definition.
+            timeout: Seconds the initialize handshake may take. None waits forever.
+            timings: Receives the initialize duration when a session is created.
+
+        Raises:
+            McpError: If the server rejects the handshake or cannot be reached.
+            McpTimeoutError: If the handshake does not finish in time.
+        """
+        with self._lock:
+            connect_lock = self._connect_locks.setdefault(server.name, threading.Lock())
+        with connect_lock:
+            session = self.sessions.get(server.name)
+            if session is not None and session.server == server:
+                return session
+            if session is not None:
+                self.disconnect(server.name)
+            logger.info(f"Connecting to MCP server '{server.name}' at {server.url}...")
+            started = time.perf_counter()
+            session = HttpServerSession(server, self.http)
+            session.initialize(timeout)
+            if timings is not None:
+                timings["initialize"] = time.perf_counter() - started
+            with self._lock:
+                self.sessions[server.name] = session
+            logger.info(f"Successfully connected to MCP server '{server.name}'.")
+            return session
+
+    def request(
+        self,
+        server: McpServer,
+        method: str,
+        params: dict[str, Any] | list[Any],
+        timeout: float | None = None,
+        timings: dict[str, float] | None = None,
+        on_notification: NotificationCallback | None = None,
+    ) -> tuple[HttpServerSession, dict[str, Any]]:
+        """Send a request to a server, initializing a session first if needed.
+
+        A request the server rejects because it dropped the session is retried
+        once on a new session.
+
+        Args:
+            server: The server definition.
+            method: The RPC method name.
+            params: Parameters for the RPC method.
+            timeout: Seconds the call may take, including the handshake. None waits forever.
+            timings: Receives the duration of each phase of the call (see erasmus.mcp.metrics).
+            on_notification: Called with each notification streamed before the response.
+
+        Returns:
+            The session used and the raw JSON-RPC response payload.
+
+        Raises:
+            McpError: If the server cannot be reached or the exchange fails.
+            McpTimeoutError: If the deadline expires. The request is cancelled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def _remaining() -> float | None:
+            if deadline is None:
+                return None
+            remaining = deadline - time.monotonic()
+            # requests rejects a zero timeout, so a spent deadline must not reach it
+            if remaining <= 0:
+                raise McpTimeoutError(server.name, method, timeout)
+            return remaining
+
+        try:
+            for attempt in range(2):
+                session = self.connect(server, timeout=_remaining(), timings=timings)
+                try:
+                    return session, session.request(method, params, _remaining(), timings, on_notification)
+                except HttpSessionExpired:
+                    with self._lock:
+                        if self.sessions.get(server.name) is session:
+                            del self.sessions[server.name]
+                    if attempt:
+                        raise
+                    logger.info(f"MCP server '{server.name}' dropped its session, initializing a new one.")
+        except McpTimeoutError as error:
+            # Report the call's whole deadline rather than what was left of it
+            raise McpTimeoutError(server.name, method, timeout, error.request_id) from None
+
+    def disconnect(self, server_name: str):
+        """End a server's session."""
+        with self._lock:
+            session = self.sessions.pop(server_name, None)
+        if session is not None:
+            logger.info(f"Disconnecting from MCP server '{server_name}'...")
+            session.close()
+
+    def close(self):
+        """End every session and close the pooled connections."""
+        for server_name in list(self.sessions):
+            self.disconnect(server_name)
+        self.http.close()
@@ -0,0 +1,177 @@
+"""
+Per-phase latency metrics for MCP calls.
+
+Each call made by StdioClient or AsyncStdioClient is timed in phases:
+
+    spawn       starting the server process (only when the call started it)
+    initialize  the initialize handshake (only when the call started the server)
+    write       serializing and writing the request
+    first_byte  from the end of the write until the first byte of the response
+    response    from the end of the write until the whole response frame arrived
+    decode      JSON decoding of the response frame
+    total       the whole call as seen by the caller
+
+Timings are kept as log-scale histograms in a SQLite database, per server and
+tool, so percentiles can be read back cheaply by ``erasmus mcp stats``.
+"""
+
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+PHASES = ("spawn", "initialize", "write", "first_byte", "response", "decode", "total")
+PERCENTILES = (50, 95, 99)
+# Histogram buckets start at HISTOGRAM_MIN_MS and grow by HISTOGRAM_GROWTH (10% relative error)
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_GROWTH = 1.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS histogram (
+    server TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (server, tool, phase, bucket)
+);
+CREATE TABLE IF NOT EXISTS calls (
+    server TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (server, tool)
+);
+"""
+
+
+def bucket_for(milliseconds: float) -> int:
+    """Return the histogram bucket holding a duration."""
+    if milliseconds <= HISTOGRAM_MIN_MS:
+        return 0
+    return math.ceil(math.log(milliseconds / HISTOGRAM_MIN_MS, HISTOGRAM_GROWTH))
+
+
+def bucket_upper_bound(bucket: int) -> float:
+    """Return the largest duration (in milliseconds) that falls in a bucket."""
+    return HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** bucket
+
+
+def percentile(buckets: list[tuple[int, int]], percent: float) -> float | None:
+    """Estimate a percentile from sorted (bucket, count) pairs.
+
+    Returns:
+        The upper bound of the bucket holding the percentile, in milliseconds,
+        or None for an empty histogram.
+    """
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+    rank = percent / 100 * total
+    seen = 0
+    for bucket, count in buckets:
+        seen += count
+        if seen >= rank:
+            return bucket_upper_bound(bucket)
+    return bucket_upper_bound(buckets[-1][0])
+
+
+class LatencyStore:
+    """On-disk latency histograms per server, tool and phase."""
+
+    def __init__(self, db_path: Path):
+        """Prepare the store; the database is created on first use.
+
+        Args:
+            db_path: Location of the SQLite database.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record(self, server_name: str, tool_name: str, timings: dict[str, float], ok: bool = True):
+        """Add one call's phase timings.
+
+        Args:
+            server_name: Name of the server.
+            tool_name: Tool name, or the RPC method for calls that are not tools/call.
+            timings: Seconds spent per phase. Unknown phases are ignored.
+            ok: Whether the call succeeded.
+        """
+        rows = [
+            (server_name, tool_name, phase, bucket_for(seconds * 1000))
+            for phase, seconds in timings.items()
+            if phase in PHASES
+        ]
+        try:
+            with self._lock, self._connect() as connection:
+                connection.executemany(
+                    "INSERT INTO histogram (server, tool, phase, bucket, count) VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (server, tool, phase, bucket) DO UPDATE SET count = count + 1",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT INTO calls (server, tool, calls, errors) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (server, tool) DO UPDATE SET calls = calls + 1, errors = errors + excluded.errors",
+                    (server_name, tool_name, 0 if ok else 1),
+                )
+        except sqlite3.Error as error:
+            logger.debug(f"Failed to record MCP latency ({self.db_path}): {error}")
+
+    def summary(self, server_name: str | None = None) -> list[dict[str, Any]]:
+        """Return call counts and per-phase percentiles.
+
+        Args:
+            server_name: Only report this server. All servers when None.
+
+        Returns:
+            One entry per server and tool: ``{"server", "tool", "calls", "errors",
+            "phases": {phase: {"count", "p50", "p95", "p99"}}}`` with percentiles
+            in milliseconds.
+        """
+        where, params = ("WHERE server = ?", (server_name,)) if server_name else ("", ())
+        with self._lock, self._connect() as connection:
+            calls = connection.execute(
+                f"SELECT server, tool, calls, errors FROM calls {where} ORDER BY server, tool", params
+            ).fetchall()
+            histogram = connection.execute(
+                f"SELECT server, tool, phase, bucket, count FROM histogram {where} ORDER BY bucket", params
+            ).fetchall()
+
+        buckets: dict[tuple[str, str, str], list[tuple[int, int]]] = {}
+        for server, tool, phase, bucket, count in histogram:
+            buckets.setdefault((server, tool, phase), []).append((bucket, count))
+        summary = []
+        for server, tool, call_count, errors in calls:
+            phases = {}
+            for phase in PHASES:
+                phase_buckets = buckets.get((server, tool, phase))
+                if not phase_buckets:
+                    continue
+                phases[phase] = {"count": sum(count for _, count in phase_buckets)}
+                for percent in PERCENTILES:
+                    phases[phase][f"p{percent}"] = percentile(phase_buckets, percent)
+            summary.append({"server": server, "tool": tool, "calls": call_count, "errors": errors, "phases": phases})
+        return summary
+
+    def clear(self, server_name: str | None = None):
+        """Drop recorded timings (for one server, or all)."""
+        with self._lock, self._connect() as connection:
+            for table in ("histogram", "calls"):
+                if server_name is None:
+                    connection.execute(f"DELETE FROM {table}")
+                else:
+                    connection.execute(f"DELETE FROM {table} WHERE server = ?", (server_name,))
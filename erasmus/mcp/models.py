@@ -1,13 +1,42 @@
 from pydantic import BaseModel, Field, ConfigDict
-from io import TextIOWrapper
+from collections import deque
+from io import BufferedIOBase
 from typing import Any, Optional
+import os
+import string
 import subprocess
+import threading
+from concurrent.futures import Future
+
+# Number of stderr lines kept per server session
+STDERR_TAIL_LINES = 200
+# Longer stderr lines are split, so the tail stays bounded in bytes as well
+STDERR_LINE_LIMIT = 4096
 
 
 class McpError(Exception):
     """Base exception for MCP-related errors."""
     pass
 
+class McpTimeoutError(McpError):
+    """Raised when an MCP call does not complete within its deadline."""
+
+    def __init__(self, server_name: str, method: str, timeout: float, request_id: int | None = None):
+        self.server_name = server_name
+        self.method = method
+        self.timeout = timeout
+        self.request_id = request_id
+        super().__init__(f"MCP server '{server_name}' did not answer {method} within {timeout:g}s.")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "code": "timeout",
+            "server": self.server_name,
+            "method": self.method,
+            "timeout": self.timeout,
+            "request_id": self.request_id,
+        }
+
 class RPCRequest(BaseModel):
     jsonrpc: str = "2.0"
     method: str
@@ -36,20 +65,49 @@ class RPCResponse(BaseModel):
 
 class McpServer(BaseModel):
     name: str
-    command: str
-    args: list[str]
+    # Process to spawn for stdio servers
+    command: str = ""
+    args: list[str] = Field(default_factory=list)
     env: dict[str, str]
+    # Endpoint of an already running streamable HTTP server (instead of a command)
+    url: str | None = None
+    # Extra HTTP headers sent to a url server, e.g. {"Authorization": "Bearer ${TOKEN}"}
+    headers: dict[str, str] = Field(default_factory=dict)
+    # Default deadline in seconds for calls to this server (0 disables it)
+    timeout: float | None = None
+    # Pre-initialized processes the daemon keeps ready to replace the session
+    spares: int = 0
+
+    def resolved_headers(self) -> dict[str, str]:
+        """Return the headers with ``${NAME}`` taken from the server's env or the process environment."""
+        variables = {**os.environ, **self.env}
+        return {key: string.Template(value).safe_substitute(variables) for key, value in self.headers.items()}
 
 class ServerTransport(BaseModel):
     name: str
     process: subprocess.Popen
     connected: bool
-    stdin: TextIOWrapper = Field(..., default_factory=TextIOWrapper)
-    stdout: TextIOWrapper = Field(..., default_factory=TextIOWrapper)
-    stderr: TextIOWrapper = Field(..., default_factory=TextIOWrapper)
+    # Binary pipes: frames are decoded straight from bytes
+    stdin: BufferedIOBase
+    stdout: BufferedIOBase
+    stderr: BufferedIOBase
+    # Guards stdin writes, request ids, the pending map and the stderr tail
+    lock: Any = Field(default_factory=threading.RLock)
+    request_id: int = 0
+    # Futures of requests awaiting a response, keyed by JSON-RPC id
+    pending: dict[int, Future] = Field(default_factory=dict)
+    initialize_response: dict[str, Any] | None = None
+    stderr_tail: deque = Field(default_factory=lambda: deque(maxlen=STDERR_TAIL_LINES))
     model_config = ConfigDict(arbitrary_types_allowed=True)
     __pydantic_fields_set__ = True
 
+    def is_alive(self) -> bool:
+        return self.connected and self.process.poll() is None
+
+    def next_request_id(self) -> int:
+        self.request_id += 1
+        return self.request_id
+
 class RegistryTool(BaseModel):
     name: str
     description: str
@@ -5,28 +5,38 @@ The registry stores configuration details for different MCP servers,
 allowing dynamic interaction via the CLI.
 """
 
+import hashlib
 import json
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Union, Optional # Keep Any if used, or remove if not needed
-import typing # Added for get_origin, get_args
-from pydantic import BaseModel, ConfigDict, create_model, Field # Restored Pydantic imports
-import subprocess 
+from typing import Any
+from pydantic import BaseModel, ConfigDict
+import subprocess
 
 from erasmus.utils.rich_console import get_console_logger
-from erasmus.mcp.servers import McpServers
+from erasmus.mcp.servers import McpServers, get_mcp_servers
 from erasmus.mcp.client import StdioClient
-from erasmus.mcp.models import RegistryTool
+from erasmus.mcp.metrics import LatencyStore
+from erasmus.mcp.command_specs import build_command_spec, load_command_spec, write_command_spec
+from erasmus.mcp.models import McpError, McpServer
+from erasmus.mcp.tool_models import load_tool_models, render_tool_models_module, write_tool_models
 from erasmus.utils.paths import get_path_manager
-from erasmus.utils.type_conversions import js_type_string_to_py_type, UnionType
-
-NoneType = type(None)
-
 
 logger = get_console_logger()
 
 path_manager = get_path_manager()
 
+# Seconds each server gets to start and answer tools/list during a refresh
+DISCOVERY_TIMEOUT = 15.0
+# Upper bound on servers discovered concurrently
+MAX_DISCOVERY_WORKERS = 8
+# Seconds before a server whose discovery failed is retried automatically
+STALE_RETRY_INTERVAL = 300.0
+
 class McpRegistry(BaseModel):
     servers: McpServers
     client: StdioClient
@@ -34,22 +44,37 @@ class McpRegistry(BaseModel):
     registry_path: Path
     binary_path: Path
     check_binary_script: Path
+    command_spec_dir: Path
+    tool_model_dir: Path
     model_config = ConfigDict(arbitrary_types_allowed=True)
     __pydantic_fields_set__ = set()
 
     def _json_print(self, data: dict[str, Any]):
         logger.info(json.dumps(data, indent=4))
 
-    def __init__(self, registry_path: Path | None=None):
+    def __init__(self, registry_path: Path | None=None, refresh: bool = False):
+        """Load the cached tool catalog, refreshing only the servers that need it.
+
+        Servers without a cached entry are discovered synchronously. Servers whose
+        fingerprint changed keep serving their cached tools while a background
+        thread refreshes them (stale-while-revalidate).
+
+        Args:
+            registry_path: Location of registry.json. Defaults to .erasmus/mcp/registry.json.
+            refresh: Force a synchronous tools/list against every configured server.
+        """
         logger.info("Initializing MCPRegistry...")
-        self.servers = McpServers()
-        self.client = StdioClient()
+        self.servers = get_mcp_servers()
         self.registry_path = registry_path or path_manager.erasmus_dir / "mcp" / "registry.json"
+        self.client = StdioClient(metrics=LatencyStore(self.registry_path.parent / "metrics.sqlite3"))
         self.binary_path = path_manager.erasmus_dir / "mcp" / "servers" / "github" / "server"
         self.check_binary_script = path_manager.erasmus_dir / "mcp" / "servers" / "github" / "check_binary.sh"
-        self._setup_github_server()
-        self._load_mcp_servers()
-        self.registry = self._load_registry(registry_path)
+        self.command_spec_dir = self.registry_path.parent / "commands"
+        self.tool_model_dir = self.registry_path.parent / "models"
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self.registry = self._load_registry(registry_path) or {"mcp_servers": {}}
+        self._sync_registry(force=refresh)
         logger.info("MCPRegistry initialized.")
 
     def _setup_github_server(self):
@@ -57,88 +82,261 @@ class McpRegistry(BaseModel):
         os.chmod(self.check_binary_script, 0o755)
         subprocess.run([self.check_binary_script], check=True)
 
-    def _load_mcp_servers(self):
-        if not self.servers:
-            self.servers = McpServers()
+    def _server_fingerprint(self, server: McpServer, server_path: Path | None = None) -> str:
+        """Fingerprint a server definition so cached tools can be invalidated.
+
+        Combines the command, its arguments and the size/mtime of the resolved
+        binary (and of the script path for ``uv run`` style servers), or the
+        url of an HTTP server.
+        """
+        def _stat(path: str | Path | None) -> list[int] | None:
+            try:
+                stat = Path(path).stat()
+            except (OSError, TypeError):
+                return None
+            return [stat.st_mtime_ns, stat.st_size]
+
+        if server.url is not None:
+            return hashlib.sha256(json.dumps({"url": server.url}).encode()).hexdigest()
+        binary = shutil.which(server.command) or server.command
+        payload = {
+            "command": server.command,
+            "args": server.args,
+            "binary": _stat(binary),
+            "path": _stat(server_path),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _sync_registry(self, force: bool = False):
+        """Reconcile the cached registry with mcp_config.json."""
+        entries = self.registry.setdefault("mcp_servers", {})
+        changed = False
+        for server_name in list(entries):
+            if server_name not in self.servers.servers:
+                del entries[server_name]
+                changed = True
+
         server_paths = self.servers.get_server_paths()
-        servers = self.servers.servers
-        self.registry = {}
-        self.registry["mcp_servers"] = {}
+        missing, stale = [], []
+        for server_name, server in self.servers.servers.items():
+            entry = entries.get(server_name)
+            if force or not isinstance(entry, dict) or "tools" not in entry:
+                missing.append(server_name)
+            elif entry.get("stale"):
+                # Discovery failed last time; retry in the background once the backoff has passed
+                if time.time() - entry.get("failed_at", 0) >= STALE_RETRY_INTERVAL:
+                    stale.append(server_name)
+            elif entry.get("fingerprint") != self._server_fingerprint(server, server_paths.get(server_name)):
+                stale.append(server_name)
+
+        if missing:
+            self.refresh(missing)
+        elif changed:
+            self._save_registry()
+        if stale:
+            self._refresh_in_background(stale)
+
+    def refresh(self, server_names: list[str] | None = None, timeout: float = DISCOVERY_TIMEOUT) -> dict[str, Any]:
+        """Run tools/list against the given servers (all when omitted) and persist the result.
+
+        Servers are discovered concurrently, each bounded by ``timeout``. A server
+        that fails or times out keeps its previously cached tools (if any) and is
+        marked stale instead of failing the whole refresh.
+
+        Args:
+            server_names: Servers to refresh. Passing None also re-reads mcp_config.json.
+            timeout: Seconds each server gets to start and answer tools/list.
+
+        Returns:
+            The updated registry.
+        """
+        if server_names is None:
+            self.servers = get_mcp_servers()
+            server_names = self.servers.get_server_names()
+        if "github" in server_names and self.binary_path.exists():
+            self._setup_github_server()
+        server_paths = self.servers.get_server_paths()
+        servers = {}
+        for server_name in server_names:
+            server = self.servers.get_server(server_name)
+            if server is None:
+                logger.warning(f"Server '{server_name}' not found in configuration, skipping refresh.")
+                continue
+            servers[server_name] = server
+
+        tools_by_server, failures = self._discover_tools(list(servers), timeout)
         for server_name, server in servers.items():
-            self.registry["mcp_servers"][server_name] = {}
-            self.registry["mcp_servers"][server_name]["server"] = server.model_dump()
-            self.registry["mcp_servers"][server_name]["path"] = str(server_paths[server_name]) # Convert Path to str
-            self.registry["mcp_servers"][server_name]["tools"] = {} # Initialize tools dict for the server
-            self._load_available_tools(server_name)
+            server_path = server_paths.get(server_name)
+            entry = {
+                "server": server.model_dump(),
+                "path": str(server_path) if server_path else None,
+                "fingerprint": self._server_fingerprint(server, server_path),
+                "refreshed_at": time.time(),
+                "tools": tools_by_server.get(server_name),
+            }
+            if server_name in failures:
+                previous = self.registry.get("mcp_servers", {}).get(server_name) or {}
+                entry.update({
+                    "refreshed_at": previous.get("refreshed_at"),
+                    "tools": previous.get("tools", {}),
+                    "stale": True,
+                    "error": failures[server_name],
+                    "failed_at": time.time(),
+                })
+            with self._lock:
+                self.registry.setdefault("mcp_servers", {})[server_name] = entry
+            self._write_command_spec(server_name, entry)
+            self._write_tool_models(server_name, entry)
         self._save_registry()
+        return self.registry
+
+    def _discover_tools(self, server_names: list[str], timeout: float) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+        """Run tools/list against several servers in a thread pool.
 
+        Args:
+            server_names: Servers to discover.
+            timeout: Seconds each server gets before it is stopped.
+
+        Returns:
+            Tools keyed by server for the servers that answered, and an error
+            message keyed by server for the ones that failed or timed out.
+        """
+        tools_by_server, failures = {}, {}
+        if not server_names:
+            return tools_by_server, failures
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(MAX_DISCOVERY_WORKERS, len(server_names)),
+            thread_name_prefix="mcp-discovery",
+        )
+        futures = {
+            executor.submit(self._load_available_tools, server_name, timeout): server_name
+            for server_name in server_names
+        }
+        # Each call enforces its own timeout; the extra second covers queueing
+        # when there are more servers than workers.
+        rounds = -(-len(server_names) // MAX_DISCOVERY_WORKERS)
+        done, pending = wait(futures, timeout=timeout * rounds + 1)
+        for future in done:
+            server_name = futures[future]
+            try:
+                tools_by_server[server_name] = future.result()
+            except Exception as error:
+                failures[server_name] = str(error)
+        for future in pending:
+            failures[futures[future]] = f"Discovery did not finish within {timeout}s"
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for server_name, error in failures.items():
+            logger.warning(f"Marking MCP server '{server_name}' stale: {error}")
+        return tools_by_server, failures
+
+    def _write_command_spec(self, server_name: str, entry: dict[str, Any]) -> dict[str, Any]:
+        """Precompute the CLI command spec for a registry entry and persist it."""
+        spec = build_command_spec(server_name, entry.get("tools", {}), entry.get("fingerprint"))
+        try:
+            write_command_spec(self.command_spec_dir, spec)
+        except OSError as error:
+            logger.warning(f"Failed to write command spec for {server_name}: {error}")
+        return spec
 
-    def _load_available_tools(self, server_name: str):
-        stdout, stderr = self.client.communicate(
+    def get_command_spec(self, server_name: str) -> dict[str, Any] | None:
+        """Return the CLI command spec for a server.
+
+        The spec written at refresh time is used when its fingerprint matches the
+        registry entry; otherwise it is rebuilt from the cached tools.
+
+        Args:
+            server_name: Name of the MCP server.
+
+        Returns:
+            The command spec, or None if the server is not in the registry.
+        """
+        entry = self.registry.get("mcp_servers", {}).get(server_name)
+        if not isinstance(entry, dict):
+            return None
+        spec = load_command_spec(self.command_spec_dir, server_name, entry.get("fingerprint"))
+        if spec is None:
+            spec = self._write_command_spec(server_name, entry)
+        return spec
+
+    def _write_tool_models(self, server_name: str, entry: dict[str, Any]) -> bool:
+        """Generate the input model module for a registry entry."""
+        source = render_tool_models_module(server_name, entry.get("tools", {}), entry.get("fingerprint"))
+        try:
+            write_tool_models(self.tool_model_dir, server_name, source)
+        except OSError as error:
+            logger.warning(f"Failed to write tool models for {server_name}: {error}")
+            return False
+        return True
+
+    def get_tool_model(self, server_name: str, tool_name: str) -> type[BaseModel] | None:
+        """Return the generated input model of a tool, importing the server's module on first use.
+
+        The module is regenerated from the cached tools when it is missing or
+        does not match the registry entry.
+
+        Args:
+            server_name: Name of the MCP server.
+            tool_name: Name of the tool.
+
+        Returns:
+            The model class, or None if the tool is unknown or has no input schema.
+        """
+        entry = self.registry.get("mcp_servers", {}).get(server_name)
+        if not isinstance(entry, dict):
+            return None
+        models = load_tool_models(self.tool_model_dir, server_name, entry.get("fingerprint"))
+        if models is None and self._write_tool_models(server_name, entry):
+            models = load_tool_models(self.tool_model_dir, server_name, entry.get("fingerprint"))
+        return (models or {}).get(tool_name)
+
+    def _refresh_in_background(self, server_names: list[str]):
+        """Refresh stale servers without blocking the caller.
+
+        The thread is non-daemonic so the process finishes writing registry.json
+        before it exits.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        def _refresh():
+            try:
+                self.refresh(server_names)
+            except Exception as error:
+                logger.warning(f"Background registry refresh failed for {server_names}: {error}")
+
+        logger.info(f"Refreshing stale MCP servers in the background: {server_names}")
+        self._refresh_thread = threading.Thread(target=_refresh, name="mcp-registry-refresh", daemon=False)
+        self._refresh_thread.start()
+
+    def _load_available_tools(self, server_name: str, timeout: float | None = None) -> dict[str, Any]:
+        """Run tools/list against a server.
+
+        Raises:
+            McpError: If the server fails, times out or returns an error.
+        """
+        responses, _ = self.client.call(
             server_name=server_name,
             method="tools/list",
-            params={}
+            params={},
+            timeout=timeout,
         )
-        responses = [json.loads(line) for line in stdout.strip().splitlines() if line.strip()]
-        # Use the last response (should be the tool call response)
-        if not responses:
-            logger.error(f"No JSON responses received from MCP server for {server_name}")
-            return
+        # The last response answers tools/list (the first is the initialize response)
         result_response = responses[-1]
+        if "error" in result_response:
+            raise McpError(f"MCP server '{server_name}' returned error for tools/list: {result_response['error']}")
         results = result_response["result"]
-        for key in results["tools"]:
-            dynamic_model = self._create_tool_model(key['name'], key['inputSchema'])
-            # Store the serializable tool definition (key) instead of the dynamic_model type
-            self.registry["mcp_servers"][server_name]["tools"][key["name"]] = key 
-
-    def _parse_tool(self, tool: dict[str, Any]):
-        tool_name = tool["name"]
-        tool_description = tool["description"]
-        input_schema = tool["inputSchema"]
-        tool_model = self._create_tool_model(tool_name, input_schema)
-        return RegistryTool(
-            name=tool_name,
-            description=tool_description,
-            tool_model=tool_model
-        )
-
-    def _create_tool_model(self, tool_name: str, input_schema: dict[str, Any]) -> type[BaseModel]:
-        model_name = f"{tool_name.capitalize().replace('_', '')}InputModel"
-        fields = {}
-        required_fields = set(input_schema.get("required", []))
-
-        for prop_name, prop_info in input_schema.get("properties", {}).items():
-            js_type_str = prop_info.get("type", "any")
-            py_type = js_type_string_to_py_type(js_type_str)
-            description = prop_info.get("description", "")
-            
-            if prop_name in required_fields:
-                # For required fields, Ellipsis (...) indicates it's required
-                fields[prop_name] = (py_type, Field(..., description=description))
-            else:
-                # For optional fields, provide a default (error.g., None)
-                # and wrap the type with | None if not already a union with NoneType
-                if not (typing.get_origin(py_type) is UnionType and \
-                        NoneType in typing.get_args(py_type)):
-                    py_type = py_type | None
-                fields[prop_name] = (py_type, Field(default=None, description=description))
-        
-        # Dynamically create the Pydantic model
-        # You might want to add __config__ or other BaseModel attributes if needed
-        created_model = create_model(model_name, **fields) # type: ignore
-        return created_model
-
-    def _value_to_type(self, value: Any, type: type):
-        try:
-            return type(value)
-        except Exception as error:
-            logger.error(f"Failed to convert value {value} to type {type}: {error}")
-            return Any(value)
+        # Input models are generated from these definitions once per refresh (see _write_tool_models)
+        return {tool["name"]: tool for tool in results["tools"]}
 
     def _save_registry(self):
         logger.info(f"Saving registry to {self.registry_path}")
         try:
-            self.registry_path.write_text(json.dumps(self.registry, indent=2))
+            with self._lock:
+                serialized = json.dumps(self.registry, indent=2)
+            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+            self.registry_path.write_text(serialized)
         except Exception as error:
             logger.error(f"Failed to save registry to {self.registry_path}: {error}")
             return False
@@ -147,6 +345,9 @@ class McpRegistry(BaseModel):
 
     def _load_registry(self, registry_path: Path | None = None):
         self.registry_path = registry_path if registry_path else self.registry_path
+        if not self.registry_path.exists():
+            logger.info(f"No cached registry at {self.registry_path}")
+            return False
         try:
             self.registry = json.loads(self.registry_path.read_text())
         except Exception as error:
@@ -154,7 +355,7 @@ class McpRegistry(BaseModel):
             return False
         if not self.registry:
             self.registry = {
-                "mcpServers": {}
+                "mcp_servers": {}
             }
         logger.info("Loaded registry")
         return self.registry
@@ -1,10 +1,12 @@
 import json
 import os
 import re
+import sys
+import threading
 from pathlib import Path
 from typing import Any
 
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 from pydantic import BaseModel, Field
 
 from erasmus.mcp.models import (
@@ -18,22 +20,115 @@ logger = get_console_logger()
 console = get_console()
 
 DEFAULT_CONFIG_PATH = Path.cwd() / ".erasmus" / "mcp" / "mcp_config.json"
+# Seconds a call may take when neither the caller nor the server's "timeout" sets a deadline
+DEFAULT_CALL_TIMEOUT = 120.0
+# Matches commands given as a path rather than a bare executable name
+PATH_STRING_PATTERN = re.compile(r'(?:[a-zA-Z]:[\\/]|~[\\/]?|\.\.?[\\/]|[\/\\])[\w\s.+=~^-]*|(?:[\w\s.+=~^-]+[\\/])+[\w\s.+=~^-]*')
+# Accepted "type" values; "http" and "streamable-http" servers are reached at their "url"
+SERVER_TRANSPORTS = ("stdio", "http", "streamable-http")
+# Environment variables that mean there is nobody to answer a prompt
+CI_ENV_VARS = ("CI", "GITHUB_ACTIONS", "GITLAB_CI", "BUILDKITE", "JENKINS_URL")
+
+_dotenv_loaded = False
+_snapshots: dict[Path, tuple[tuple[int, int], "McpServers"]] = {}
+_snapshot_lock = threading.Lock()
+
+
+def load_dotenv_once():
+    """Load the project's .env into the environment, once per process."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv(find_dotenv(usecwd=True))
+        _dotenv_loaded = True
+
+
+def is_interactive() -> bool:
+    """Return whether missing settings may be prompted for: not in CI and stdin is a terminal."""
+    if any(os.getenv(name, "").lower() not in ("", "0", "false") for name in CI_ENV_VARS):
+        return False
+    return sys.stdin is not None and sys.stdin.isatty()
+
+
+def prompt_for_env_value(key: str) -> str:
+    """Ask for a missing environment variable, export it and remember it in .env.
+
+    Returns:
+        The value entered, or "" without prompting when not interactive.
+    """
+    if not is_interactive():
+        logger.warning(f"Environment variable '{key}' is not set and cannot be prompted for here; leaving it empty.")
+        return ""
+    value = ""
+    while not value:
+        value = console.input(f"Enter value for {key}: ").strip()
+        if not value:
+            console.print(f"Environment variable '{key}' is not set. Please try again", style="red")
+    os.environ[key] = value
+    env_path = Path.cwd() / ".env"
+    lines = env_path.read_text().splitlines() if env_path.exists() else []
+    lines = [line for line in lines if not line.startswith(f"{key}=")] + [f"{key}={value}"]
+    env_path.write_text("\n".join(lines) + "\n")
+    return value
+
+
+def get_mcp_servers(config_path: Path = DEFAULT_CONFIG_PATH) -> "McpServers":
+    """Return the process-wide parsed configuration for a config file.
+
+    The file is parsed (and its environment resolved) once, and parsed again
+    only when its mtime or size changes, so every consumer in a process shares
+    one snapshot. Construct McpServers directly for a private, mutable copy.
+    """
+    try:
+        stat = config_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    with _snapshot_lock:
+        cached = _snapshots.get(config_path)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        servers = McpServers(config_path)
+        if version is not None:
+            _snapshots[config_path] = (version, servers)
+        return servers
+
 
 class McpServers(BaseModel):
     servers: dict[str, McpServer] = Field(default_factory=dict)
     config_path: Path
+    cache_config: dict[str, Any] = Field(default_factory=dict)
     path_string_pattern: re.Pattern 
     __pydantic_fields_set__ = set()
 
     def __init__(self, config_path: Path = DEFAULT_CONFIG_PATH):
         self.servers = {}
         self.config_path = config_path
+        self.cache_config = {}
         self.load_from_json()
-        self.path_string_pattern = re.compile(r'(?:[a-zA-Z]:[\\/]|~[\\/]?|\.\.?[\\/]|[\/\\])[\w\s.+=~^-]*|(?:[\w\s.+=~^-]+[\\/])+[\w\s.+=~^-]*')
-
-
-    def add_server(self, name: str, command: str, args: list[str], env: dict[str, str]):
-        self.servers[name] = McpServer(name=name, command=command, args=args, env=env)
+        self.path_string_pattern = PATH_STRING_PATTERN
+
+
+    def add_server(
+        self,
+        name: str,
+        command: str,
+        args: list[str],
+        env: dict[str, str],
+        timeout: float | None = None,
+        spares: int = 0,
+        url: str | None = None,
+        headers: dict[str, str] | None = None,
+    ):
+        self.servers[name] = McpServer(
+            name=name,
+            command=command,
+            args=args,
+            env=env,
+            url=url,
+            headers=headers or {},
+            timeout=timeout,
+            spares=spares,
+        )
 
     def remove_server(self, name: str):
         if name in self.servers:
@@ -48,6 +143,17 @@ class McpServers(BaseModel):
     def get_server_names(self) -> list[str]:
         return list(self.servers.keys())
 
+    def get_call_timeout(self, server_name: str, timeout: float | None = None) -> float | None:
+        """Resolve the deadline for a call: the caller's, else the server's, else DEFAULT_CALL_TIMEOUT.
+
+        Returns:
+            Seconds to wait, or None when the resolved value is 0 or negative (no deadline).
+        """
+        if timeout is None:
+            server = self.servers.get(server_name)
+            timeout = server.timeout if server and server.timeout is not None else DEFAULT_CALL_TIMEOUT
+        return timeout if timeout > 0 else None
+
     def get_server_paths(self) -> dict[str, Path]:
         paths = {}
         for server in self.servers.values():
@@ -86,49 +192,46 @@ class McpServers(BaseModel):
         config_data = self.config_path.read_text()
         if "mcpServers" not in config_data:
             raise ValueError("Invalid MCP server configuration")
-        for server_name, server_data in json.loads(config_data)["mcpServers"].items():
-            command = server_data["command"]
-            args = server_data["args"]
-            raw_env = server_data.get("env", {})
-            if "$" in raw_env.values():
-                self._create_dynamic_prompt_for_value(raw_env)
-            env = self.load_environment_variables(raw_env)
-            self.add_server(server_name, command, args, env)
-
-
-    def _create_dynamic_prompt_for_value(self, env: dict[str, str]):
-        
-        for key, value in env.items():
-            if value.startswith("$"):
-                if os.getenv(key):
-                    value = os.getenv(key)
-                else:
-                    value = console.input(f"Enter value for {key}: ")
-                    if not value:
-                        console.print(f"Environment variable '{key}' is not set. Please try again", style="red")
-                        self._create_dynamic_prompt_for_value(env)
-                    os.environ[key] = value
-            if not value:
-                value = console.input(f"Enter value for {key}: ")
-                if not value:
-                    console.print(f"Environment variable '{key}' is not set. Please try again", style="red")
-                    self._create_dynamic_prompt_for_value(env)
-                os.environ[key] = value
-        env_path = Path.cwd() / ".env"
-        env_lines = env_path.read_text().splitlines()
-        if key in env_lines:
-            env_path.write_text(env_path.read_text().replace(f"{key}={os.environ[key]}", f"{key}={value}"))
-        else:
-            env_path.write_text(env_path.read_text() + f"\n{key}={value}")
-            
-
-
-    def load_environment_variables(self, env: dict[str, str]):
-        load_dotenv()
+        config = json.loads(config_data)
+        self.cache_config = config.get("cache", {})
+        for server_name, server_data in config["mcpServers"].items():
+            url = server_data.get("url")
+            transport = server_data.get("type", "http" if url else "stdio")
+            if transport not in SERVER_TRANSPORTS:
+                raise ValueError(f"MCP server '{server_name}' has unsupported type '{transport}' (expected one of {', '.join(SERVER_TRANSPORTS)})")
+            if transport == "stdio":
+                command, args, url = server_data["command"], server_data.get("args", []), None
+            elif not url:
+                raise ValueError(f"MCP server '{server_name}' of type '{transport}' needs a 'url'")
+            else:
+                command, args = "", []
+            env = self.load_environment_variables(server_data.get("env", {}))
+            self.add_server(
+                server_name,
+                command,
+                args,
+                env,
+                server_data.get("timeout"),
+                server_data.get("spares", 0),
+                url=url,
+                headers=server_data.get("headers"),
+            )
+
+
+    def load_environment_variables(self, env: dict[str, str]) -> dict[str, str]:
+        """Resolve a server's environment variables from the process environment and .env.
+
+        Missing values are prompted for once each, unless prompting is not
+        possible (see is_interactive), in which case they resolve to "".
+        """
+        load_dotenv_once()
+        resolved = {}
         for key in env:
-            if not os.getenv(key):
-                self._create_dynamic_prompt_for_value(env)
-        return {key: os.getenv(key) for key in env}
+            value = os.getenv(key)
+            if not value:
+                value = prompt_for_env_value(key)
+            resolved[key] = value
+        return resolved
 
     @staticmethod
     def get_server_request(
@@ -0,0 +1,198 @@
+"""
+Generated pydantic input models for MCP tools.
+
+At registry refresh time each server's tool input schemas are rendered into
+a plain Python module (``.erasmus/mcp/models/<server>.py``) declaring one
+pydantic model per tool. Importing that module is much cheaper than calling
+``pydantic.create_model`` for every tool on every start, and it only happens
+the first time one of the server's tools is used.
+"""
+
+import importlib.util
+import keyword
+import re
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from pydantic import BaseModel
+
+# Bump when the generated module layout changes so old modules are regenerated
+TOOL_MODELS_VERSION = 1
+
+# Python annotations (as source) for JSON schema types
+SCHEMA_TYPE_TO_ANNOTATION = {
+    "string": "str",
+    "integer": "int",
+    "number": "int | float",
+    "boolean": "bool",
+    "array": "list[Any]",
+    "object": "dict[str, Any]",
+    "null": "None",
+}
+
+_loaded_modules: dict[Path, tuple[int, ModuleType]] = {}
+_load_lock = threading.Lock()
+
+
+def model_class_name(tool_name: str) -> str:
+    """Return the generated model class name for a tool (e.g. list_commits -> ListcommitsInputModel)."""
+    name = re.sub(r"\W", "", tool_name.capitalize().replace("_", ""))
+    if not name or not name[0].isalpha():
+        name = f"Tool{name}"
+    return f"{name}InputModel"
+
+
+def _field_name(prop_name: str, taken: set[str]) -> str:
+    """Return a valid attribute name for a schema property that does not shadow BaseModel."""
+    name = re.sub(r"\W", "_", prop_name)
+    if not name or name[0].isdigit() or name.startswith("_") or keyword.iskeyword(name) or hasattr(BaseModel, name):
+        name = f"field_{name.lstrip('_')}"
+    while name in taken:
+        name += "_"
+    taken.add(name)
+    return name
+
+
+def _annotation(prop_schema: dict[str, Any]) -> str:
+    schema_type = prop_schema.get("type")
+    if isinstance(schema_type, list):
+        annotations = [SCHEMA_TYPE_TO_ANNOTATION.get(member, "Any") for member in schema_type]
+        return "Any" if "Any" in annotations else " | ".join(dict.fromkeys(annotations))
+    return SCHEMA_TYPE_TO_ANNOTATION.get(schema_type, "Any")
+
+
+def render_tool_model(tool_name: str, input_schema: dict[str, Any], class_name: str | None = None) -> str:
+    """Render the source of one tool's input model.
+
+    Args:
+        tool_name: Name of the tool.
+        input_schema: The tool's JSON schema for its arguments.
+        class_name: Name of the model class. Defaults to model_class_name(tool_name).
+
+    Returns:
+        Python source declaring the model class.
+    """
+    required = set(input_schema.get("required", []))
+    extra = "forbid" if input_schema.get("additionalProperties") is False else "allow"
+    lines = [
+        f"class {class_name or model_class_name(tool_name)}(BaseModel):",
+        f"    model_config = ConfigDict(extra={extra!r}, populate_by_name=True)",
+    ]
+    taken: set[str] = set()
+    for prop_name, prop_schema in (input_schema.get("properties") or {}).items():
+        if not isinstance(prop_schema, dict):
+            prop_schema = {}
+        field_name = _field_name(prop_name, taken)
+        annotation = _annotation(prop_schema)
+        field_args = [] if prop_name in required else ["default=None"]
+        if field_name != prop_name:
+            field_args.append(f"alias={prop_name!r}")
+        if prop_schema.get("description"):
+            field_args.append(f"description={prop_schema['description']!r}")
+        if prop_name not in required and annotation not in ("Any", "None"):
+            annotation += " | None"
+        lines.append(f"    {field_name}: {annotation} = Field({', '.join(field_args)})")
+    return "\n".join(lines)
+
+
+def render_tool_models_module(server_name: str, tools: dict[str, Any], fingerprint: str | None = None) -> str:
+    """Render the module of input models for every tool of a server.
+
+    Tools without an input schema are skipped.
+
+    Args:
+        server_name: Name of the MCP server.
+        tools: Tool definitions keyed by tool name, as stored in registry.json.
+        fingerprint: Fingerprint of the server definition the tools came from.
+
+    Returns:
+        Python source of the module.
+    """
+    classes, models = [], []
+    class_names: set[str] = set()
+    for tool_name, tool_schema in tools.items():
+        input_schema = tool_schema.get("inputSchema") if isinstance(tool_schema, dict) else None
+        if not isinstance(input_schema, dict):
+            continue
+        # get_me and getme map to the same class name
+        class_name = model_class_name(tool_name)
+        while class_name in class_names:
+            class_name = f"_{class_name}"
+        class_names.add(class_name)
+        classes.append(render_tool_model(tool_name, input_schema, class_name))
+        models.append(f"    {tool_name!r}: {class_name},")
+    header = [
+        f'"""Input models for the tools of MCP server {server_name!r}. Generated by erasmus mcp registry refresh; do not edit."""',
+        "from typing import Any",
+        "",
+        "from pydantic import BaseModel, ConfigDict, Field",
+        "",
+        f"VERSION = {TOOL_MODELS_VERSION}",
+        f"SERVER = {server_name!r}",
+        f"FINGERPRINT = {fingerprint!r}",
+    ]
+    footer = ["MODELS = {", *models, "}"]
+    return "\n\n\n".join(["\n".join(header), *classes, "\n".join(footer)]) + "\n"
+
+
+def get_tool_models_path(model_dir: Path, server_name: str) -> Path:
+    """Return the path of a server's generated model module."""
+    return model_dir / f"{re.sub(r'[^A-Za-z0-9_]', '_', server_name)}.py"
+
+
+def write_tool_models(model_dir: Path, server_name: str, source: str) -> Path:
+    """Persist a server's generated model module.
+
+    Args:
+        model_dir: Directory holding the generated modules.
+        server_name: Name of the MCP server.
+        source: Module source returned by render_tool_models_module.
+
+    Returns:
+        The path written.
+    """
+    model_dir.mkdir(parents=True, exist_ok=True)
+    module_path = get_tool_models_path(model_dir, server_name)
+    module_path.write_text(source)
+    return module_path
+
+
+def load_tool_models(model_dir: Path, server_name: str, fingerprint: str | None = None) -> dict[str, type[BaseModel]] | None:
+    """Import a server's generated models, reusing the module while the file is unchanged.
+
+    Args:
+        model_dir: Directory holding the generated modules.
+        server_name: Name of the MCP server.
+        fingerprint: Expected server fingerprint. Ignored when None.
+
+    Returns:
+        The models keyed by tool name, or None if the module is missing,
+        broken or stale.
+    """
+    module_path = get_tool_models_path(model_dir, server_name)
+    try:
+        mtime = module_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _load_lock:
+        cached = _loaded_modules.get(module_path)
+        if cached is not None and cached[0] == mtime:
+            module = cached[1]
+        else:
+            spec = importlib.util.spec_from_file_location(f"erasmus_mcp_models_{module_path.stem}", module_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            try:
+                spec.loader.exec_module(module)
+            except Exception:
+                sys.modules.pop(spec.name, None)
+                return None
+            _loaded_modules[module_path] = (mtime, module)
+    if getattr(module, "VERSION", None) != TOOL_MODELS_VERSION:
+        return None
+    if fingerprint is not None and getattr(module, "FINGERPRINT", None) != fingerprint:
+        return None
+    return module.MODELS
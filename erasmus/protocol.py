@@ -8,6 +8,7 @@ import typer
 from pydantic import BaseModel, Field
 
 from erasmus.utils.paths import get_path_manager
+from erasmus.utils.rules_merge import get_rules_merger
 from erasmus.utils.sanatizer import _sanitize_string
 from erasmus.utils.rich_console import get_console, print_panel, print_table, get_console_logger
 
@@ -280,11 +281,6 @@ class ProtocolManager:
             return
         
         try:
-            # Read context files
-            architecture = path_manager.architecture_file.read_text()
-            progress = path_manager.progress_file.read_text()
-            tasks = path_manager.tasks_file.read_text()
-            
             # Prepare rules file path
             rules_path = path_manager.rules_file
             context_template_path = path_manager.template_dir / "meta_rules.md"
@@ -295,27 +291,15 @@ class ProtocolManager:
             print(f"[DEBUG] Protocol: {self.protocol.name}")
             print(f"[DEBUG] Protocol content length: {len(self.protocol.content)}")
             
-            # Read template and replace placeholders
-            template_content = context_template_path.read_text()
-            
-            # Print out placeholders before replacement
-            print("[DEBUG] Before replacement:")
-            print(f"Architecture placeholder: {template_content.count('<!-- Architecture content -->')}")
-            print(f"Progress placeholder: {template_content.count('<!-- Progress content -->')}")
-            print(f"Tasks placeholder: {template_content.count('<!-- Tasks content -->')}")
-            print(f"Protocol placeholder: {template_content.count('<!-- Protocol content -->')}")
-            
-            template_content = template_content.replace("<!-- Architecture content -->", architecture)
-            template_content = template_content.replace("<!-- Progress content -->", progress)
-            template_content = template_content.replace("<!-- Tasks content -->", tasks)
-            template_content = template_content.replace("<!-- Protocol content -->", self.protocol.content)
-            
-            # Print out content before writing
-            print("[DEBUG] Template content preview:")
-            print(template_content[:500] + "...")
-            
-            # Write updated content to rules file
-            rules_path.write_text(template_content)
+            # Render the template, writing the rules file only if its content changes
+            written = get_rules_merger().merge(context_template_path, {
+                "Architecture": path_manager.architecture_file,
+                "Progress": path_manager.progress_file,
+                "Tasks": path_manager.tasks_file,
+                "Protocol": self.protocol.content,
+            }, rules_path)
+            if not written:
+                logger.debug(f"Rules file already up to date: {rules_path}")
             
             print(f"[SUCCESS] Successfully updated rules file with protocol: {self.protocol.name}")
             logger.info(f"Successfully updated rules file with protocol: {self.protocol.name}")
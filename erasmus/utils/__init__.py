@@ -2,6 +2,14 @@
 Utility modules for Erasmus.
 """
 
-from erasmus.utils.paths import get_path_manager
-
 __all__ = ["get_path_manager"]
+
+
+def __getattr__(name: str):
+    # Imported lazily so that `erasmus.utils.rich_console` can be used without
+    # pulling in (and configuring) the path manager.
+    if name == "get_path_manager":
+        from erasmus.utils.paths import get_path_manager
+
+        return get_path_manager
+    raise AttributeError(f"module 'erasmus.utils' has no attribute '{name}'")
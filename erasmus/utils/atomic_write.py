@@ -0,0 +1,99 @@
+"""
+Atomic publication of files that other programs read while erasmus writes them.
+
+IDEs poll the rules file (``.cursorrules``, ``CLAUDE.md``, ...) and the global
+rules file. A file truncated and rewritten in place can be read half-written.
+Instead, the content is written to a temporary file in the same directory
+and renamed over the target, so a reader sees either the old or the new
+content in full.
+
+How hard the write is pushed to disk is set by ERASMUS_RULES_DURABILITY:
+
+    none  no fsync; fastest, but a crash may leave an empty file
+    file  fsync the new content before the rename (default)
+    full  also fsync the directory, so the rename itself survives a crash
+"""
+
+import os
+import stat
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+DURABILITY_ENV_VAR = "ERASMUS_RULES_DURABILITY"
+DURABILITY_LEVELS = ("none", "file", "full")
+DEFAULT_DURABILITY = "file"
+
+_umask: int | None = None
+
+
+def get_durability() -> str:
+    """Return the configured durability level, falling back to the default for unknown values."""
+    durability = os.getenv(DURABILITY_ENV_VAR, DEFAULT_DURABILITY).strip().lower()
+    if durability not in DURABILITY_LEVELS:
+        logger.warning(f"Unknown {DURABILITY_ENV_VAR} '{durability}', expected one of {', '.join(DURABILITY_LEVELS)}; using '{DEFAULT_DURABILITY}'.")
+        return DEFAULT_DURABILITY
+    return durability
+
+
+def _new_file_mode() -> int:
+    """Return the mode a plainly created file would get (0o666 minus the umask)."""
+    global _umask
+    if _umask is None:
+        # The umask can only be read by setting it
+        _umask = os.umask(0o022)
+        os.umask(_umask)
+    return 0o666 & ~_umask
+
+
+def atomic_write(path: Path, data: bytes | Iterable[bytes], durability: str | None = None) -> None:
+    """Replace a file's content atomically.
+
+    A symlinked path keeps its link; the file it points to is replaced. The
+    file keeps its permissions, and a new file gets the usual ones.
+
+    Args:
+        path: The file to write.
+        data: The new content, whole or in chunks.
+        durability: "none", "file" or "full". Defaults to ERASMUS_RULES_DURABILITY.
+
+    Raises:
+        OSError: If the file cannot be written. The target is left unchanged.
+    """
+    durability = durability or get_durability()
+    target = path.resolve() if path.is_symlink() else path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except OSError:
+        mode = _new_file_mode()
+
+    file_descriptor, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            if isinstance(data, bytes):
+                temp_file.write(data)
+            else:
+                temp_file.writelines(data)
+            temp_file.flush()
+            if durability != "none":
+                os.fsync(temp_file.fileno())
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+    if durability == "full" and hasattr(os, "O_DIRECTORY"):
+        directory = os.open(target.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
@@ -0,0 +1,115 @@
+"""
+Trailing-edge debouncing for file watcher events.
+
+Saving a file in an editor produces a burst of events (write, rename, chmod,
+often for several files). A leading-edge debounce reacts to the first event
+and drops the rest, so the state after the last event may never be handled.
+TrailingDebouncer instead waits until the burst has gone quiet and then calls
+back once, so the last state always wins.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+
+class TrailingDebouncer:
+    """Coalesces bursts of triggers into one callback after the burst goes quiet.
+
+    Each trigger pushes the callback back to ``quiet_period`` seconds after it,
+    but never later than ``max_latency`` seconds after the first trigger of the
+    burst, so a steady stream of events is still handled regularly. Triggers
+    that arrive while the callback runs schedule one more call.
+
+    The callback runs on a daemon thread, started on the first trigger.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        quiet_period: float = 0.5,
+        max_latency: float = 2.0,
+        name: str = "debouncer",
+    ) -> None:
+        """Initialize the debouncer.
+
+        Args:
+            callback: Called once per burst. Exceptions are logged.
+            quiet_period: Seconds without triggers that end a burst.
+            max_latency: Most seconds a trigger waits for the callback.
+            name: Name of the thread and of the debouncer in logs.
+        """
+        self.callback = callback
+        self.quiet_period = quiet_period
+        self.max_latency = max(max_latency, quiet_period)
+        self.name = name
+        self._condition = threading.Condition()
+        self._first_trigger: float | None = None
+        self._due: float | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> bool:
+        """Whether a callback is scheduled."""
+        return self._due is not None
+
+    def trigger(self) -> None:
+        """Record an event, scheduling or postponing the callback."""
+        with self._condition:
+            now = time.monotonic()
+            if self._first_trigger is None:
+                self._first_trigger = now
+            self._due = min(now + self.quiet_period, self._first_trigger + self.max_latency)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and (self._due is None or self._due > time.monotonic()):
+                    self._condition.wait(None if self._due is None else max(self._due - time.monotonic(), 0))
+                if self._stopping:
+                    return
+                self._due = self._first_trigger = None
+            self._invoke()
+
+    def _invoke(self) -> None:
+        try:
+            self.callback()
+        except Exception as error:
+            logger.error(f"{self.name} callback failed: {error}")
+
+    def flush(self) -> None:
+        """Run a scheduled callback now instead of waiting for the burst to end."""
+        with self._condition:
+            pending = self._due is not None
+            self._due = self._first_trigger = None
+        if pending:
+            self._invoke()
+
+    def close(self, flush: bool = True) -> None:
+        """Stop the thread, running a scheduled callback first unless flush is False.
+
+        A later trigger starts a new thread.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._condition:
+            self._thread = None
+            self._stopping = False
+        if flush:
+            self.flush()
+        else:
+            with self._condition:
+                self._due = self._first_trigger = None
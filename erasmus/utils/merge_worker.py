@@ -0,0 +1,101 @@
+"""
+A single worker thread that runs rules merges off the file watcher's threads.
+
+watchdog delivers every event on its observer thread. A merge run there (reading
+the context files, rendering and writing the rules file) holds up every event
+behind it, and during a burst such as a large git checkout the observer falls
+behind. Watchers therefore only submit an intent, a key naming the work and the
+task doing it, and this worker runs the intents one at a time in the order they
+were first submitted. An intent whose key is already pending is merged into
+it, so however many events arrive while a merge runs, at most one more merge
+follows.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+
+from erasmus.utils.rich_console import get_console_logger
+
+logger = get_console_logger()
+
+
+class MergeWorker:
+    """Runs submitted tasks on one thread, deduplicating the tasks still pending."""
+
+    def __init__(self, name: str = "merge-worker") -> None:
+        self.name = name
+        self._condition = threading.Condition()
+        # key -> task, in the order the keys were first submitted
+        self._pending: dict[Hashable, Callable[[], None]] = {}
+        self._running: Hashable | None = None
+        self._thread: threading.Thread | None = None
+        self.submitted = 0
+        self.coalesced = 0
+
+    def submit(self, key: Hashable, task: Callable[[], None]) -> bool:
+        """Queue a task, replacing the pending task with the same key.
+
+        Only takes a lock, so it is cheap enough for watchdog callbacks.
+
+        Returns:
+            True if the task was queued, False if it was merged into a pending one.
+        """
+        with self._condition:
+            self.submitted += 1
+            queued = key not in self._pending
+            if not queued:
+                self.coalesced += 1
+            self._pending[key] = task
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return queued
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                key = next(iter(self._pending))
+                task = self._pending.pop(key)
+                self._running = key
+            try:
+                task()
+            except Exception as error:
+                logger.error(f"{self.name} failed to run {key}: {error}")
+            finally:
+                with self._condition:
+                    self._running = None
+                    self._condition.notify_all()
+
+    @property
+    def idle(self) -> bool:
+        """Whether no task is pending or running."""
+        with self._condition:
+            return not self._pending and self._running is None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every submitted task has run.
+
+        Returns:
+            True if the worker is idle, False if the timeout expired first.
+        """
+        if threading.current_thread() is self._thread:
+            # A task waiting for the worker would wait for itself
+            return False
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and self._running is None, timeout
+            )
+
+
+# Singleton instance
+_merge_worker = None
+
+def get_merge_worker() -> MergeWorker:
+    """Get the process-wide merge worker, so every watcher shares one queue."""
+    global _merge_worker
+    if _merge_worker is None:
+        _merge_worker = MergeWorker()
+    return _merge_worker
@@ -1,14 +1,19 @@
+import hashlib
+import json
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from dotenv import load_dotenv
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
+from dotenv import find_dotenv, load_dotenv
 from enum import Enum
 import os
-from typing import NamedTuple, List, Tuple
+from typing import NamedTuple, List, Tuple, TYPE_CHECKING
 from erasmus.utils.warp_integration import WarpIntegration, WarpRule
-from erasmus.mcp.servers import McpServers
 from erasmus.utils.rich_console import get_console_logger
+from erasmus.utils.atomic_write import atomic_write
 
-load_dotenv()
+if TYPE_CHECKING:
+    from erasmus.mcp.servers import McpServers
+
+load_dotenv(find_dotenv(usecwd=True))
 
 logger = get_console_logger()
 
@@ -84,7 +89,7 @@ def detect_ide_from_env() -> IDE | None:
     if "VSCODE_REMOTE" in os.environ or "REMOTE_CONTAINERS" in os.environ:
         return prompt_for_ide()
 
-    load_dotenv()
+    load_dotenv(find_dotenv(usecwd=True))
     ide_env = os.environ.get("IDE_ENV")
 
     if not ide_env:
@@ -107,7 +112,7 @@ def detect_ide_from_env() -> IDE | None:
 
 def prompt_for_ide() -> IDE:
     """Prompt the user to select an IDE."""
-    load_dotenv()
+    load_dotenv(find_dotenv(usecwd=True))
     if os.getenv("IDE_ENV"):
         return IDE[os.getenv("IDE_ENV")]
     print("No IDE environment detected. Please select an IDE:")
@@ -156,6 +161,73 @@ def get_ide() -> IDE:
     return ide
 
 
+def sync_global_rules(template_path: Path, target_path: Path, stamp_path: Path) -> bool:
+    """Copy the meta agent template to the IDE's global rules file only when it changed.
+
+    The stamp file records the template digest together with the size/mtime of
+    both files as of the last sync. When both stats still match, the sync is a
+    pair of stat calls. Otherwise the template digest is compared against the
+    target's digest, which is the stamped one while the target's stat is
+    unchanged and is only re-hashed from disk when it is not, and the target is
+    only replaced (atomically) if they differ.
+    Skipping the write matters because IDEs watch this file and re-index on
+    every modification.
+
+    Args:
+        template_path: Source template (meta_agent.md).
+        target_path: The IDE's global rules file.
+        stamp_path: Small JSON file holding the last synced state.
+
+    Returns:
+        True if the target file was written, False if it was already up to date.
+    """
+    def _stat(path: Path) -> list[int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    try:
+        stamp = json.loads(stamp_path.read_text())
+    except (OSError, ValueError):
+        stamp = {}
+
+    target_key = str(target_path)
+    target_stat = _stat(target_path)
+    target_unchanged = stamp.get("target") == target_key and target_stat is not None and stamp.get("target_stat") == target_stat
+    if target_unchanged and stamp.get("template_stat") == _stat(template_path):
+        return False
+
+    template = template_path.read_bytes()
+    digest = hashlib.sha256(template).hexdigest()
+    written = False
+    if target_unchanged:
+        # The target still holds what the last sync wrote or verified
+        current_digest = stamp.get("digest")
+    else:
+        try:
+            current_digest = hashlib.sha256(target_path.read_bytes()).hexdigest()
+        except OSError:
+            current_digest = None
+    if current_digest != digest:
+        atomic_write(target_path, template)
+        written = True
+        logger.debug(f"Synced global rules to {target_path}")
+
+    try:
+        stamp_path.parent.mkdir(parents=True, exist_ok=True)
+        stamp_path.write_text(json.dumps({
+            "target": target_key,
+            "digest": digest,
+            "template_stat": _stat(template_path),
+            "target_stat": _stat(target_path),
+        }))
+    except OSError as error:
+        logger.warning(f"Failed to write global rules stamp {stamp_path}: {error}")
+    return written
+
+
 class PathMngrModel(BaseModel):
     """Manages paths for different IDE environments."""
 
@@ -204,7 +276,7 @@ class PathMngrModel(BaseModel):
     check_binary_script: Path = Field(
         default_factory=lambda: Path.cwd() / '.erasmus' / 'servers' / 'github' / 'check_binary.sh'
     )
-    mcp_servers: McpServers = Field(default_factory=lambda: McpServers())
+    _mcp_servers: "McpServers | None" = PrivateAttr(default=None)
 
     def __init__(self, **data):
         """Initialize the PathMngrModel with optional configuration data."""
@@ -224,13 +296,23 @@ class PathMngrModel(BaseModel):
         if not self.context_file.parent.exists():
             self.context_file.parent.mkdir(parents=True, exist_ok=True)
         self.global_rules_file = Path(self.ide.metadata.global_rules_path)
-        if not self.global_rules_file.parent.exists():
-            self.global_rules_file.parent.mkdir(parents=True, exist_ok=True)
         self.mcp_config_path = Path.cwd() / ".erasmus" / "mcp" / "mcp_config.json"
         if not self.mcp_config_path.parent.exists():
             self.mcp_config_path.parent.mkdir(parents=True, exist_ok=True)
-        global_rules = self.meta_agent_template.read_text()
-        self.global_rules_file.write_text(global_rules)
+        sync_global_rules(
+            self.meta_agent_template,
+            self.global_rules_file,
+            self.erasmus_dir / "global_rules.stamp",
+        )
+
+    @property
+    def mcp_servers(self) -> "McpServers":
+        """MCP server definitions, parsed on first access so non-MCP commands never import erasmus.mcp."""
+        if self._mcp_servers is None:
+            from erasmus.mcp.servers import get_mcp_servers
+
+            self._mcp_servers = get_mcp_servers(self.mcp_config_path)
+        return self._mcp_servers
 
     def update_warp_rules(self, document_type: str, document_id: str, rule: str) -> bool:
         """Update rules in Warp's database if IDE is set to Warp."""
@@ -3,14 +3,14 @@ from rich.table import Table
 from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.text import Text
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 from rich.logging import RichHandler
 import logging
 import os
 import json
 import typer
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 
 # Singleton Console instance
@@ -80,6 +80,50 @@ def print_table(headers: list[str], rows: list[list[Any]], title: str | None = N
     console.print(table)
 
 
+# Rows rendered per chunk by print_table_rows
+TABLE_CHUNK_ROWS = 200
+
+
+def print_table_rows(headers: list[str], rows: Iterable[list[Any]], title: str | None = None, chunk_size: int = TABLE_CHUNK_ROWS):
+    """Print a large table incrementally, one chunk of rows at a time.
+
+    Unlike print_table, rows are consumed lazily and written as each chunk
+    fills, so output starts right away and memory stays bounded. Columns share
+    the console width evenly and cells are cut to one line, so rows are
+    formatted as plain text instead of going through Rich's table layout,
+    which costs about a millisecond per row.
+
+    Args:
+        headers (list[str]): Column headers for the table.
+        rows (Iterable[list[Any]]): Data rows to display in the table.
+        title (str | None, optional): Title of the table. Defaults to None.
+        chunk_size (int, optional): Rows per written chunk. Defaults to TABLE_CHUNK_ROWS.
+    """
+    console = get_console()
+    width = max((console.width - 2 * (len(headers) - 1)) // max(len(headers), 1), 4)
+
+    def _format(cells: Iterable[Any]) -> str:
+        formatted = []
+        for cell in cells:
+            text = " ".join(str(cell).split("\n"))
+            formatted.append(text[:width - 1] + "…" if len(text) > width else text.ljust(width))
+        return "  ".join(formatted).rstrip()
+
+    if title:
+        console.print(title, justify="center", style="italic", markup=False)
+    console.print(_format(headers), style="bold", markup=False, highlight=False)
+    console.print("─" * min(console.width, width * len(headers) + 2 * (len(headers) - 1)), style="dim")
+    chunk = []
+    for row in rows:
+        chunk.append(_format(row))
+        if len(chunk) >= chunk_size:
+            console.file.write("\n".join(chunk) + "\n")
+            chunk = []
+    if chunk:
+        console.file.write("\n".join(chunk) + "\n")
+    console.file.flush()
+
+
 def print_syntax(code: str, language: str = "python", title: str | None = None):
     """Print code syntax highlighting using Rich library.
 
@@ -100,6 +144,9 @@ class RichConsoleLogger(logging.Logger):
     def __init__(self, name: str):
         super().__init__(name)
         
+        # The logger can be created before anything else has read .env
+        load_dotenv(find_dotenv(usecwd=True))
+
         # Get log level from environment variable
         log_level_str = os.getenv("ERASMUS_LOG_LEVEL", "INFO").upper() 
         if not log_level_str: 
@@ -107,7 +154,7 @@ class RichConsoleLogger(logging.Logger):
             env_path = Path.cwd() / ".env"
             with env_path.open("a") as f:
                 f.write(f"ERASMUS_LOG_LEVEL=ERROR\nERASMUS_DEBUG=False\n")
-            load_dotenv()
+            load_dotenv(find_dotenv(usecwd=True))
 
         # Map string log levels to logging constants
         log_level_map = {
@@ -0,0 +1,171 @@
+"""
+Incremental merge of the context files and protocol into the IDE rules file.
+
+The rules file is the meta_rules.md template with each ``<!-- Name content -->``
+placeholder replaced by a section: the three ``.ctx.*.md`` files and the active
+protocol, plus any placeholder bound to a provider with
+``RulesMerger.register_provider``. IDEs re-index the rules file whenever it
+is modified, so the merge only writes when the rendered output actually
+differs:
+
+- Each input is cached with its size/mtime and content digest, so an unchanged
+  file is not re-read. A touched file (mtime-only save) is re-read, and counts as
+  unchanged if its digest is the same. Like git's "racily clean" index entries,
+  a file modified within RACY_WINDOW_NS of being read is not trusted by its
+  stat alone: a same-size rewrite in the same mtime tick would look unchanged,
+  so it is re-read until its mtime is safely older than the read.
+- When no input digest changed and the rules file is as the last merge left
+  it, nothing is rendered or written.
+- Otherwise the output is rendered and its digest compared with the rules file's
+  current content, which is only rewritten if they differ.
+
+The template is compiled once per change (see erasmus.utils.rules_template),
+and the output is hashed and written chunk by chunk. The rules file is replaced
+atomically (see erasmus.utils.atomic_write), so IDEs never read it half-written.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from erasmus.utils.atomic_write import atomic_write
+from erasmus.utils.rich_console import get_console_logger
+from erasmus.utils.rules_template import load_template
+
+logger = get_console_logger()
+
+# Where a section's content comes from: a file to read, the content itself,
+# or a callable returning either, called only when the template uses the section
+SectionSource = Path | str | Callable[[], Path | str]
+
+# Coarsest mtime granularity expected (FAT keeps 2 s, HFS+ and some SMB shares 1 s)
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_racy(stat: tuple[int, int] | None, checked_at: int) -> bool:
+    """Return whether a file could have changed since ``checked_at`` without its size/mtime changing."""
+    return stat is None or stat[0] + RACY_WINDOW_NS > checked_at
+
+
+class RulesMerger:
+    """Renders the rules file from its inputs, skipping work for inputs and outputs that did not change."""
+
+    def __init__(self) -> None:
+        # path -> (size/mtime, digest, content, time_ns read) of each input file as last read
+        self._inputs: dict[Path, tuple[tuple[int, int] | None, str, bytes, int]] = {}
+        # rules path -> (digest of the inputs, size/mtime of the rules file, time_ns checked) after the last merge
+        self._merged: dict[Path, tuple[str, tuple[int, int] | None, int]] = {}
+        self.providers: dict[str, SectionSource] = {}
+        self._lock = threading.Lock()
+
+    def register_provider(self, name: str, source: SectionSource) -> None:
+        """Bind the ``<!-- name content -->`` placeholder to a source for every later merge.
+
+        Sections passed to ``merge`` take precedence over providers.
+        """
+        self.providers[name] = source
+
+    def read(self, path: Path) -> tuple[bytes, str]:
+        """Return a file's content and digest, re-reading it only when its size or mtime changed.
+
+        A file whose mtime was within RACY_WINDOW_NS of the last read is re-read as well.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        read_at = time.time_ns()
+        stat = _stat(path)
+        cached = self._inputs.get(path)
+        if cached is not None and cached[0] == stat and not _is_racy(stat, cached[3]):
+            return cached[2], cached[1]
+        data = path.read_bytes()
+        digest = _digest(data)
+        if cached is not None and cached[1] == digest:
+            logger.debug(f"{path} was touched but its content is unchanged")
+        self._inputs[path] = (stat, digest, data, read_at)
+        return data, digest
+
+    def _resolve(self, source: SectionSource) -> tuple[bytes, str]:
+        if callable(source):
+            source = source()
+        if isinstance(source, Path):
+            return self.read(source)
+        data = source.encode()
+        return data, _digest(data)
+
+    def merge(self, template_path: Path, sections: dict[str, SectionSource], rules_path: Path) -> bool:
+        """Write the rendered template to the rules file if its content changed.
+
+        Args:
+            template_path: The meta_rules.md template.
+            sections: Source of each placeholder, keyed by its name (e.g.
+                "Architecture" for ``<!-- Architecture content -->``). Only
+                the placeholders the template uses are resolved; placeholders
+                with neither a section nor a provider are left as they are.
+            rules_path: The IDE rules file.
+
+        Returns:
+            True if the rules file was written, False if it was already up to date.
+
+        Raises:
+            OSError: If an input cannot be read or the rules file cannot be written.
+        """
+        with self._lock:
+            template = load_template(template_path)
+            sources = {**self.providers, **sections}
+            values: dict[str, bytes] = {}
+            input_digest = hashlib.sha256(template.digest.encode())
+            for name in template.placeholders:
+                if name not in sources:
+                    continue
+                values[name], digest = self._resolve(sources[name])
+                input_digest.update(f"\0{name}\0{digest}".encode())
+            input_digest = input_digest.hexdigest()
+
+            merged = self._merged.get(rules_path)
+            rules_stat = _stat(rules_path)
+            if merged is not None and merged[:2] == (input_digest, rules_stat) and not _is_racy(rules_stat, merged[2]):
+                logger.debug(f"Rules inputs unchanged, skipping merge of {rules_path}")
+                return False
+
+            checked_at = time.time_ns()
+            chunks = list(template.iter_chunks(values))
+            output_digest = hashlib.sha256()
+            for chunk in chunks:
+                output_digest.update(chunk)
+            try:
+                current_digest = _digest(rules_path.read_bytes())
+            except OSError:
+                current_digest = None
+            written = current_digest != output_digest.hexdigest()
+            if written:
+                atomic_write(rules_path, chunks)
+            else:
+                logger.debug(f"Rendered rules match {rules_path}, skipping write")
+            self._merged[rules_path] = (input_digest, _stat(rules_path), checked_at)
+            return written
+
+
+# Singleton instance
+_rules_merger = None
+
+def get_rules_merger() -> RulesMerger:
+    """Get the process-wide rules merger, so its caches are shared by every caller."""
+    global _rules_merger
+    if _rules_merger is None:
+        _rules_merger = RulesMerger()
+    return _rules_merger
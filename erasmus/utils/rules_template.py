@@ -0,0 +1,73 @@
+"""
+Compiled meta_rules.md templates.
+
+A template is parsed once into literal segments and ``<!-- Name content -->``
+placeholders, and parsed again only when the file's size or mtime changes.
+Rendering yields the literals and the section values in order, so the output
+is produced in one pass. It can be joined, hashed or written chunk by chunk
+without first building one copy of the document per placeholder.
+
+Values are inserted verbatim: a placeholder that appears inside a section's
+content is not expanded.
+"""
+
+import hashlib
+import re
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+# Placeholder a section replaces in the template, e.g. "<!-- Tasks content -->"
+PLACEHOLDER = "<!-- {name} content -->"
+PLACEHOLDER_PATTERN = re.compile(rb"<!-- (\w[\w .-]*?) content -->")
+
+_compiled: dict[Path, tuple[tuple[int, int], "CompiledTemplate"]] = {}
+_compile_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """A template split into literal text and named placeholders."""
+
+    def __init__(self, source: bytes):
+        parts = PLACEHOLDER_PATTERN.split(source)
+        # Literals surround the placeholders: literal, name, literal, ..., literal
+        self.literals: list[bytes] = parts[0::2]
+        self.names: list[str] = [name.decode() for name in parts[1::2]]
+        self.digest = hashlib.sha256(source).hexdigest()
+
+    @property
+    def placeholders(self) -> list[str]:
+        """Names of the placeholders, each once, in order of first appearance."""
+        return list(dict.fromkeys(self.names))
+
+    def iter_chunks(self, values: Mapping[str, bytes]) -> Iterator[bytes]:
+        """Yield the rendered output in pieces.
+
+        Placeholders without a value are kept as they are.
+        """
+        for literal, name in zip(self.literals, self.names):
+            yield literal
+            value = values.get(name)
+            yield value if value is not None else PLACEHOLDER.format(name=name).encode()
+        yield self.literals[-1]
+
+    def render(self, values: Mapping[str, bytes]) -> bytes:
+        """Return the rendered output."""
+        return b"".join(self.iter_chunks(values))
+
+
+def load_template(path: Path) -> CompiledTemplate:
+    """Return the compiled template for a file, recompiling it when its size or mtime changes.
+
+    Raises:
+        OSError: If the template cannot be read.
+    """
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _compile_lock:
+        cached = _compiled.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        template = CompiledTemplate(path.read_bytes())
+        _compiled[path] = (version, template)
+        return template
@@ -0,0 +1,343 @@
+"""
+Startup profiler for the Erasmus CLI.
+
+Records the cost of every module import as a tree (like ``python -X importtime``)
+and flags side effects that run while the CLI starts up: subprocess spawns,
+file writes, ``load_dotenv`` calls and interactive prompts. Each side effect is
+attributed to the module being imported when it happened, or to ``<runtime>``
+once the command itself is executing.
+
+Enabled with ``erasmus --profile-startup [--profile-output report.json] ...``.
+The profiler has to be installed before anything else is imported, so
+``erasmus/__init__.py`` calls :func:`install_from_argv` first thing.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+from typing import Any
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_OUTPUT_FLAG = "--profile-output"
+RUNTIME_SCOPE = "<runtime>"
+# Imports faster than this (inclusive) are folded out of the tree view
+TREE_THRESHOLD_MS = 2.0
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent.parent)
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_TRUNC
+
+
+@dataclass
+class SideEffect:
+    """A side effect observed while profiling."""
+
+    kind: str
+    detail: str
+    module: str
+    location: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "detail": self.detail, "module": self.module, "location": self.location}
+
+
+@dataclass
+class ImportRecord:
+    """Timing for a single module import, including the imports it triggered."""
+
+    name: str
+    started: float
+    inclusive_ms: float = 0.0
+    children: list["ImportRecord"] = field(default_factory=list)
+    side_effects: list[SideEffect] = field(default_factory=list)
+
+    @property
+    def self_ms(self) -> float:
+        return max(self.inclusive_ms - sum(child.inclusive_ms for child in self.children), 0.0)
+
+    def has_side_effects(self) -> bool:
+        return bool(self.side_effects) or any(child.has_side_effects() for child in self.children)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "inclusive_ms": round(self.inclusive_ms, 3),
+            "self_ms": round(self.self_ms, 3),
+            "side_effects": [effect.to_dict() for effect in self.side_effects],
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _TimingLoader:
+    """Loader proxy that times ``exec_module`` and restores the real loader afterwards."""
+
+    def __init__(self, loader: Any, profiler: "StartupProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit()
+            if module.__spec__ is not None and module.__spec__.loader is self:
+                module.__spec__.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that wraps the loader found by the rest of ``sys.meta_path``."""
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None) -> Any:
+        if not self._profiler.active or getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self._profiler)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+class StartupProfiler:
+    """Collects import timings and side effects for one process."""
+
+    def __init__(self) -> None:
+        self.active = False
+        self.started = 0.0
+        self.finished: float | None = None
+        self.roots: list[ImportRecord] = []
+        self.side_effects: list[SideEffect] = []
+        self._stack: list[ImportRecord] = []
+        self._finder = _TimingFinder(self)
+        self._dotenv_originals: dict[Any, Any] = {}
+        self._audit_installed = False
+        self._main_thread = threading.main_thread()
+
+    # -- lifecycle -----------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start recording imports and side effects."""
+        if self.active:
+            return
+        self.active = True
+        self.started = time.perf_counter()
+        sys.meta_path.insert(0, self._finder)
+        if not self._audit_installed:
+            # Audit hooks cannot be removed, so the hook checks `active` instead.
+            sys.addaudithook(self._audit)
+            self._audit_installed = True
+        self._patch_dotenv()
+
+    def stop(self) -> None:
+        """Stop recording. Safe to call more than once."""
+        if not self.active:
+            return
+        self.active = False
+        self.finished = time.perf_counter()
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        for (module, attribute), original in self._dotenv_originals.items():
+            setattr(module, attribute, original)
+        self._dotenv_originals.clear()
+
+    @property
+    def total_ms(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    # -- recording -----------------------------------------------------------------
+
+    def _enter(self, name: str) -> None:
+        if threading.current_thread() is not self._main_thread:
+            return
+        record = ImportRecord(name=name, started=time.perf_counter())
+        (self._stack[-1].children if self._stack else self.roots).append(record)
+        self._stack.append(record)
+
+    def _exit(self) -> None:
+        if threading.current_thread() is not self._main_thread or not self._stack:
+            return
+        record = self._stack.pop()
+        record.inclusive_ms = (time.perf_counter() - record.started) * 1000
+
+    def record_side_effect(self, kind: str, detail: str) -> None:
+        """Attribute a side effect to the module currently being imported."""
+        if not self.active:
+            return
+        current = self._stack[-1] if self._stack else None
+        effect = SideEffect(
+            kind=kind,
+            detail=detail,
+            module=current.name if current else RUNTIME_SCOPE,
+            location=self._caller_location(),
+        )
+        self.side_effects.append(effect)
+        if current:
+            current.side_effects.append(effect)
+
+    @staticmethod
+    def _caller_location() -> str | None:
+        """Return the innermost erasmus frame (outside this module) as path:line."""
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_PACKAGE_DIR) and filename != __file__:
+                return f"{os.path.relpath(filename, _PACKAGE_DIR)}:{frame.f_lineno}"
+            frame = frame.f_back
+        return None
+
+    def _audit(self, event: str, args: tuple) -> None:
+        if not self.active:
+            return
+        if event == "subprocess.Popen":
+            executable, arguments = args[0], args[1]
+            command = arguments if isinstance(arguments, (str, bytes)) else " ".join(map(str, arguments or [executable]))
+            self.record_side_effect("subprocess", str(command))
+        elif event == "os.system":
+            self.record_side_effect("subprocess", str(args[0]))
+        elif event == "open":
+            path, mode, flags = args
+            if path is None or isinstance(path, int):
+                return
+            writes = any(char in mode for char in "wax+") if isinstance(mode, str) else bool(flags & _WRITE_FLAGS)
+            if writes:
+                self.record_side_effect("file_write", os.fsdecode(path))
+        elif event == "builtins.input":
+            self.record_side_effect("prompt", str(args[0]) if args else "")
+
+    def _patch_dotenv(self) -> None:
+        try:
+            import dotenv
+            import dotenv.main
+        except ImportError:
+            return
+        original = dotenv.main.load_dotenv
+        profiler = self
+
+        def load_dotenv(*args: Any, **kwargs: Any) -> bool:
+            target = args[0] if args else kwargs.get("dotenv_path")
+            profiler.record_side_effect("load_dotenv", str(target) if target else "<search>")
+            return original(*args, **kwargs)
+
+        for module in (dotenv, dotenv.main):
+            self._dotenv_originals[(module, "load_dotenv")] = module.load_dotenv
+            module.load_dotenv = load_dotenv
+
+    # -- reporting -----------------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the full profile (every import, no threshold)."""
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "import_ms": round(sum(root.inclusive_ms for root in self.roots), 3),
+            "imports": [root.to_dict() for root in self.roots],
+            "side_effects": [effect.to_dict() for effect in self.side_effects],
+        }
+
+    def write_json(self, output_path: str | Path) -> Path:
+        """Write the profile as JSON and return the path written."""
+        output_path = Path(output_path)
+        output_path.write_text(json.dumps(self.to_dict(), indent=2))
+        return output_path
+
+    def render_tree(self, threshold_ms: float = TREE_THRESHOLD_MS) -> Any:
+        """Build a rich Tree of imports at or above ``threshold_ms`` (or with side effects)."""
+        from rich.tree import Tree
+
+        tree = Tree(
+            f"[bold]Erasmus startup[/bold] total {self.total_ms:.1f} ms, "
+            f"imports {sum(root.inclusive_ms for root in self.roots):.1f} ms, "
+            f"{len(self.side_effects)} side effect(s)"
+        )
+
+        def _add(parent: Any, record: ImportRecord) -> None:
+            if record.inclusive_ms < threshold_ms and not record.has_side_effects():
+                return
+            style = "bold red" if record.side_effects else ("yellow" if record.inclusive_ms >= 50 else "")
+            label = f"{record.name} [dim]{record.inclusive_ms:.1f} ms (self {record.self_ms:.1f} ms)[/dim]"
+            node = parent.add(f"[{style}]{label}[/{style}]" if style else label)
+            for effect in record.side_effects:
+                location = f" [dim]@ {effect.location}[/dim]" if effect.location else ""
+                node.add(f"[red]! {effect.kind}[/red]: {effect.detail}{location}")
+            for child in sorted(record.children, key=lambda child: child.inclusive_ms, reverse=True):
+                _add(node, child)
+
+        for root in sorted(self.roots, key=lambda root: root.inclusive_ms, reverse=True):
+            _add(tree, root)
+
+        runtime_effects = [effect for effect in self.side_effects if effect.module == RUNTIME_SCOPE]
+        if runtime_effects:
+            runtime_node = tree.add(f"[bold]{RUNTIME_SCOPE}[/bold]")
+            for effect in runtime_effects:
+                location = f" [dim]@ {effect.location}[/dim]" if effect.location else ""
+                runtime_node.add(f"[red]! {effect.kind}[/red]: {effect.detail}{location}")
+        return tree
+
+    def report(self, output_path: str | Path | None = None) -> None:
+        """Stop profiling, print the tree to stderr and optionally export JSON."""
+        self.stop()
+        from rich.console import Console
+
+        console = Console(stderr=True)
+        console.print(self.render_tree())
+        if output_path:
+            written = self.write_json(output_path)
+            console.print(f"Startup profile written to [cyan]{written}[/cyan]")
+
+
+# Singleton instance
+_profiler: StartupProfiler | None = None
+
+
+def get_startup_profiler() -> StartupProfiler | None:
+    """Return the active startup profiler, if profiling was requested."""
+    return _profiler
+
+
+def install_from_argv(argv: list[str]) -> StartupProfiler | None:
+    """Start profiling if ``--profile-startup`` is present in ``argv``.
+
+    The report is emitted at interpreter exit so that imports and side effects
+    of the invoked command are included.
+    """
+    global _profiler
+    if PROFILE_FLAG not in argv or _profiler is not None:
+        return _profiler
+    output_path = None
+    if PROFILE_OUTPUT_FLAG in argv:
+        index = argv.index(PROFILE_OUTPUT_FLAG)
+        output_path = argv[index + 1] if index + 1 < len(argv) else None
+    else:
+        output_path = next(
+            (arg.split("=", 1)[1] for arg in argv if arg.startswith(f"{PROFILE_OUTPUT_FLAG}=")),
+            None,
+        )
+    _profiler = StartupProfiler()
+    _profiler.start()
+    atexit.register(_profiler.report, output_path)
+    return _profiler
@@ -1,15 +1,53 @@
+"""
+Local stand-in MCP server used as a test and benchmark fixture.
+
+Speaks newline-delimited JSON-RPC over stdio like the real servers, and serves
+tools whose behaviour is set by a JSON config instead of doing real work:
+
+    {
+        "seed": 0,
+        "list_latency_ms": 0,
+        "tools": {
+            "get_me": {"latency_ms": 5, "response_bytes": 256, "error_rate": 0.0, "read_only": true}
+        }
+    }
+
+- list_latency_ms: how long tools/list takes before it is answered.
+- latency_ms: how long a call to the tool takes before it is answered.
+- response_bytes: size of the text content returned by the tool.
+- error_rate: fraction of calls (0-1) answered with a JSON-RPC error.
+- read_only: advertise the tool with readOnlyHint.
+
+The config is read from the file given with ``--config`` or from the JSON in
+the MCP_TEST_SERVER_CONFIG environment variable. Without one the server only
+offers ``my_function``. Requests are handled concurrently, so calls with a
+latency overlap like they would against a real server. Pass ``--verbose`` to
+log every request to stderr.
+"""
+import argparse
 import asyncio
 import json
-import sys
 import os
-from typing import Dict, Any, Optional
+import random
+import sys
+from typing import Any, Dict, Optional
+
+CONFIG_ENV_VAR = "MCP_TEST_SERVER_CONFIG"
+PROTOCOL_VERSION = "2024-11-05"
+# Largest request line accepted from the client
+READ_LIMIT = 64 * 1024 * 1024
+
+VERBOSE = False
+
 
 # Basic logging to stderr to avoid interfering with stdout JSON-RPC
 def log_error(message: str):
     print(f"SERVER_ERROR: {message}", file=sys.stderr, flush=True)
 
 def log_info(message: str):
-    print(f"SERVER_INFO: {message}", file=sys.stderr, flush=True)
+    if VERBOSE:
+        print(f"SERVER_INFO: {message}", file=sys.stderr, flush=True)
+
 
 # --- Tool Implementation ---
 def my_function(param1: str, param2: int) -> str:
@@ -21,27 +59,51 @@ def my_function(param1: str, param2: int) -> str:
         raise ValueError("Invalid parameter types for my_function")
     return f"Processed '{param1}' with {param2}"
 
-# --- Available Tools Schema ---
-# This should match the structure expected by the client's StdioClient
-# or MCP implementation during initialization/tools/list.
-AVAILABLE_TOOLS = {
-    "my_function": {
-        "name": "my_function",
-        "description": "Function docstring - this will be used in the schema",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "param1": {"type": "string"},
-                "param2": {"type": "integer"}
-            },
-            "required": ["param1", "param2"]
-        }
-        # MCP spec might define a return schema too, omitted for simplicity
+
+MY_FUNCTION_TOOL = {
+    "name": "my_function",
+    "description": "Function docstring - this will be used in the schema",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "param1": {"type": "string"},
+            "param2": {"type": "integer"}
+        },
+        "required": ["param1", "param2"]
     }
-    # Add other tools here if needed
 }
 
 
+class ToolBehaviour:
+    """How a configured tool answers: its latency, response size and error rate."""
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.latency = float(config.get("latency_ms", 0)) / 1000
+        self.response_bytes = int(config.get("response_bytes", 0))
+        self.error_rate = float(config.get("error_rate", 0))
+        self.read_only = bool(config.get("read_only", False))
+
+    def schema(self) -> Dict[str, Any]:
+        tool = {
+            "name": self.name,
+            "description": f"Stand-in tool answering in {self.latency * 1000:g}ms with {self.response_bytes} bytes",
+            "inputSchema": {"type": "object", "properties": {"payload": {"type": "string"}}},
+        }
+        if self.read_only:
+            tool["annotations"] = {"readOnlyHint": True}
+        return tool
+
+
+def load_config(config_path: Optional[str]) -> Dict[str, Any]:
+    """Read the server config from a file, the environment, or return the default."""
+    if config_path:
+        with open(config_path) as config_file:
+            return json.load(config_file)
+    raw_config = os.environ.get(CONFIG_ENV_VAR)
+    return json.loads(raw_config) if raw_config else {}
+
+
 # --- JSON-RPC Response Formatting ---
 def create_response(request_id: Optional[str | int], result: Any) -> str:
     response = {
@@ -63,187 +125,139 @@ def create_error_response(request_id: Optional[str | int], code: int, message: s
     return json.dumps(response) + '\n' # MUST end with newline
 
 
-# --- Main Server Logic ---
-async def handle_request(request_data: Dict[str, Any], writer: asyncio.StreamWriter, initialized: bool) -> bool:
-    """Handles a single parsed JSON-RPC request."""
-    request_id = request_data.get("id")
-    method = request_data.get("method")
-    params = request_data.get("params", {})
-
-    log_info(f"Received request (id={request_id}): method='{method}'")
-
-    if not isinstance(request_id, (str, int, type(None))):
-        log_error("Invalid request ID type")
-        # According to JSON-RPC 2.0 spec, notification errors are not sent back.
-        # If it has an ID, it's not a notification.
-        if request_id is not None:
-             response_json = create_error_response(None, -32600, "Invalid Request", "Invalid request ID type")
-             writer.write(response_json.encode('utf-8'))
-             await writer.drain()
-        return initialized # Still running, but handle error
-
-    if not method:
-        log_error("Missing method in request")
-        response_json = create_error_response(request_id, -32600, "Invalid Request", "Method not specified")
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
-        return initialized
-
-    # --- Handle MCP Handshake ---
-    if method == "initialize":
-        if initialized:
-             log_error("Received duplicate initialize request.")
-             response_json = create_error_response(request_id, -32002, "Server Error", "Already initialized")
-        else:
-             log_info("Handling initialize request.")
-             # Respond with server capabilities (including tools)
-             response_data = {
-                 "capabilities": {
-                     # Add other capabilities the client might need
-                     "tools": list(AVAILABLE_TOOLS.values()) # Send tool schemas
-                 }
-             }
-             response_json = create_response(request_id, response_data)
-             initialized = True # Mark as initialized AFTER sending response
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
-        log_info(f"Initialization {'completed' if initialized else 'failed'}.")
-        return initialized
-
-    # --- Must be initialized for other methods ---
-    if not initialized:
-        log_error(f"Received method '{method}' before successful initialization.")
-        response_json = create_error_response(request_id, -32002, "Server Error", "Server not initialized")
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
-        return initialized # Remain uninitialized
-
-    # --- Handle Standard MCP Methods ---
-    if method == "tools/list":
-        log_info("Handling tools/list request.")
-        response_json = create_response(request_id, {"tools": list(AVAILABLE_TOOLS.values())})
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
-
-    # --- Handle Custom Tool Calls ---
-    elif method == "tools/call":
-        tool_name = params.get("tool_name")
-        tool_params = params.get("params", {})
-        log_info(f"Handling tools/call request for tool: {tool_name}")
+class StandInServer:
+    """Answers MCP requests from the configured tool behaviours."""
 
-        if tool_name == "my_function":
-            try:
-                # Ensure params is a dict if calling by name
-                if not isinstance(tool_params, dict):
-                     raise TypeError("Parameters must be a dictionary for named argument calling.")
-                result = my_function(param1=tool_params.get("param1"), param2=tool_params.get("param2"))
-                response_json = create_response(request_id, {"result": result})
-            except (TypeError, ValueError, KeyError) as error:
-                log_error(f"Error calling my_function: {error}")
-                response_json = create_error_response(request_id, -32602, "Invalid Params", str(e))
-            except Exception as error:
-                 log_error(f"Unexpected error in my_function: {error}")
-                 response_json = create_error_response(request_id, -32000, "Server Error", f"Internal error: {error}")
-        else:
-            log_error(f"Method not found: {tool_name}")
-            response_json = create_error_response(request_id, -32601, "Method not found", f"Tool '{tool_name}' not found")
+    def __init__(self, config: Dict[str, Any]):
+        self.tools = {name: ToolBehaviour(name, tool_config) for name, tool_config in config.get("tools", {}).items()}
+        self.random = random.Random(config.get("seed", 0))
+        self.list_latency = float(config.get("list_latency_ms", 0)) / 1000
+        self.initialized = False
+        self.running = True
 
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
+    def write(self, response_json: str):
+        # One write per frame keeps concurrent responses from interleaving
+        sys.stdout.buffer.write(response_json.encode('utf-8'))
+        sys.stdout.buffer.flush()
 
-    elif method == "shutdown":
-         log_info("Handling shutdown request.")
-         response_json = create_response(request_id, {}) # Acknowledge shutdown
-         writer.write(response_json.encode('utf-8'))
-         await writer.drain()
-         writer.close()
-         await writer.wait_closed()
-         log_info("Server shutting down.")
-         # Signal the main loop to exit
-         return False # No longer initialized / running
+    def list_tools(self) -> list[Dict[str, Any]]:
+        return [MY_FUNCTION_TOOL] + [tool.schema() for tool in self.tools.values()]
 
-    else:
-        log_error(f"Unknown method: {method}")
-        response_json = create_error_response(request_id, -32601, "Method not found", f"Method '{method}' not recognized")
-        writer.write(response_json.encode('utf-8'))
-        await writer.drain()
+    async def call_tool(self, request_id: Optional[str | int], params: Dict[str, Any]) -> str:
+        tool_name = params.get("name")
+        arguments = params.get("arguments") or {}
+        log_info(f"Handling tools/call request for tool: {tool_name}")
 
-    return initialized # Remain initialized unless shutdown
+        if tool_name == "my_function":
+            try:
+                result = my_function(param1=arguments.get("param1"), param2=arguments.get("param2"))
+            except ValueError as error:
+                return create_error_response(request_id, -32602, "Invalid Params", str(error))
+            return create_response(request_id, {"content": [{"type": "text", "text": result}]})
+
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            log_error(f"Tool not found: {tool_name}")
+            return create_error_response(request_id, -32601, "Method not found", f"Tool '{tool_name}' not found")
+        if tool.latency:
+            await asyncio.sleep(tool.latency)
+        if tool.error_rate and self.random.random() < tool.error_rate:
+            return create_error_response(request_id, -32000, f"Injected failure in '{tool_name}'")
+        return create_response(request_id, {"content": [{"type": "text", "text": "x" * tool.response_bytes}]})
+
+    async def handle_request(self, request_data: Dict[str, Any]):
+        """Handles a single parsed JSON-RPC request."""
+        request_id = request_data.get("id")
+        method = request_data.get("method")
+        params = request_data.get("params") or {}
+
+        log_info(f"Received request (id={request_id}): method='{method}'")
+
+        if "id" not in request_data:
+            # Notifications (initialized, cancelled) need no answer
+            return
+        if not method:
+            self.write(create_error_response(request_id, -32600, "Invalid Request", "Method not specified"))
+            return
+
+        # --- Handle MCP Handshake ---
+        if method == "initialize":
+            if self.initialized:
+                log_error("Received duplicate initialize request.")
+                self.write(create_error_response(request_id, -32002, "Server Error", "Already initialized"))
+                return
+            self.initialized = True
+            self.write(create_response(request_id, {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "mcp-test-server", "version": "1.0"},
+            }))
+            return
+
+        if method == "ping":
+            self.write(create_response(request_id, {}))
+        elif not self.initialized:
+            log_error(f"Received method '{method}' before successful initialization.")
+            self.write(create_error_response(request_id, -32002, "Server Error", "Server not initialized"))
+        elif method == "tools/list":
+            if self.list_latency:
+                await asyncio.sleep(self.list_latency)
+            self.write(create_response(request_id, {"tools": self.list_tools()}))
+        elif method == "tools/call":
+            self.write(await self.call_tool(request_id, params))
+        elif method == "shutdown":
+            log_info("Handling shutdown request.")
+            self.write(create_response(request_id, {}))
+            self.running = False
+        else:
+            log_error(f"Unknown method: {method}")
+            self.write(create_error_response(request_id, -32601, "Method not found", f"Method '{method}' not recognized"))
 
 
-async def main():
+async def main(config: Dict[str, Any]):
     log_info("MCP Test Server starting...")
-    # Use asyncio's streams for non-blocking stdio
-    reader = await asyncio.StreamReader.from_stdin()
-    writer = await asyncio.StreamWriter.from_stdout()
-
-    initialized = False
-    is_running = True
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=READ_LIMIT)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    server = StandInServer(config)
+    tasks = set()
+    while server.running:
+        # Read one line (a full JSON object)
+        line = await reader.readline()
+        if not line:
+            log_info("EOF received, exiting.")
+            break
+        if not line.strip():
+            continue
 
-    while is_running:
-        log_info("Waiting for request...")
         try:
-            # Read one line (a full JSON object)
-            line = await reader.readline()
-            if not line:
-                log_info("EOF received, exiting.")
-                break # End of input
-
-            line_str = line.decode('utf-8').strip()
-            log_info(f"Raw input line: {line_str}")
-            if not line_str:
-                continue # Ignore empty lines
-
-            # Parse JSON
-            try:
-                request_data = json.loads(line_str)
-                if not isinstance(request_data, dict):
-                     raise json.JSONDecodeError("Input is not a JSON object", line_str, 0)
-            except json.JSONDecodeError as error:
-                log_error(f"Invalid JSON received: {error}")
-                response_json = create_error_response(None, -32700, "Parse error", str(e))
-                writer.write(response_json.encode('utf-8'))
-                await writer.drain()
-                continue # Try reading next line
-
-            # Handle the request
-            initialized = await handle_request(request_data, writer, initialized)
-            if not initialized and method == "shutdown": # Check if shutdown was requested
-                 is_running = False
-
-
-        except asyncio.CancelledError:
-             log_info("Server task cancelled.")
-             is_running = False
-        except ConnectionResetError:
-             log_info("Client closed connection.")
-             is_running = False
-        except Exception as error:
-            log_error(f"Unexpected error in main loop: {error}")
-            # Attempt to send a generic error if possible, but might fail if connection is broken
-            try:
-                response_json = create_error_response(None, -32000, "Internal Server Error", str(e))
-                writer.write(response_json.encode('utf-8'))
-                await writer.drain()
-            except Exception as write_e:
-                 log_error(f"Failed to send error response: {write_e}")
-            is_running = False # Stop on unhandled errors
-
-    log_info("Server main loop finished.")
-    if not writer.is_closing():
-        writer.close()
-        await writer.wait_closed()
+            request_data = json.loads(line)
+            if not isinstance(request_data, dict):
+                raise ValueError("Input is not a JSON object")
+        except ValueError as error:
+            log_error(f"Invalid JSON received: {error}")
+            server.write(create_error_response(None, -32700, "Parse error", str(error)))
+            continue
+
+        # Handle requests concurrently so slow tools don't hold up the others
+        task = asyncio.create_task(server.handle_request(request_data))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
     log_info("Server shutdown complete.")
 
 
 if __name__ == "__main__":
-    # Make stdin/stdout binary for asyncio streams
-    # Note: This might cause issues if something else expects text mode,
-    # but it's often necessary for reliable stream handling.
-    # sys.stdin = sys.stdin.detach() # Detach might not be needed if using from_stdin/from_stdout
-    # sys.stdout = sys.stdout.detach()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", help="JSON file describing the tools to serve.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request to stderr.")
+    cli_args = parser.parse_args()
+    VERBOSE = cli_args.verbose
 
     try:
-        asyncio.run(main())
+        asyncio.run(main(load_config(cli_args.config)))
     except KeyboardInterrupt:
         log_info("Server interrupted by user (Ctrl+C).")
@@ -0,0 +1,213 @@
+"""Tests for the asyncio MCP client."""
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from erasmus.mcp.async_client import AsyncStdioClient
+from erasmus.mcp.batch import run_batch
+from erasmus.mcp.metrics import LatencyStore
+from erasmus.mcp.models import McpError, McpServer
+from erasmus.mcp.servers import McpServers
+
+# Answers each tools/call from its own thread after `delay` seconds, so responses
+# can arrive out of order, and emits a progress notification first.
+THREADED_SERVER = '''
+import json, sys, threading, time
+lock = threading.Lock()
+
+def send(message):
+    with lock:
+        print(json.dumps(message), flush=True)
+
+def answer(request):
+    arguments = request["params"].get("arguments", {})
+    send({"jsonrpc": "2.0", "method": "notifications/progress", "params": {"id": request["id"]}})
+    time.sleep(arguments.get("delay", 0))
+    if arguments.get("exit"):
+        sys.stdout.flush()
+        import os; os._exit(3)
+    send({"jsonrpc": "2.0", "id": request["id"], "result": {"echo": arguments}})
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if "id" not in request:
+        continue
+    if request["method"] == "initialize":
+        send({"jsonrpc": "2.0", "id": request["id"], "result": {"protocolVersion": "2024-11-05", "capabilities": {}}})
+    else:
+        threading.Thread(target=answer, args=(request,)).start()
+'''
+
+
+@pytest.fixture
+def servers(tmp_path, monkeypatch):
+    """Create server definitions pointing at the threaded test server."""
+    monkeypatch.setenv("GITHUB_PERSONAL_ACCESS_TOKEN", "test-token")
+    script = tmp_path / "threaded_server.py"
+    script.write_text(THREADED_SERVER)
+    client = AsyncStdioClient(McpServers())
+    client.mcp_servers.servers = {
+        "threaded": McpServer(name="threaded", command=sys.executable, args=[str(script)], env={}),
+    }
+    return client
+
+
+@pytest.mark.asyncio
+async def test_requests_overlap_on_one_process(servers):
+    """Test slow calls run concurrently and resolve by id, not arrival order."""
+    async with servers as client:
+        await client.connect("threaded")
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            client.call_tool("threaded", "slow", {"delay": 0.5, "n": 1}),
+            client.call_tool("threaded", "slow", {"delay": 0.1, "n": 2}),
+            client.call_tool("threaded", "slow", {"delay": 0.3, "n": 3}),
+        )
+        elapsed = time.perf_counter() - started
+    assert [result["echo"]["n"] for result in results] == [1, 2, 3]
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_notifications_are_routed_to_handlers(servers):
+    """Test notifications reach handlers instead of resolving requests."""
+    received = []
+    async with servers as client:
+        client.add_notification_handler(lambda server_name, message: received.append((server_name, message["method"])))
+        await client.call_tool("threaded", "fast", {})
+    assert received == [("threaded", "notifications/progress")]
+
+
+@pytest.mark.asyncio
+async def test_process_exit_fails_pending_and_respawns(servers):
+    """Test in-flight requests fail when the server dies and the next call respawns it."""
+    async with servers as client:
+        with pytest.raises(McpError, match="terminated unexpectedly"):
+            await asyncio.gather(
+                client.call_tool("threaded", "slow", {"delay": 5}),
+                client.call_tool("threaded", "crash", {"delay": 0.1, "exit": True}),
+            )
+        result = await client.call_tool("threaded", "fast", {"n": 4})
+    assert result["echo"]["n"] == 4
+
+
+
+@pytest.mark.asyncio
+async def test_requests_record_phase_latencies(servers, tmp_path):
+    """Test calls record their phases, with spawn and initialize only when they start the server."""
+    servers.metrics = LatencyStore(tmp_path / "metrics.sqlite3")
+    async with servers as client:
+        big = await client.call_tool("threaded", "a", {"blob": "x" * 300_000})
+        await client.call_tool("threaded", "a", {})
+    assert len(big["echo"]["blob"]) == 300_000
+
+    summary = {entry["tool"]: entry for entry in servers.metrics.summary("threaded")}
+    phases = summary["a"]["phases"]
+    assert set(phases) == {"spawn", "initialize", "write", "first_byte", "response", "decode", "total"}
+    assert phases["spawn"]["count"] == phases["initialize"]["count"] == 1
+    assert phases["first_byte"]["count"] == phases["response"]["count"] == phases["total"]["count"] == 2
+
+@pytest.mark.asyncio
+async def test_run_batch_streams_in_completion_order(servers):
+    """Test batch results arrive as calls finish, tagged with their record index."""
+    lines = [
+        '{"tool": "slow", "arguments": {"delay": 0.4}}',
+        "",
+        '{"tool": "fast", "arguments": {"delay": 0}}',
+        "not json",
+    ]
+    async with servers as client:
+        records = [record async for record in run_batch(client, "threaded", lines, concurrency=4)]
+    assert [record["index"] for record in records] == [2, 1, 0]
+    assert records[0]["error"].startswith("Invalid JSON")
+    assert records[1]["result"]["echo"] == {"delay": 0}
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_timeouts_and_keeps_session(servers):
+    """Test a call past its deadline yields a timeout record while the session stays up."""
+    lines = [
+        '{"tool": "slow", "arguments": {"delay": 2}}',
+        '{"tool": "fast", "arguments": {"n": 1}}',
+    ]
+    async with servers as client:
+        records = [record async for record in run_batch(client, "threaded", lines, timeout=0.5)]
+        pid = client.sessions["threaded"].process.pid
+        await asyncio.sleep(0.2)
+        assert client.sessions["threaded"].is_alive()
+        assert client.sessions["threaded"].process.pid == pid
+    assert [record["index"] for record in records] == [1, 0]
+    assert records[1]["code"] == "timeout"
+    assert "did not answer tools/call within 0.5s" in records[1]["error"]
+
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_slow_input_off_the_event_loop(servers):
+    """Test results are yielded while the next input line is still being waited for."""
+    first_result = threading.Event()
+
+    def _slow_lines():
+        yield '{"tool": "fast", "arguments": {"n": 1}}'
+        assert first_result.wait(timeout=5), "the first result was held back by the blocked reader"
+        yield '{"tool": "fast", "arguments": {"n": 2}}'
+
+    records = []
+    async with servers as client:
+        async for record in run_batch(client, "threaded", _slow_lines()):
+            records.append(record)
+            first_result.set()
+    assert [record["result"]["echo"]["n"] for record in records] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_unexpected_errors_per_record(servers, monkeypatch):
+    """Test an unexpected exception from one call becomes its error record instead of aborting the batch."""
+    lines = [
+        '{"tool": "broken", "arguments": {}}',
+        '{"tool": "slow", "arguments": {"delay": 0.3}}',
+    ]
+    async with servers as client:
+        call_tool = client.call_tool
+
+        async def _call_tool(server_name, tool_name, arguments, timeout=None):
+            if tool_name == "broken":
+                raise OSError("connection reset while reconnecting")
+            return await call_tool(server_name, tool_name, arguments, timeout)
+
+        monkeypatch.setattr(client, "call_tool", _call_tool)
+        records = [record async for record in run_batch(client, "threaded", lines, concurrency=2)]
+    assert [record["index"] for record in records] == [0, 1]
+    assert records[0] == {"index": 0, "tool": "broken", "error": "connection reset while reconnecting"}
+    assert records[1]["result"]["echo"] == {"delay": 0.3}
+
+async def _wait_for_spares(client, server_name: str, count: int):
+    deadline = time.monotonic() + 5
+    while sum(session.is_alive() for session in client.spares.get(server_name, [])) < count:
+        assert time.monotonic() < deadline, "spares were not started"
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_spare_replaces_dead_session(servers):
+    """Test a dead session is replaced by a pre-warmed spare, which is then refilled."""
+    servers.use_spares = True
+    servers.mcp_servers.servers["threaded"].spares = 1
+    async with servers as client:
+        await client.connect("threaded")
+        await _wait_for_spares(client, "threaded", 1)
+        spare = client.spares["threaded"][0]
+
+        client.sessions["threaded"].process.kill()
+        await client.sessions["threaded"].process.wait()
+        result = await client.call_tool("threaded", "fast", {"n": 1})
+
+        assert result["echo"] == {"n": 1}
+        assert client.sessions["threaded"] is spare
+        await _wait_for_spares(client, "threaded", 1)
+        assert client.spares["threaded"][0] is not spare
+        spares = list(client.spares["threaded"])
+    assert all(not session.is_alive() for session in spares)
@@ -0,0 +1,53 @@
+"""Tests for atomic file publication."""
+import os
+import stat
+
+import pytest
+
+from erasmus.utils.atomic_write import atomic_write, get_durability
+
+
+@pytest.mark.parametrize("durability", ["none", "file", "full"])
+def test_write_replaces_content(tmp_path, durability):
+    """Test the content is replaced at every durability level and no temp file is left."""
+    target = tmp_path / ".cursorrules"
+    target.write_text("old")
+    atomic_write(target, [b"new ", b"content"], durability)
+    assert target.read_text() == "new content"
+    assert os.listdir(tmp_path) == [".cursorrules"]
+
+
+def test_write_keeps_mode_and_symlink(tmp_path):
+    """Test the file keeps its permissions and a symlinked path keeps its link."""
+    real = tmp_path / "context.md"
+    real.write_text("old")
+    real.chmod(0o640)
+    link = tmp_path / "CLAUDE.md"
+    link.symlink_to(real)
+    atomic_write(link, b"new")
+    assert link.is_symlink()
+    assert real.read_text() == "new"
+    assert stat.S_IMODE(real.stat().st_mode) == 0o640
+
+
+def test_failed_write_leaves_target_untouched(tmp_path):
+    """Test an error while writing keeps the old content and removes the temp file."""
+    target = tmp_path / ".windsurfrules"
+    target.write_text("old")
+
+    def _chunks():
+        yield b"partial"
+        raise RuntimeError("render failed")
+
+    with pytest.raises(RuntimeError):
+        atomic_write(target, _chunks())
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == [".windsurfrules"]
+
+
+def test_unknown_durability_falls_back(monkeypatch):
+    """Test an invalid ERASMUS_RULES_DURABILITY uses the default."""
+    monkeypatch.setenv("ERASMUS_RULES_DURABILITY", "FULL")
+    assert get_durability() == "full"
+    monkeypatch.setenv("ERASMUS_RULES_DURABILITY", "always")
+    assert get_durability() == "file"
@@ -0,0 +1,55 @@
+"""Tests for the precomputed MCP tool command specs."""
+from erasmus.mcp.command_specs import build_command_spec, load_command_spec, write_command_spec
+
+TOOLS = {
+    "list_commits": {
+        "name": "list_commits",
+        "description": "List commits",
+        "annotations": {"title": "List commits"},
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "owner": {"type": "string", "description": "Repository owner"},
+                "perPage": {"type": "integer", "default": 30},
+                "labels": {"type": "array", "default": ["bug"]},
+                "draft": {"type": "boolean"},
+            },
+            "required": ["owner"],
+        },
+    },
+    "broken": {"name": "broken"},
+}
+
+
+def test_build_command_spec_maps_schema_types():
+    """Test JSON schema properties become typed CLI params."""
+    spec = build_command_spec("github", TOOLS, fingerprint="abc")
+    params = {param["name"]: param for param in spec["tools"]["list_commits"]["params"]}
+    assert params["owner"]["cli_type"] == "str"
+    assert params["owner"]["required"]
+    assert params["perPage"]["cli_type"] == "int"
+    assert params["perPage"]["default"] == 30
+    assert params["labels"]["cli_type"] == "json"
+    assert params["labels"]["default"] == '["bug"]'
+    assert params["draft"]["cli_type"] == "bool"
+    assert spec["tools"]["list_commits"]["short_help"] == "List commits"
+
+
+def test_build_command_spec_skips_tools_without_schema():
+    """Test tools without an input schema are left out of the spec."""
+    spec = build_command_spec("github", TOOLS)
+    assert "broken" not in spec["tools"]
+
+
+def test_load_command_spec_round_trip(tmp_path):
+    """Test a written spec loads back when the fingerprint matches."""
+    spec = build_command_spec("github", TOOLS, fingerprint="abc")
+    write_command_spec(tmp_path, spec)
+    assert load_command_spec(tmp_path, "github", "abc") == spec
+
+
+def test_load_command_spec_rejects_stale_fingerprint(tmp_path):
+    """Test a spec written for another server fingerprint is ignored."""
+    write_command_spec(tmp_path, build_command_spec("github", TOOLS, fingerprint="abc"))
+    assert load_command_spec(tmp_path, "github", "def") is None
+    assert load_command_spec(tmp_path, "missing") is None
@@ -0,0 +1,72 @@
+"""Tests for trailing-edge debouncing of file watcher events."""
+import threading
+import time
+
+from erasmus.utils.debounce import TrailingDebouncer
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_burst_is_merged_once_after_quiet_period():
+    """Test a burst of triggers calls back exactly once, after the last trigger."""
+    calls = []
+    debouncer = TrailingDebouncer(lambda: calls.append(time.monotonic()), quiet_period=0.1, max_latency=5.0)
+    for _ in range(5):
+        debouncer.trigger()
+        last_trigger = time.monotonic()
+        time.sleep(0.02)
+    assert _wait_for(lambda: calls)
+    time.sleep(0.2)
+    assert len(calls) == 1
+    assert calls[0] - last_trigger >= 0.09
+    debouncer.close()
+
+
+def test_max_latency_caps_a_steady_stream():
+    """Test a stream of triggers that never goes quiet is still handled within max_latency."""
+    calls = []
+    debouncer = TrailingDebouncer(lambda: calls.append(1), quiet_period=0.1, max_latency=0.25)
+    start = time.monotonic()
+    while time.monotonic() - start < 0.6:
+        debouncer.trigger()
+        time.sleep(0.02)
+    assert len(calls) >= 2
+    debouncer.close()
+
+
+def test_trigger_during_callback_runs_again():
+    """Test an event arriving while the callback runs is not lost."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _callback():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+
+    debouncer = TrailingDebouncer(_callback, quiet_period=0.05)
+    debouncer.trigger()
+    assert started.wait(2)
+    debouncer.trigger()
+    release.set()
+    assert _wait_for(lambda: len(calls) == 2)
+    debouncer.close()
+
+
+def test_close_flushes_pending_call():
+    """Test closing runs a scheduled call at once, unless asked not to."""
+    calls = []
+    debouncer = TrailingDebouncer(lambda: calls.append(1), quiet_period=10)
+    debouncer.trigger()
+    debouncer.close()
+    assert calls == [1]
+    debouncer.trigger()
+    debouncer.close(flush=False)
+    assert calls == [1]
+    assert not debouncer.pending
@@ -0,0 +1,196 @@
+"""Tests for the streamable HTTP transport."""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from erasmus.mcp.async_client import AsyncStdioClient
+from erasmus.mcp.client import StdioClient
+from erasmus.mcp.http_transport import HttpClient, iter_sse_data
+from erasmus.mcp.models import McpTimeoutError
+from erasmus.mcp.servers import McpServers
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Streamable HTTP MCP endpoint: JSON for plain calls, a chunked event stream for `stream` calls."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None):
+        self.send_response(status)
+        for key, value in {"Content-Type": "application/json", **(headers or {})}.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        state = self.server.state
+        message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        state["connections"].add(self.client_address)
+        if message.get("method") == "initialize":
+            session_id = uuid.uuid4().hex
+            state["sessions"].add(session_id)
+            state["initializes"] += 1
+            result = {"protocolVersion": "2025-03-26", "capabilities": {"tools": {}}}
+            body = json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}).encode()
+            return self._reply(200, body, {"Mcp-Session-Id": session_id})
+        if self.headers.get("Mcp-Session-Id") not in state["sessions"]:
+            return self._reply(404)
+        state["received"].append(message)
+        if "id" not in message:
+            return self._reply(202)
+
+        arguments = (message.get("params") or {}).get("arguments") or {}
+        time.sleep(arguments.get("delay", 0))
+        response = {"jsonrpc": "2.0", "id": message["id"], "result": {"echo": arguments}}
+        if not arguments.get("stream"):
+            return self._reply(200, json.dumps(response).encode())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        progress = {"jsonrpc": "2.0", "method": "notifications/progress", "params": {"id": message["id"]}}
+        self._chunk(f": keep-alive\n\ndata: {json.dumps(progress)}\n\n".encode())
+        # Split the response event across chunks
+        event = f"data: {json.dumps(response)}\n\n".encode()
+        self._chunk(event[:10])
+        self._chunk(event[10:])
+        self._chunk(b"")
+
+    def do_DELETE(self):
+        self.server.state["sessions"].discard(self.headers.get("Mcp-Session-Id"))
+        self._reply(200)
+
+
+@pytest.fixture
+def http_server():
+    """Run the stand-in server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.state = {"connections": set(), "sessions": set(), "initializes": 0, "received": []}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def servers(http_server, tmp_path):
+    """Create server definitions pointing at the stand-in server."""
+    config_path = tmp_path / "mcp_config.json"
+    config_path.write_text(json.dumps({
+        "mcpServers": {
+            "remote": {"url": f"http://127.0.0.1:{http_server.server_port}/mcp", "headers": {"X-Token": "${REMOTE_TOKEN}"}, "env": {}},
+        },
+    }))
+    return McpServers(config_path)
+
+
+def test_url_servers_are_parsed(servers):
+    """Test a url entry becomes an HTTP server with no command."""
+    server = servers.servers["remote"]
+    assert server.url.endswith("/mcp")
+    assert server.command == ""
+    assert server.headers == {"X-Token": "${REMOTE_TOKEN}"}
+
+
+def test_calls_share_one_session_and_connection(http_server, servers, monkeypatch):
+    """Test sequential calls reuse the session and a keep-alive connection, and stream events."""
+    monkeypatch.setenv("REMOTE_TOKEN", "secret")
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        for index in range(5):
+            result = client.send_request("remote", "tools/call", {"name": "echo", "arguments": {"index": index}})
+            assert result == {"echo": {"index": index}}
+        assert len(http_server.state["connections"]) == 1
+        streamed = client.send_request("remote", "tools/call", {"name": "echo", "arguments": {"stream": True}})
+        assert streamed == {"echo": {"stream": True}}
+        assert client.http.sessions["remote"].headers == {"X-Token": "secret"}
+    finally:
+        client.disconnect_all()
+    state = http_server.state
+    assert state["initializes"] == 1
+    assert state["received"][0]["method"] == "notifications/initialized"
+    # The session was ended on disconnect
+    assert state["sessions"] == set()
+
+
+def test_expired_session_is_reinitialized(http_server, servers):
+    """Test a request answered with 404 for a dropped session is retried on a new session."""
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        client.send_request("remote", "tools/call", {"name": "echo", "arguments": {}})
+        http_server.state["sessions"].clear()
+        assert client.send_request("remote", "tools/call", {"name": "echo", "arguments": {"again": 1}}) == {"echo": {"again": 1}}
+        assert http_server.state["initializes"] == 2
+    finally:
+        client.disconnect_all()
+
+
+def test_timeout_cancels_the_request(http_server, servers):
+    """Test a call past its deadline raises and sends notifications/cancelled."""
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        with pytest.raises(McpTimeoutError) as error:
+            client.send_request("remote", "tools/call", {"name": "echo", "arguments": {"delay": 1}}, timeout=0.3)
+        assert error.value.timeout == 0.3
+        cancelled = [message for message in http_server.state["received"] if message.get("method") == "notifications/cancelled"]
+        assert cancelled[0]["params"]["requestId"] == error.value.request_id
+    finally:
+        client.disconnect_all()
+
+
+
+def test_deadline_spent_before_the_request_times_out(http_server, servers, monkeypatch):
+    """Test a deadline used up by the handshake raises a timeout instead of sending the request."""
+    connect = HttpClient.connect
+
+    def _slow_connect(self, *args, **kwargs):
+        session = connect(self, *args, **kwargs)
+        time.sleep(0.3)
+        return session
+
+    monkeypatch.setattr(HttpClient, "connect", _slow_connect)
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        with pytest.raises(McpTimeoutError) as error:
+            client.send_request("remote", "tools/call", {"name": "echo", "arguments": {}}, timeout=0.2)
+        assert error.value.timeout == 0.2
+        assert not any(message.get("method") == "tools/call" for message in http_server.state["received"])
+    finally:
+        client.disconnect_all()
+
+@pytest.mark.asyncio
+async def test_async_requests_run_concurrently(servers):
+    """Test concurrent async calls overlap and streamed notifications reach the handlers."""
+    notifications = []
+    async with AsyncStdioClient(servers) as client:
+        client.add_notification_handler(lambda server_name, message: notifications.append((server_name, message["method"])))
+        await client.connect("remote")
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            client.call_tool("remote", "echo", {"delay": 0.3, "stream": True, "index": index}) for index in range(4)
+        ))
+        assert time.perf_counter() - started < 0.9
+        assert [result["echo"]["index"] for result in results] == [0, 1, 2, 3]
+        await asyncio.sleep(0.05)
+    assert notifications.count(("remote", "notifications/progress")) == 4
+
+
+def test_sse_events_split_across_chunks():
+    """Test events are assembled from arbitrary chunks and multi-line data is joined."""
+    chunks = [b"data: {\"a\":", b" 1}\n", b"\n:comment\r\n\r\ndata: [1,\ndata: 2]\n", b"\n"]
+    assert [json.loads(data) for data in iter_sse_data(iter(chunks))] == [{"a": 1}, [1, 2]]
@@ -0,0 +1,45 @@
+"""Tests for the per-phase MCP latency store."""
+import pytest
+
+from erasmus.mcp.metrics import LatencyStore, bucket_for, bucket_upper_bound, percentile
+
+
+def test_buckets_bound_relative_error():
+    """Test a duration falls in a bucket whose upper bound is within 10% of it."""
+    for milliseconds in (0.05, 1.0, 37.5, 1200.0, 90000.0):
+        upper = bucket_upper_bound(bucket_for(milliseconds))
+        assert milliseconds <= upper <= milliseconds * 1.1 + 1e-9
+    assert bucket_for(0) == 0
+
+
+def test_percentile_from_buckets():
+    """Test percentiles pick the bucket holding the requested rank."""
+    buckets = [(bucket_for(1.0), 90), (bucket_for(100.0), 9), (bucket_for(1000.0), 1)]
+    assert percentile(buckets, 50) == pytest.approx(bucket_upper_bound(bucket_for(1.0)))
+    assert percentile(buckets, 95) == pytest.approx(bucket_upper_bound(bucket_for(100.0)))
+    assert percentile(buckets, 99.5) == pytest.approx(bucket_upper_bound(bucket_for(1000.0)))
+    assert percentile([], 50) is None
+
+
+def test_store_summarizes_and_clears(tmp_path):
+    """Test recorded calls are summarized per server, tool and phase."""
+    store = LatencyStore(tmp_path / "metrics.sqlite3")
+    store.record("github", "get_me", {"spawn": 0.2, "initialize": 0.05, "total": 0.3})
+    for _ in range(9):
+        store.record("github", "get_me", {"write": 0.0001, "total": 0.01})
+    store.record("github", "get_me", {"total": 1.0, "bogus": 1.0}, ok=False)
+    store.record("other", "tools/list", {"total": 0.02})
+
+    summary = store.summary("github")
+    assert len(summary) == 1
+    entry = summary[0]
+    assert (entry["tool"], entry["calls"], entry["errors"]) == ("get_me", 11, 1)
+    assert set(entry["phases"]) == {"spawn", "initialize", "write", "total"}
+    total = entry["phases"]["total"]
+    assert total["count"] == 11
+    assert total["p50"] == pytest.approx(10, rel=0.1)
+    assert total["p99"] == pytest.approx(1000, rel=0.1)
+    assert entry["phases"]["spawn"]["count"] == 1
+
+    store.clear("github")
+    assert [entry["server"] for entry in store.summary()] == ["other"]
@@ -0,0 +1,85 @@
+"""Tests for the lazily imported top-level CLI sub-apps."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from erasmus.cli.main import LAZY_SUBCOMMANDS
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[2] / ".erasmus" / "templates"
+
+# Runs the CLI with CliRunner in a fresh interpreter so sys.modules starts clean,
+# then reports which lazy sub-app modules were imported.
+RUNNER_SCRIPT = '''
+import json, sys
+from typer.testing import CliRunner
+from erasmus.cli.main import LAZY_SUBCOMMANDS, app
+
+result = CliRunner().invoke(app, sys.argv[1:])
+modules = [module_path for module_path, _, _ in LAZY_SUBCOMMANDS.values()]
+print(json.dumps({
+    "exit_code": result.exit_code,
+    "output": result.output,
+    "loaded": [module for module in modules if module in sys.modules],
+}))
+'''
+
+
+@pytest.fixture
+def run_cli(tmp_path):
+    """Run erasmus with the given arguments in a project with an empty MCP config."""
+    shutil.copytree(TEMPLATE_DIR, tmp_path / ".erasmus" / "templates")
+    config_dir = tmp_path / ".erasmus" / "mcp"
+    config_dir.mkdir(parents=True)
+    (config_dir / "mcp_config.json").write_text(json.dumps({"mcpServers": {}}))
+    env = {**os.environ, "HOME": str(tmp_path), "IDE_ENV": "cursor", "CI": "true"}
+
+    def _run(*args):
+        completed = subprocess.run(
+            [sys.executable, "-c", RUNNER_SCRIPT, *args],
+            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60, check=True,
+        )
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    return _run
+
+
+@pytest.mark.parametrize("args", [["--help"], ["version"]])
+def test_unrelated_commands_skip_lazy_imports(run_cli, args):
+    """Test the top-level help and unrelated subcommands import none of the sub-apps."""
+    result = run_cli(*args)
+    assert result["exit_code"] == 0
+    assert result["loaded"] == []
+
+
+def test_help_lists_lazy_subcommands(run_cli):
+    """Test lazy subcommands are listed with their short help before being imported."""
+    output = run_cli("--help")["output"]
+    for name, (_, _, help_text) in LAZY_SUBCOMMANDS.items():
+        assert name in output
+        assert help_text in output
+
+
+def test_resolving_a_subcommand_loads_its_group(run_cli):
+    """Test invoking a lazy subcommand imports only its module and runs the real group."""
+    result = run_cli("mcp", "--help")
+    assert result["exit_code"] == 0
+    assert result["loaded"] == ["erasmus.cli.mcp_commands"]
+    assert "registry" in result["output"]
+
+
+@pytest.mark.parametrize("args", [["stats"], ["cache", "stats"], ["registry", "status"]])
+def test_mcp_commands_skip_discovery_and_stores(run_cli, tmp_path, args):
+    """Test commands that need no registry neither start unregistered servers nor open unrelated stores."""
+    marker = tmp_path / "spawned"
+    config = {"mcpServers": {"probe": {"command": sys.executable, "args": ["-c", f"open({str(marker)!r}, 'w')"]}}}
+    (tmp_path / ".erasmus" / "mcp" / "mcp_config.json").write_text(json.dumps(config))
+    run_cli("mcp", *args)
+    assert not marker.exists()
+    assert not (tmp_path / ".erasmus" / "mcp" / "registry.json").exists()
+    if args[0] != "stats":
+        assert not (tmp_path / ".erasmus" / "mcp" / "metrics.sqlite3").exists()
@@ -0,0 +1,285 @@
+"""
+Throughput benchmarks for the MCP clients against the local stand-in server.
+
+Every client mode is measured against tests/tests/mcp/mcp_test_server.py, so
+no network or GitHub binary is needed:
+
+    communicate  StdioClient.communicate with a fresh server process per call
+    session      StdioClient.call over one persistent server process
+    async        AsyncStdioClient.request with many calls in flight
+    batch        run_batch over one AsyncStdioClient session
+
+The comparison against mcp/benchmark_baseline.json is slow and machine
+dependent, so it only runs when ERASMUS_BENCHMARK=1 is set. To print the
+results, or record a new baseline:
+
+    python tests/tests/test_mcp_benchmarks.py [--update-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from erasmus.mcp.async_client import AsyncStdioClient
+from erasmus.mcp.batch import run_batch
+from erasmus.mcp.client import StdioClient
+from erasmus.mcp.models import McpError
+from erasmus.mcp.servers import McpServers
+
+SERVER_SCRIPT = Path(__file__).parent / "mcp" / "mcp_test_server.py"
+BASELINE_PATH = Path(__file__).parent / "mcp" / "benchmark_baseline.json"
+BENCHMARK_SERVER = "stand-in"
+BENCHMARK_TOOLS = {
+    "fast": {"latency_ms": 0, "response_bytes": 256},
+    "slow": {"latency_ms": 10, "response_bytes": 256},
+    "large": {"latency_ms": 0, "response_bytes": 1024 * 1024},
+    "flaky": {"latency_ms": 1, "response_bytes": 256, "error_rate": 0.2},
+}
+MODES = ("communicate", "session", "async", "batch")
+# Spawning a process per call is much slower, so that mode makes fewer calls
+CALLS_PER_MODE = {"communicate": 10, "session": 200, "async": 200, "batch": 200}
+CONCURRENCY = 16
+# Small, quick behaviours used by the tests that always run
+TEST_TOOLS = {
+    "sleepy": {"latency_ms": 200, "response_bytes": 10},
+    "wide": {"response_bytes": 300000},
+    "broken": {"error_rate": 1.0},
+}
+# Allowed slowdown relative to the baseline before a result counts as a regression
+DEFAULT_TOLERANCE = 0.5
+# Sub-millisecond latencies are noisy, so p95 may also grow by this much
+LATENCY_SLACK_MS = 5.0
+
+
+def make_servers(directory: Path, tools: dict[str, Any] = BENCHMARK_TOOLS, seed: int = 0) -> McpServers:
+    """Write an mcp_config.json whose only server is the stand-in server serving the given tools."""
+    server_config = directory / "stand_in.json"
+    server_config.write_text(json.dumps({"seed": seed, "tools": tools}))
+    config_path = directory / "mcp_config.json"
+    config_path.write_text(json.dumps({
+        "mcpServers": {
+            BENCHMARK_SERVER: {"command": sys.executable, "args": [str(SERVER_SCRIPT), "--config", str(server_config)], "env": {}},
+        },
+    }))
+    return McpServers(config_path)
+
+
+def _summarize(calls: int, errors: int, seconds: float, durations: list[float]) -> dict[str, Any]:
+    result = {"calls": calls, "errors": errors, "calls_per_second": round(calls / seconds, 1)}
+    if len(durations) > 1:
+        cuts = statistics.quantiles(durations, n=100)
+        result["p50_ms"] = round(cuts[49] * 1000, 3)
+        result["p95_ms"] = round(cuts[94] * 1000, 3)
+    return result
+
+
+def _tool_params(tool_name: str) -> dict[str, Any]:
+    return {"name": tool_name, "arguments": {}}
+
+
+def _failed(stdout: str) -> bool:
+    """Return whether a communicate() transcript lacks a successful final response."""
+    lines = stdout.splitlines()
+    if not lines:
+        # The server wrote nothing, e.g. it crashed on startup
+        return True
+    try:
+        return "error" in json.loads(lines[-1])
+    except json.JSONDecodeError:
+        return True
+
+
+def bench_communicate(servers: McpServers, tool_name: str, calls: int) -> dict[str, Any]:
+    """Start, initialize and stop a server process for every call."""
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    durations, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        stdout, _ = client.communicate(BENCHMARK_SERVER, "tools/call", _tool_params(tool_name))
+        client.disconnect(BENCHMARK_SERVER)
+        durations.append(time.perf_counter() - call_started)
+        errors += _failed(stdout)
+    return _summarize(calls, errors, time.perf_counter() - started, durations)
+
+
+def bench_session(servers: McpServers, tool_name: str, calls: int) -> dict[str, Any]:
+    """Make sequential calls over one already started server process."""
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        client.call(BENCHMARK_SERVER, "tools/call", _tool_params("my_function"))
+        durations, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(calls):
+            call_started = time.perf_counter()
+            responses, _ = client.call(BENCHMARK_SERVER, "tools/call", _tool_params(tool_name))
+            durations.append(time.perf_counter() - call_started)
+            errors += "error" in responses[-1]
+        return _summarize(calls, errors, time.perf_counter() - started, durations)
+    finally:
+        client.disconnect_all()
+
+
+async def bench_async(servers: McpServers, tool_name: str, calls: int) -> dict[str, Any]:
+    """Make concurrent calls over one session, CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    durations = []
+
+    async def _call() -> bool:
+        async with semaphore:
+            call_started = time.perf_counter()
+            response = await client.request(BENCHMARK_SERVER, "tools/call", _tool_params(tool_name))
+            durations.append(time.perf_counter() - call_started)
+            return "error" in response
+
+    async with AsyncStdioClient(servers) as client:
+        await client.connect(BENCHMARK_SERVER)
+        started = time.perf_counter()
+        errors = sum(await asyncio.gather(*(_call() for _ in range(calls))))
+        return _summarize(calls, errors, time.perf_counter() - started, durations)
+
+
+async def bench_batch(servers: McpServers, tool_name: str, calls: int) -> dict[str, Any]:
+    """Run the calls as a JSONL batch over one session."""
+    lines = [json.dumps({"tool": tool_name})] * calls
+    async with AsyncStdioClient(servers) as client:
+        await client.connect(BENCHMARK_SERVER)
+        errors = 0
+        started = time.perf_counter()
+        async for record in run_batch(client, BENCHMARK_SERVER, lines, CONCURRENCY):
+            errors += "error" in record
+        return _summarize(calls, errors, time.perf_counter() - started, [])
+
+
+def run_benchmarks(
+    servers: McpServers,
+    tool_names: list[str] = list(BENCHMARK_TOOLS),
+    calls_per_mode: dict[str, int] = CALLS_PER_MODE,
+) -> dict[str, dict[str, Any]]:
+    """Run every mode against every given tool.
+
+    Returns:
+        Results keyed by "<mode>/<tool>".
+    """
+    results = {}
+    for mode in MODES:
+        for tool_name in tool_names:
+            calls = calls_per_mode[mode]
+            if mode == "communicate":
+                result = bench_communicate(servers, tool_name, calls)
+            elif mode == "session":
+                result = bench_session(servers, tool_name, calls)
+            elif mode == "async":
+                result = asyncio.run(bench_async(servers, tool_name, calls))
+            else:
+                result = asyncio.run(bench_batch(servers, tool_name, calls))
+            results[f"{mode}/{tool_name}"] = result
+    return results
+
+
+def find_regressions(results: dict[str, dict[str, Any]], baseline: dict[str, Any]) -> list[str]:
+    """Compare results with a baseline.
+
+    A result regresses when its throughput drops, or its p95 latency grows, by
+    more than the baseline's tolerance (plus LATENCY_SLACK_MS for latency).
+
+    Returns:
+        A description of each regression.
+    """
+    tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    regressions = []
+    for name, expected in baseline["results"].items():
+        actual = results.get(name)
+        if actual is None:
+            regressions.append(f"{name}: not measured")
+            continue
+        if actual["calls_per_second"] < expected["calls_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {actual['calls_per_second']} calls/s, baseline {expected['calls_per_second']}")
+        if "p95_ms" in expected and actual.get("p95_ms", 0) > expected["p95_ms"] * (1 + tolerance) + LATENCY_SLACK_MS:
+            regressions.append(f"{name}: p95 {actual['p95_ms']}ms, baseline {expected['p95_ms']}ms")
+    return regressions
+
+
+@pytest.fixture
+def servers(tmp_path):
+    """Create server definitions for the stand-in server."""
+    return make_servers(tmp_path, TEST_TOOLS)
+
+
+def test_stand_in_server_applies_tool_behaviour(servers):
+    """Test the stand-in server honours each tool's latency, response size and error rate."""
+    client = StdioClient(use_daemon=False, mcp_servers=servers)
+    try:
+        started = time.perf_counter()
+        result = client.send_request(BENCHMARK_SERVER, "tools/call", _tool_params("sleepy"))
+        assert time.perf_counter() - started >= 0.2
+        assert result["content"][0]["text"] == "x" * 10
+
+        result = client.send_request(BENCHMARK_SERVER, "tools/call", _tool_params("wide"))
+        assert len(result["content"][0]["text"]) == 300000
+
+        with pytest.raises(McpError, match="Injected failure"):
+            client.send_request(BENCHMARK_SERVER, "tools/call", _tool_params("broken"))
+
+        tools = client.send_request(BENCHMARK_SERVER, "tools/list", {})["tools"]
+        assert {tool["name"] for tool in tools} == {"my_function", "sleepy", "wide", "broken"}
+    finally:
+        client.disconnect_all()
+
+
+def test_every_mode_runs(servers):
+    """Test each benchmark mode completes and counts injected errors."""
+    results = run_benchmarks(servers, list(TEST_TOOLS), {"communicate": 2, "session": 3, "async": 3, "batch": 3})
+    assert results["batch/broken"]["errors"] == 3
+    assert results["communicate/broken"]["errors"] == 2
+    assert results["communicate/wide"]["errors"] == 0
+    assert results["session/wide"]["errors"] == 0
+    assert results["async/sleepy"]["calls_per_second"] > 3
+    assert "p95_ms" in results["communicate/wide"]
+
+
+def test_communicate_failures_are_read_from_the_final_response():
+    """Test a silent server counts as an error while a result mentioning "error" does not."""
+    assert _failed("")
+    assert _failed('{"jsonrpc": "2.0", "id": 1, "result": {}}\n{"jsonrpc": "2.0", "id": 2, "error": {"code": -1}}')
+    assert not _failed('{"jsonrpc": "2.0", "id": 2, "result": {"content": [{"type": "text", "text": "\\"error\\""}]}}')
+
+
+def test_find_regressions():
+    """Test slower throughput and latency beyond the tolerance are reported."""
+    baseline = {"tolerance": 0.5, "results": {"session/fast": {"calls_per_second": 100, "p95_ms": 20.0}}}
+    assert find_regressions({"session/fast": {"calls_per_second": 60, "p95_ms": 34.0}}, baseline) == []
+    regressions = find_regressions({"session/fast": {"calls_per_second": 40, "p95_ms": 36.0}}, baseline)
+    assert len(regressions) == 2
+    assert find_regressions({}, baseline) == ["session/fast: not measured"]
+
+
+@pytest.mark.skipif(not os.environ.get("ERASMUS_BENCHMARK"), reason="set ERASMUS_BENCHMARK=1 to run benchmarks")
+def test_benchmarks_against_baseline(tmp_path):
+    """Test no client mode is slower than the recorded baseline."""
+    baseline = json.loads(BASELINE_PATH.read_text())
+    results = run_benchmarks(make_servers(tmp_path, seed=baseline.get("seed", 0)))
+    assert find_regressions(results, baseline) == []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MCP clients against the stand-in server.")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH.name}.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Tolerance stored with a new baseline.")
+    cli_args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_benchmarks(make_servers(Path(directory)))
+    for name, result in results.items():
+        print(f"{name:<20} {json.dumps(result)}")
+    if cli_args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({"tolerance": cli_args.tolerance, "seed": 0, "results": results}, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
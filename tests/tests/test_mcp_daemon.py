@@ -0,0 +1,141 @@
+"""Tests for the MCP daemon and its socket client."""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from erasmus.mcp import daemon as daemon_module
+from erasmus.mcp.daemon import MAX_SOCKET_PATH, DaemonClient, McpDaemon, get_daemon_socket_path
+from erasmus.mcp.models import McpError, McpTimeoutError
+
+ECHO_SERVER = '''
+import json, os, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    if "id" not in request or request["method"] == "hang":
+        continue
+    result = {"pid": os.getpid()}
+    print(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}), flush=True)
+'''
+
+
+def write_config(config_path, script, *args):
+    config_path.write_text(json.dumps({
+        "mcpServers": {"echo": {"command": sys.executable, "args": [str(script), *args], "env": {}}},
+    }))
+
+
+@pytest_asyncio.fixture
+async def daemon(tmp_path):
+    """Run a daemon serving one echo server on a socket in tmp_path."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    config_path = tmp_path / "mcp_config.json"
+    write_config(config_path, script)
+    mcp_daemon = McpDaemon(tmp_path / "daemon.sock", config_path)
+    task = asyncio.create_task(mcp_daemon.serve())
+    client = DaemonClient(mcp_daemon.socket_path)
+    for _ in range(200):
+        if await asyncio.to_thread(client.status):
+            break
+        await asyncio.sleep(0.02)
+    yield mcp_daemon, client, script
+    mcp_daemon._shutdown.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_the_warm_process(daemon):
+    """Test calls are answered by the daemon's long-lived server process."""
+    mcp_daemon, client, _ = daemon
+    first = await asyncio.to_thread(client.request, "echo", "tools/call", {"name": "a"})
+    second = await asyncio.to_thread(client.request, "echo", "tools/call", {"name": "b"})
+    assert first["response"]["result"]["pid"] == second["response"]["result"]["pid"]
+    assert first["initialize"]["result"]
+    assert {"write", "first_byte", "response", "decode"} <= set(second["timings"])
+    status = await asyncio.to_thread(client.status)
+    assert status["servers"]["echo"]["running"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_server_falls_back(daemon):
+    """Test servers the daemon does not manage return None so callers run them locally."""
+    _, client, _ = daemon
+    assert await asyncio.to_thread(client.request, "missing", "tools/call", {}) is None
+
+
+@pytest.mark.asyncio
+async def test_config_reload_restarts_changed_servers(daemon):
+    """Test a changed server definition is restarted on reload."""
+    mcp_daemon, client, script = daemon
+    first = await asyncio.to_thread(client.request, "echo", "tools/call", {})
+    write_config(mcp_daemon.config_path, script, "--changed")
+    await mcp_daemon.reload_config()
+    second = await asyncio.to_thread(client.request, "echo", "tools/call", {})
+    assert second["response"]["result"]["pid"] != first["response"]["result"]["pid"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_is_enforced_by_the_daemon(daemon):
+    """Test the daemon cancels a call past its deadline and reports a structured timeout."""
+    _, client, _ = daemon
+    with pytest.raises(McpTimeoutError) as error:
+        await asyncio.to_thread(client.request, "echo", "hang", {}, 0.3)
+    assert error.value.timeout == 0.3
+    assert error.value.request_id is not None
+    reply = await asyncio.to_thread(client.request, "echo", "tools/call", {})
+    assert reply["response"]["result"]["pid"]
+
+
+def test_client_without_daemon_returns_none(tmp_path):
+    """Test a missing socket means the daemon is not running."""
+    client = DaemonClient(tmp_path / "missing.sock")
+    assert client.status() is None
+    assert client.request("echo", "tools/call", {}) is None
+
+
+@pytest.fixture
+def long_config_path(tmp_path, monkeypatch):
+    """Return a config path too long for a socket, with the temp directory moved into tmp_path."""
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path / ("x" * MAX_SOCKET_PATH) / "mcp_config.json"
+
+
+def test_long_path_socket_falls_back_to_private_dir(tmp_path, long_config_path):
+    """Test the fallback socket lives in a 0700 directory named after the user, not directly in /tmp."""
+    socket_path = get_daemon_socket_path(long_config_path)
+    assert socket_path.parent == tmp_path / f"erasmus-{os.getuid()}"
+    assert socket_path.parent.stat().st_mode & 0o777 == 0o700
+    assert socket_path == get_daemon_socket_path(long_config_path)
+
+
+def test_shared_fallback_dir_is_refused(tmp_path, long_config_path):
+    """Test a pre-created fallback directory other users can write to is not used."""
+    shared = tmp_path / f"erasmus-{os.getuid()}"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(McpError):
+        get_daemon_socket_path(long_config_path)
+
+
+def test_runtime_dir_is_preferred(tmp_path, long_config_path, monkeypatch):
+    """Test $XDG_RUNTIME_DIR holds the fallback socket when it is set."""
+    runtime_dir = tmp_path / "run"
+    runtime_dir.mkdir(mode=0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    assert get_daemon_socket_path(long_config_path).parent == runtime_dir
+
+
+@pytest.mark.asyncio
+async def test_socket_owned_by_another_user_is_not_used(daemon, monkeypatch):
+    """Test the client treats a socket it does not own as no daemon rather than sending calls to it."""
+    _, client, _ = daemon
+    uid = os.getuid()
+    monkeypatch.setattr(daemon_module.os, "getuid", lambda: uid + 1)
+    assert await asyncio.to_thread(client.status) is None
+    assert await asyncio.to_thread(client.request, "echo", "tools/call", {}) is None
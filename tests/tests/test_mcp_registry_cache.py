@@ -0,0 +1,190 @@
+"""Tests for the fingerprint-keyed MCP tool discovery cache in registry.json."""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from erasmus.mcp import registry as registry_module
+from erasmus.mcp.client import StdioClient
+from erasmus.mcp.registry import McpRegistry
+from erasmus.mcp.servers import McpServers
+
+SERVER_SCRIPT = Path(__file__).parent / "mcp" / "mcp_test_server.py"
+
+
+def write_binary(path, body="#!/bin/sh\n"):
+    path.write_text(body)
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def make_registry(tmp_path, monkeypatch):
+    """Build registries for a config written to tmp_path."""
+    config_path = tmp_path / "mcp_config.json"
+    registries = []
+
+    def _make(servers_config, **kwargs):
+        config_path.write_text(json.dumps({"mcpServers": servers_config}))
+        servers = McpServers(config_path)
+        monkeypatch.setattr(registry_module, "get_mcp_servers", lambda: servers)
+        monkeypatch.setattr(registry_module, "StdioClient", lambda **kw: StdioClient(use_daemon=False, mcp_servers=servers, **kw))
+        registry = McpRegistry(tmp_path / "registry.json", **kwargs)
+        registries.append(registry)
+        return registry
+
+    yield _make
+    for registry in registries:
+        if registry._refresh_thread:
+            registry._refresh_thread.join(timeout=10)
+        registry.client.disconnect_all()
+
+
+@pytest.fixture
+def discovered(monkeypatch):
+    """Replace tools/list with a stub recording which servers were discovered."""
+    calls = []
+
+    def _load_available_tools(self, server_name, timeout=None):
+        calls.append(server_name)
+        server = self.servers.get_server(server_name)
+        return {"tool": {"name": "tool", "description": " ".join([server.command, *server.args])}}
+
+    monkeypatch.setattr(McpRegistry, "_load_available_tools", _load_available_tools)
+    return calls
+
+
+def hold_discovery(monkeypatch, server_name):
+    """Make discovery of a server wait until the returned event is set."""
+    release = threading.Event()
+    load_available_tools = McpRegistry._load_available_tools
+
+    def _blocking_load(self, name, timeout=None):
+        if name == server_name:
+            release.wait(timeout=5)
+        return load_available_tools(self, name, timeout)
+
+    monkeypatch.setattr(McpRegistry, "_load_available_tools", _blocking_load)
+    return release
+
+
+def stand_in(tmp_path, name, config):
+    """Return a server definition running the stand-in server with the given config."""
+    config_file = tmp_path / f"{name}.json"
+    config_file.write_text(json.dumps(config))
+    return {"command": sys.executable, "args": [str(SERVER_SCRIPT), "--config", str(config_file)]}
+
+
+def tool_names(registry, server_name):
+    return set(registry.registry["mcp_servers"][server_name]["tools"])
+
+
+def tool_description(registry, server_name):
+    return registry.registry["mcp_servers"][server_name]["tools"]["tool"]["description"]
+
+
+def test_matching_fingerprint_is_served_from_the_registry(tmp_path, make_registry, discovered):
+    """Test an unchanged server is not discovered again by a new registry."""
+    config = {"one": {"command": write_binary(tmp_path / "server"), "args": ["stdio"]}}
+    first = make_registry(config)
+    assert discovered == ["one"]
+
+    second = make_registry(config)
+    assert discovered == ["one"]
+    assert second._refresh_thread is None
+    assert second.registry["mcp_servers"]["one"] == first.registry["mcp_servers"]["one"]
+
+
+@pytest.mark.parametrize("change", ["command", "args", "binary"])
+def test_changed_server_is_rediscovered(tmp_path, make_registry, discovered, monkeypatch, change):
+    """Test a changed command, args or binary serves the cached tools and refreshes them in the background."""
+    binary = write_binary(tmp_path / "server")
+    config = {"one": {"command": binary, "args": ["stdio"]}}
+    make_registry(config)
+    fingerprint = json.loads((tmp_path / "registry.json").read_text())["mcp_servers"]["one"]["fingerprint"]
+
+    if change == "command":
+        config["one"]["command"] = write_binary(tmp_path / "other-server")
+    elif change == "args":
+        config["one"]["args"] = ["stdio", "--read-only"]
+    else:
+        write_binary(tmp_path / "server", "#!/bin/sh\nexec true\n")
+    release = hold_discovery(monkeypatch, "one")
+    registry = make_registry(config)
+    assert tool_description(registry, "one") == f"{binary} stdio"
+
+    release.set()
+    registry._refresh_thread.join(timeout=5)
+    assert discovered == ["one", "one"]
+    entry = json.loads((tmp_path / "registry.json").read_text())["mcp_servers"]["one"]
+    assert entry["fingerprint"] != fingerprint
+    assert entry["tools"]["tool"]["description"] == " ".join([config["one"]["command"], *config["one"]["args"]])
+
+
+def test_missing_entry_is_fetched_synchronously(tmp_path, make_registry, discovered, monkeypatch):
+    """Test a new server is discovered before the registry is returned while a stale one refreshes behind it."""
+    binary = write_binary(tmp_path / "server")
+    make_registry({"one": {"command": binary, "args": []}})
+
+    release = hold_discovery(monkeypatch, "one")
+    registry = make_registry({"one": {"command": binary, "args": ["changed"]}, "two": {"command": binary, "args": []}})
+
+    assert tool_description(registry, "two") == f"{binary}"
+    assert tool_description(registry, "one") == f"{binary}"
+    assert registry._refresh_thread.is_alive()
+
+    release.set()
+    registry._refresh_thread.join(timeout=5)
+    assert tool_description(registry, "one") == f"{binary} changed"
+    assert discovered == ["one", "two", "one"]
+
+
+def test_failing_servers_keep_cached_tools_while_others_refresh(tmp_path, make_registry):
+    """Test a hanging and a crashing server are marked stale without holding up the healthy one."""
+    config = {
+        "good": stand_in(tmp_path, "good", {"tools": {"a": {}}}),
+        "hanging": stand_in(tmp_path, "hanging", {"tools": {"b": {}}}),
+        "crashing": stand_in(tmp_path, "crashing", {"tools": {"c": {}}}),
+    }
+    registry = make_registry(config)
+    assert tool_names(registry, "hanging") == {"my_function", "b"}
+    registry.client.disconnect_all()
+
+    stand_in(tmp_path, "good", {"tools": {"a": {}, "d": {}}})
+    stand_in(tmp_path, "hanging", {"list_latency_ms": 10_000, "tools": {}})
+    (tmp_path / "crashing.json").write_text("not json")
+    started = time.monotonic()
+    registry.refresh(timeout=1.0)
+    assert time.monotonic() - started < 5
+
+    entries = json.loads((tmp_path / "registry.json").read_text())["mcp_servers"]
+    assert set(entries["good"]["tools"]) == {"my_function", "a", "d"}
+    assert not entries["good"].get("stale")
+    for server_name, tool in (("hanging", "b"), ("crashing", "c")):
+        assert entries[server_name]["stale"]
+        assert entries[server_name]["error"]
+        assert set(entries[server_name]["tools"]) == {"my_function", tool}
+
+
+def test_stale_retry_waits_for_the_retry_interval(tmp_path, make_registry, monkeypatch):
+    """Test a stale server is only retried in the background once STALE_RETRY_INTERVAL has passed."""
+    config = {"crashing": stand_in(tmp_path, "crashing", {"tools": {"c": {}}})}
+    make_registry(config)
+    (tmp_path / "crashing.json").write_text("not json")
+    make_registry(config, refresh=True)
+
+    registry = make_registry(config)
+    assert registry._refresh_thread is None
+    assert registry.registry["mcp_servers"]["crashing"]["stale"]
+
+    stand_in(tmp_path, "crashing", {"tools": {"c": {}, "e": {}}})
+    monkeypatch.setattr(registry_module, "STALE_RETRY_INTERVAL", 0)
+    registry = make_registry(config)
+    assert tool_names(registry, "crashing") == {"my_function", "c"}
+    registry._refresh_thread.join(timeout=10)
+    entry = registry.registry["mcp_servers"]["crashing"]
+    assert not entry.get("stale")
+    assert set(entry["tools"]) == {"my_function", "c", "e"}
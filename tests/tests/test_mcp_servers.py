@@ -0,0 +1,40 @@
+"""Tests for MCP server configuration loading."""
+import json
+import os
+
+import pytest
+
+from erasmus.mcp import servers as servers_module
+from erasmus.mcp.servers import get_mcp_servers
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Write a config whose server needs one environment variable."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TEST_SERVER_TOKEN", "secret")
+    path = tmp_path / "mcp_config.json"
+    path.write_text(json.dumps({"mcpServers": {"one": {"command": "one", "args": [], "env": {"TEST_SERVER_TOKEN": "${TEST_SERVER_TOKEN}"}}}}))
+    return path
+
+
+def test_snapshot_is_shared_until_the_file_changes(config_path):
+    """Test the config is parsed once and re-parsed after it is modified."""
+    first = get_mcp_servers(config_path)
+    assert get_mcp_servers(config_path) is first
+    assert first.servers["one"].env == {"TEST_SERVER_TOKEN": "secret"}
+
+    config_path.write_text(json.dumps({"mcpServers": {"two": {"command": "two", "args": [], "timeout": 5}}}))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = get_mcp_servers(config_path)
+    assert second is not first
+    assert second.get_server_names() == ["two"]
+
+
+def test_missing_env_is_not_prompted_for_in_ci(config_path, monkeypatch):
+    """Test missing variables resolve to empty values instead of prompting when CI is set."""
+    monkeypatch.delenv("TEST_SERVER_TOKEN")
+    monkeypatch.setenv("CI", "true")
+    monkeypatch.setattr(servers_module.console, "input", lambda prompt: pytest.fail("prompted in CI"))
+    assert get_mcp_servers(config_path).servers["one"].env == {"TEST_SERVER_TOKEN": ""}
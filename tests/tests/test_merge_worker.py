@@ -0,0 +1,55 @@
+"""Tests for the merge worker that runs rules merges off the watcher threads."""
+import threading
+
+from erasmus.utils.merge_worker import MergeWorker
+
+
+def test_submissions_during_a_merge_run_once_more():
+    """Test a storm of submissions while a merge runs causes exactly one more merge."""
+    worker = MergeWorker()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def _merge():
+        runs.append(threading.current_thread().name)
+        started.set()
+        release.wait(2)
+
+    assert worker.submit("rules", _merge)
+    assert started.wait(2)
+    results = [worker.submit("rules", _merge) for _ in range(100)]
+    assert results.count(True) == 1
+    release.set()
+    assert worker.wait(2)
+    assert runs == ["merge-worker", "merge-worker"]
+    assert (worker.submitted, worker.coalesced) == (101, 99)
+
+
+def test_keys_run_in_submission_order_with_latest_task():
+    """Test pending keys keep their first position and run their latest task."""
+    worker = MergeWorker()
+    gate = threading.Event()
+    order = []
+    worker.submit("block", lambda: gate.wait(2))
+    worker.submit("a", lambda: order.append("a1"))
+    worker.submit("b", lambda: order.append("b"))
+    worker.submit("a", lambda: order.append("a2"))
+    gate.set()
+    assert worker.wait(2)
+    assert order == ["a2", "b"]
+
+
+def test_failing_task_does_not_stop_the_worker():
+    """Test an exception in a task is logged and later tasks still run."""
+    worker = MergeWorker()
+    runs = []
+
+    def _fail():
+        raise OSError("disk full")
+
+    worker.submit("first", _fail)
+    worker.submit("second", lambda: runs.append(1))
+    assert worker.wait(2)
+    assert runs == [1]
+    assert worker.idle
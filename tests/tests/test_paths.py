@@ -0,0 +1,78 @@
+"""Tests for the hash-gated global rules sync."""
+import os
+
+import pytest
+
+from erasmus.utils.paths import sync_global_rules
+
+
+@pytest.fixture
+def rules_paths(tmp_path):
+    """Create a template, target and stamp path for syncing."""
+    template = tmp_path / "meta_agent.md"
+    template.write_text("# Meta agent\n")
+    target = tmp_path / "home" / ".claude" / "CLAUDE.md"
+    stamp = tmp_path / ".erasmus" / "global_rules.stamp"
+    return template, target, stamp
+
+
+def test_first_sync_writes_target(rules_paths):
+    """Test the first sync creates the target and the stamp."""
+    template, target, stamp = rules_paths
+    assert sync_global_rules(template, target, stamp)
+    assert target.read_text() == "# Meta agent\n"
+    assert stamp.exists()
+
+
+def test_unchanged_template_skips_write(rules_paths):
+    """Test a second sync with no changes leaves the target untouched."""
+    template, target, stamp = rules_paths
+    sync_global_rules(template, target, stamp)
+    mtime = target.stat().st_mtime_ns
+    assert not sync_global_rules(template, target, stamp)
+    assert target.stat().st_mtime_ns == mtime
+
+
+def test_changed_template_rewrites_target(rules_paths):
+    """Test a template edit is propagated to the target."""
+    template, target, stamp = rules_paths
+    sync_global_rules(template, target, stamp)
+    template.write_text("# Meta agent v2\n")
+    assert sync_global_rules(template, target, stamp)
+    assert target.read_text() == "# Meta agent v2\n"
+
+
+def test_touched_template_with_same_content_skips_write(rules_paths):
+    """Test an mtime-only change on the template does not rewrite the target."""
+    template, target, stamp = rules_paths
+    sync_global_rules(template, target, stamp)
+    os.utime(template, ns=(1, 1))
+    assert not sync_global_rules(template, target, stamp)
+
+
+def test_externally_modified_target_is_restored(rules_paths):
+    """Test the target is rewritten if something else changed it."""
+    template, target, stamp = rules_paths
+    sync_global_rules(template, target, stamp)
+    target.write_text("edited elsewhere")
+    assert sync_global_rules(template, target, stamp)
+    assert target.read_text() == "# Meta agent\n"
+
+
+def test_stamped_digest_spares_reading_unchanged_target(rules_paths, monkeypatch):
+    """Test a touched template is compared with the stamped digest instead of re-reading the target."""
+    template, target, stamp = rules_paths
+    sync_global_rules(template, target, stamp)
+    os.utime(template, ns=(1, 1))
+    read_bytes = type(target).read_bytes
+
+    def _read_bytes(path):
+        assert path != target, "unchanged target was re-read"
+        return read_bytes(path)
+
+    monkeypatch.setattr(type(target), "read_bytes", _read_bytes)
+    assert not sync_global_rules(template, target, stamp)
+    template.write_text("# Meta agent v2\n")
+    assert sync_global_rules(template, target, stamp)
+    monkeypatch.undo()
+    assert target.read_text() == "# Meta agent v2\n"
@@ -0,0 +1,74 @@
+"""Tests for the read-only MCP tool response cache."""
+import time
+
+from erasmus.mcp.cache import CACHE_META_KEY, ToolResponseCache, cache_key, mark_cache_status, server_identity
+from erasmus.mcp.models import McpServer
+
+
+def _response(text: str) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": text}]}}
+
+
+def test_cache_key_ignores_argument_order():
+    """Test equal arguments in a different order share a key."""
+    assert cache_key("github", "list_commits", {"owner": "o", "repo": "r"}) == cache_key("github", "list_commits", {"repo": "r", "owner": "o"})
+    assert cache_key("github", "list_commits", {"owner": "o"}) != cache_key("github", "get_me", {"owner": "o"})
+
+
+def test_cache_hit_miss_and_expiry(tmp_path):
+    """Test responses are served until their TTL expires and lookups are counted."""
+    cache = ToolResponseCache(tmp_path / "cache.sqlite3", {"ttls": {"github": {"get_me": 0.2, "list_commits": 0}}})
+    assert cache.get("github", "get_me", {}) is None
+    cache.put("github", "get_me", {}, _response("me"))
+    cached = cache.get("github", "get_me", {})
+    assert cached is not None
+    assert cached[0] == _response("me")
+
+    time.sleep(0.25)
+    assert cache.get("github", "get_me", {}) is None
+
+    cache.put("github", "list_commits", {}, _response("commits"))
+    assert cache.get("github", "list_commits", {}) is None
+
+    stats = {row["tool"]: row for row in cache.stats()}
+    assert stats["get_me"]["hits"] == 1
+    assert stats["get_me"]["misses"] == 2
+    assert "list_commits" not in stats
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test the oldest unused entry is dropped once max_entries is exceeded."""
+    cache = ToolResponseCache(tmp_path / "cache.sqlite3", {"max_entries": 2})
+    cache.put("github", "get_me", {"n": 1}, _response("1"))
+    cache.put("github", "get_me", {"n": 2}, _response("2"))
+    assert cache.get("github", "get_me", {"n": 1}) is not None
+    cache.put("github", "get_me", {"n": 3}, _response("3"))
+
+    assert cache.get("github", "get_me", {"n": 2}) is None
+    assert cache.get("github", "get_me", {"n": 1}) is not None
+    assert cache.get("github", "get_me", {"n": 3}) is not None
+
+    cache.clear("github")
+    assert cache.stats() == []
+
+
+
+def test_cache_is_partitioned_by_server_identity(tmp_path, monkeypatch):
+    """Test a response cached under one token or header value is not served to another."""
+    cache = ToolResponseCache(tmp_path / "cache.sqlite3")
+    first = server_identity(McpServer(name="github", command="server", env={"GITHUB_PERSONAL_ACCESS_TOKEN": "alice"}))
+    second = server_identity(McpServer(name="github", command="server", env={"GITHUB_PERSONAL_ACCESS_TOKEN": "bob"}))
+    cache.put("github", "get_me", {}, _response("alice"), first)
+    assert cache.get("github", "get_me", {}, second) is None
+    assert cache.get("github", "get_me", {}, first)[0] == _response("alice")
+
+    remote = McpServer(name="remote", url="https://mcp.example", env={}, headers={"Authorization": "Bearer ${REMOTE_TOKEN}"})
+    monkeypatch.setenv("REMOTE_TOKEN", "alice")
+    before = server_identity(remote)
+    monkeypatch.setenv("REMOTE_TOKEN", "bob")
+    assert server_identity(remote) != before
+
+def test_mark_cache_status_sets_meta():
+    """Test the cache status is reported in the result's _meta."""
+    response = mark_cache_status(_response("me"), "hit", 12.3456)
+    assert response["result"]["_meta"][CACHE_META_KEY] == {"status": "hit", "age": 12.346}
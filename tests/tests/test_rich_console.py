@@ -0,0 +1,35 @@
+"""Tests for the Rich console output helpers."""
+import io
+
+import pytest
+from rich.console import Console
+
+from erasmus.utils import rich_console
+
+
+@pytest.fixture
+def output(monkeypatch):
+    """Route the shared console to a buffer 40 columns wide."""
+    buffer = io.StringIO()
+    monkeypatch.setattr(rich_console.get_console, "_console", Console(file=buffer, width=40, color_system=None), raising=False)
+    return buffer
+
+
+def test_print_table_rows_streams_aligned_rows(output):
+    """Test rows are consumed lazily and printed one line each, cut to the column width."""
+    consumed = []
+
+    def rows():
+        for index in range(5):
+            consumed.append(index)
+            yield [index, "x" * 30 if index == 4 else f"line\nbreak {index}"]
+
+    rich_console.print_table_rows(["n", "text"], rows(), title="Items", chunk_size=2)
+    lines = output.getvalue().splitlines()
+    assert consumed == [0, 1, 2, 3, 4]
+    assert lines[0].strip() == "Items"
+    assert lines[1].split() == ["n", "text"]
+    assert lines[3].startswith("0") and "line break 0" in lines[3]
+    assert len(lines) == 8
+    assert lines[-1].endswith("…")
+    assert all(len(line) <= 40 for line in lines)
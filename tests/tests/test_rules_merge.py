@@ -0,0 +1,133 @@
+"""Tests for the incremental rules file merge."""
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from erasmus.utils.rules_merge import RACY_WINDOW_NS, RulesMerger
+from erasmus.utils.rules_template import load_template
+
+TEMPLATE = "# Rules\n<!-- Architecture content -->\n---\n<!-- Tasks content -->\n---\n<!-- Protocol content -->\n"
+
+
+@pytest.fixture
+def rules_inputs(tmp_path):
+    """Create a template, two context files and a rules file path."""
+    template = tmp_path / "meta_rules.md"
+    template.write_text(TEMPLATE)
+    architecture = tmp_path / ".ctx.architecture.md"
+    architecture.write_text("arch v1")
+    tasks = tmp_path / ".ctx.tasks.md"
+    tasks.write_text("tasks v1")
+    sections = {"Architecture": architecture, "Tasks": tasks, "Protocol": "protocol text"}
+    return template, sections, tmp_path / ".cursorrules"
+
+
+def test_merge_renders_every_section(rules_inputs):
+    """Test the first merge writes the template with each placeholder replaced."""
+    template, sections, rules = rules_inputs
+    assert RulesMerger().merge(template, sections, rules)
+    assert rules.read_text() == "# Rules\narch v1\n---\ntasks v1\n---\nprotocol text\n"
+
+
+def test_touch_without_change_skips_write(rules_inputs):
+    """Test an mtime-only save of an input leaves the rules file untouched."""
+    template, sections, rules = rules_inputs
+    merger = RulesMerger()
+    merger.merge(template, sections, rules)
+    mtime = rules.stat().st_mtime_ns
+    stat = sections["Tasks"].stat()
+    os.utime(sections["Tasks"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not merger.merge(template, sections, rules)
+    assert not merger.merge(template, sections, rules)
+    assert rules.stat().st_mtime_ns == mtime
+
+
+def test_changed_section_rewrites_rules(rules_inputs):
+    """Test editing an input or the protocol produces a new rules file."""
+    template, sections, rules = rules_inputs
+    merger = RulesMerger()
+    merger.merge(template, sections, rules)
+    sections["Tasks"].write_text("tasks v2 with more text")
+    assert merger.merge(template, sections, rules)
+    assert "tasks v2 with more text" in rules.read_text()
+    assert merger.merge(template, {**sections, "Protocol": "new protocol"}, rules)
+    assert rules.read_text().endswith("new protocol\n")
+
+
+def test_new_merger_skips_identical_rules_file(rules_inputs):
+    """Test a fresh process does not rewrite a rules file that already has the merged content."""
+    template, sections, rules = rules_inputs
+    RulesMerger().merge(template, sections, rules)
+    mtime = rules.stat().st_mtime_ns
+    assert not RulesMerger().merge(template, sections, rules)
+    assert rules.stat().st_mtime_ns == mtime
+
+
+def test_external_edit_of_rules_file_is_repaired(rules_inputs):
+    """Test the rules file is rewritten when something else changed it."""
+    template, sections, rules = rules_inputs
+    merger = RulesMerger()
+    merger.merge(template, sections, rules)
+    expected = rules.read_text()
+    rules.write_text("edited by hand")
+    assert merger.merge(template, sections, rules)
+    assert rules.read_text() == expected
+
+
+def test_compiled_template_renders_in_one_pass(tmp_path):
+    """Test placeholders are filled once, unknown ones kept, and edits recompile the template."""
+    template_path = tmp_path / "meta_rules.md"
+    template_path.write_text("a <!-- One content --> b <!-- Two content --> c <!-- One content -->")
+    template = load_template(template_path)
+    assert template is load_template(template_path)
+    assert template.placeholders == ["One", "Two"]
+    # Placeholder text inside a value is not expanded again
+    assert template.render({"One": b"<!-- Two content -->", "Two": b"2"}) == b"a <!-- Two content --> b 2 c <!-- Two content -->"
+    assert template.render({"Two": b"2"}) == b"a <!-- One content --> b 2 c <!-- One content -->"
+
+    template_path.write_text("only <!-- Two content -->!")
+    assert load_template(template_path).render({"Two": b"2"}) == b"only 2!"
+
+
+def test_registered_provider_fills_custom_placeholder(rules_inputs):
+    """Test a custom placeholder is bound to a provider, called only when the template uses it."""
+    template, sections, rules = rules_inputs
+    template.write_text(TEMPLATE + "<!-- Changelog content -->\n")
+    merger = RulesMerger()
+    calls = []
+    merger.register_provider("Changelog", lambda: calls.append(1) or "v1.0")
+    merger.register_provider("Unused", lambda: calls.append(2) or "never")
+    assert merger.merge(template, sections, rules)
+    assert rules.read_text().endswith("protocol text\nv1.0\n")
+    assert calls == [1]
+
+
+def test_same_size_edit_within_an_mtime_tick_is_merged(rules_inputs):
+    """Test a same-size rewrite that keeps the mtime of a recently read input is still picked up."""
+    template, sections, rules = rules_inputs
+    merger = RulesMerger()
+    merger.merge(template, sections, rules)
+    stat = sections["Tasks"].stat()
+    sections["Tasks"].write_text("tasks v2")
+    os.utime(sections["Tasks"], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert merger.merge(template, sections, rules)
+    assert "tasks v2" in rules.read_text()
+
+
+def test_settled_input_is_not_reread(rules_inputs, monkeypatch):
+    """Test an input whose mtime is safely older than the last read is served from the cache."""
+    template, sections, rules = rules_inputs
+    settled = time.time_ns() - 2 * RACY_WINDOW_NS
+    os.utime(sections["Tasks"], ns=(settled, settled))
+    merger = RulesMerger()
+    merger.merge(template, sections, rules)
+    read_bytes = Path.read_bytes
+
+    def _read_bytes(path):
+        assert path != sections["Tasks"], "settled input was re-read"
+        return read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+    assert not merger.merge(template, sections, rules)
@@ -0,0 +1,78 @@
+"""Tests for the startup profiler."""
+import json
+import sys
+
+import pytest
+
+from erasmus.utils.startup_profiler import RUNTIME_SCOPE, StartupProfiler
+
+
+@pytest.fixture
+def module_dir(tmp_path, monkeypatch):
+    """Create an importable package whose import has side effects."""
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from profiled_pkg import child\n")
+    (package / "child.py").write_text(
+        "import subprocess, sys\n"
+        "from pathlib import Path\n"
+        "from dotenv import load_dotenv\n"
+        f"Path({str(tmp_path / 'written.txt')!r}).write_text('x')\n"
+        "subprocess.run([sys.executable, '-c', 'pass'], check=True)\n"
+        "load_dotenv('/nonexistent/.env')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in ("profiled_pkg", "profiled_pkg.child"):
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def profiler():
+    """Yield a started profiler and make sure it is stopped afterwards."""
+    startup_profiler = StartupProfiler()
+    startup_profiler.start()
+    yield startup_profiler
+    startup_profiler.stop()
+
+
+def test_records_import_tree(module_dir, profiler):
+    """Test nested imports are recorded as a tree."""
+    import profiled_pkg  # noqa: F401
+
+    profiler.stop()
+    root = next(record for record in profiler.roots if record.name == "profiled_pkg")
+    assert [child.name for child in root.children] == ["profiled_pkg.child"]
+    assert root.inclusive_ms >= root.children[0].inclusive_ms
+
+
+def test_attributes_side_effects_to_importing_module(module_dir, profiler):
+    """Test file writes, subprocesses and load_dotenv calls are flagged."""
+    import profiled_pkg  # noqa: F401
+
+    profiler.stop()
+    kinds = {effect.kind for effect in profiler.side_effects if effect.module == "profiled_pkg.child"}
+    assert {"file_write", "subprocess", "load_dotenv"} <= kinds
+
+
+def test_runtime_side_effects_and_json_export(module_dir, profiler):
+    """Test effects outside imports are attributed to the runtime scope and exported."""
+    (module_dir / "runtime.txt").write_text("x")
+    profiler.stop()
+    output = profiler.write_json(module_dir / "profile.json")
+    data = json.loads(output.read_text())
+    assert any(
+        effect["module"] == RUNTIME_SCOPE and effect["kind"] == "file_write"
+        for effect in data["side_effects"]
+    )
+    assert "imports" in data and "total_ms" in data
+
+
+def test_stop_restores_import_machinery(profiler):
+    """Test stopping removes the finder and the load_dotenv wrapper."""
+    import dotenv
+
+    patched = dotenv.load_dotenv
+    profiler.stop()
+    assert dotenv.load_dotenv is not patched
+    assert not any(type(finder).__name__ == "_TimingFinder" for finder in sys.meta_path)
@@ -0,0 +1,157 @@
+"""Tests for persistent StdioClient sessions."""
+import io
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+from erasmus.mcp.client import StdioClient
+from erasmus.mcp import client as client_module
+from erasmus.mcp.metrics import LatencyStore
+from erasmus.mcp.models import STDERR_LINE_LIMIT, McpError, McpServer, McpTimeoutError
+from erasmus.mcp.servers import McpServers
+
+ECHO_SERVER = '''
+import json, os, sys, time
+cancelled = []
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["method"] == "notifications/cancelled":
+        cancelled.append(request["params"]["requestId"])
+    if "id" not in request:
+        continue
+    if request["method"] == "initialize":
+        result = {"protocolVersion": "2024-11-05", "capabilities": {}}
+    elif request["method"] == "hang":
+        continue
+    elif request["method"] == "wedge":
+        time.sleep(60)
+    elif request["method"] == "cancelled":
+        result = {"cancelled": cancelled}
+    elif request["method"] == "big":
+        result = {"blob": "y" * request["params"]["arguments"]["size"]}
+    elif request["method"] == "fail":
+        print(json.dumps({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -1, "message": "boom"}}), flush=True)
+        continue
+    else:
+        result = {"pid": os.getpid(), "params": request["params"]}
+    print(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}), flush=True)
+'''
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Create a client whose only server is a line-based echo server."""
+    # Keep the configured servers from prompting for their tokens
+    monkeypatch.setenv("GITHUB_PERSONAL_ACCESS_TOKEN", "test-token")
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    stdio_client = StdioClient(mcp_servers=McpServers())
+    stdio_client.mcp_servers.servers = {
+        "echo": McpServer(name="echo", command=sys.executable, args=[str(script)], env={}),
+    }
+    yield stdio_client
+    stdio_client.disconnect_all()
+
+
+def test_requests_reuse_one_process(client):
+    """Test consecutive requests are served by the same initialized process."""
+    first = client.send_request("echo", "tools/call", {"name": "a"})
+    second = client.send_request("echo", "tools/call", {"name": "b"})
+    assert first["pid"] == second["pid"]
+    assert second["params"] == {"name": "b"}
+
+
+def test_dead_process_is_respawned(client):
+    """Test a session whose process exited is replaced transparently."""
+    first = client.send_request("echo", "tools/call", {})
+    process = client.transports["echo"].process
+    process.kill()
+    process.wait()
+    second = client.send_request("echo", "tools/call", {})
+    assert second["pid"] != first["pid"]
+
+
+def test_error_response_raises(client):
+    """Test JSON-RPC errors surface as McpError without killing the session."""
+    with pytest.raises(McpError, match="boom"):
+        client.send_request("echo", "fail", {})
+    assert client.transports["echo"].is_alive()
+
+
+def test_communicate_returns_initialize_and_response(client):
+    """Test communicate keeps the two-line stdout format callers parse."""
+    stdout, _ = client.communicate("echo", "tools/call", {"name": "a", "x": 1})
+    lines = stdout.splitlines()
+    assert len(lines) == 2
+    assert '"protocolVersion"' in lines[0]
+    assert '"arguments": {"name": "a", "x": 1}' in lines[1]
+
+
+def test_timeout_cancels_request_and_keeps_responsive_server(client):
+    """Test a call past its deadline is cancelled while a server that still answers keeps its process."""
+    first = client.send_request("echo", "tools/call", {})
+    with pytest.raises(McpTimeoutError, match="did not answer hang within") as error:
+        client.send_request("echo", "hang", {}, timeout=0.3)
+    assert error.value.to_dict()["code"] == "timeout"
+    assert error.value.timeout == 0.3
+    second = client.send_request("echo", "cancelled", {})
+    assert error.value.request_id in second["cancelled"]
+    assert client.send_request("echo", "tools/call", {})["pid"] == first["pid"]
+
+
+def test_timeout_stops_wedged_server(client, monkeypatch):
+    """Test a server that stops answering pings after a cancelled call is replaced."""
+    monkeypatch.setattr(client_module, "CANCEL_GRACE", 0.2)
+    first = client.send_request("echo", "tools/call", {})
+    with pytest.raises(McpTimeoutError):
+        client.send_request("echo", "wedge", {}, timeout=0.2)
+    deadline = time.monotonic() + 5
+    while "echo" in client.transports and time.monotonic() < deadline:
+        time.sleep(0.05)
+    second = client.send_request("echo", "tools/call", {})
+    assert second["pid"] != first["pid"]
+
+
+def test_server_timeout_from_config(client):
+    """Test the server's configured timeout applies when the caller gives none."""
+    client.mcp_servers.servers["echo"].timeout = 0.2
+    with pytest.raises(McpTimeoutError, match="within 0.2s"):
+        client.send_request("echo", "hang", {})
+
+
+
+def test_call_decodes_large_frames(client):
+    """Test call returns the decoded responses of a multi-megabyte frame."""
+    size = 4 * 1024 * 1024
+    responses, _ = client.call("echo", "big", {"size": size})
+    assert len(responses) == 2
+    assert "protocolVersion" in responses[0]["result"]
+    assert len(responses[-1]["result"]["blob"]) == size
+
+
+def test_stderr_tail_splits_long_lines():
+    """Test stderr lines longer than the limit are kept as bounded chunks."""
+    transport = SimpleNamespace(stderr=io.BytesIO(b"x" * 10000 + b"\nlast\n"), stderr_tail=deque())
+    StdioClient._drain_stderr(transport)
+    assert all(len(line) <= STDERR_LINE_LIMIT for line in transport.stderr_tail)
+    assert "".join(transport.stderr_tail) == "x" * 10000 + "\nlast\n"
+
+
+def test_call_records_phase_latencies(client, tmp_path):
+    """Test calls record their phases, with spawn and initialize only when they start the server."""
+    client.metrics = LatencyStore(tmp_path / "metrics.sqlite3")
+    client.send_request("echo", "tools/call", {"name": "a"})
+    client.send_request("echo", "tools/call", {"name": "a"})
+    with pytest.raises(McpError):
+        client.send_request("echo", "fail", {})
+
+    summary = {entry["tool"]: entry for entry in client.metrics.summary("echo")}
+    phases = summary["a"]["phases"]
+    assert summary["a"]["calls"] == 2
+    assert set(phases) == {"spawn", "initialize", "write", "first_byte", "response", "decode", "total"}
+    assert phases["spawn"]["count"] == phases["initialize"]["count"] == 1
+    assert phases["response"]["count"] == phases["total"]["count"] == 2
+    assert summary["fail"]["errors"] == 1
@@ -0,0 +1,55 @@
+"""Tests for the generated MCP tool input models."""
+import pytest
+from pydantic import ValidationError
+
+from erasmus.mcp.tool_models import load_tool_models, render_tool_models_module, write_tool_models
+
+TOOLS = {
+    "list_commits": {
+        "name": "list_commits",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "owner": {"type": "string", "description": "Repository owner's login"},
+                "perPage": {"type": "number"},
+                "json": {"type": "boolean"},
+                "labels": {"type": ["array", "null"]},
+            },
+            "required": ["owner"],
+        },
+    },
+    "strict-tool": {
+        "name": "strict-tool",
+        "inputSchema": {"type": "object", "properties": {}, "additionalProperties": False},
+    },
+    "listcommits": {"name": "listcommits", "inputSchema": {"type": "object", "required": ["page"], "properties": {"page": {"type": "integer"}}}},
+    "broken": {"name": "broken"},
+}
+
+
+@pytest.fixture
+def models(tmp_path):
+    """Write and import the generated module for the sample tools."""
+    write_tool_models(tmp_path, "git-hub", render_tool_models_module("git-hub", TOOLS, fingerprint="abc"))
+    return load_tool_models(tmp_path, "git-hub", fingerprint="abc")
+
+
+def test_generated_models_validate_arguments(models):
+    """Test the generated models accept valid arguments and reject invalid ones."""
+    assert set(models) == {"list_commits", "listcommits", "strict-tool"}
+    models["listcommits"].model_validate({"page": 1})
+    model = models["list_commits"]
+    model.model_validate({"owner": "o", "perPage": 5, "json": True, "labels": None})
+    with pytest.raises(ValidationError):
+        model.model_validate({"perPage": 5})
+    with pytest.raises(ValidationError):
+        model.model_validate({"owner": "o", "perPage": "many"})
+    with pytest.raises(ValidationError):
+        models["strict-tool"].model_validate({"unexpected": 1})
+
+
+def test_load_reuses_module_and_checks_fingerprint(tmp_path, models):
+    """Test an unchanged module is imported once and a stale one is rejected."""
+    assert load_tool_models(tmp_path, "git-hub", fingerprint="abc")["list_commits"] is models["list_commits"]
+    assert load_tool_models(tmp_path, "git-hub", fingerprint="other") is None
+    assert load_tool_models(tmp_path, "missing") is None